@@ -0,0 +1,90 @@
+# coding=utf-8
+import asyncio
+from datetime import date as Date
+from itertools import islice
+from typing import (AsyncIterator, Callable, Dict, Hashable, Iterable, List,
+                    Tuple)
+
+from epoch.batch import BatchResult
+from epoch.repo import (AdjustmentsRepository, AsyncAdjustmentsRepository,
+                        AsyncTimeLineRepository)
+from epoch.rounding import full_workflow
+from epoch.time_tracking import AdjustedTLPDuration, TLP, TLPLine
+
+__all__ = ['AsyncDaySource', 'async_workflow']
+
+
+class AsyncDaySource:
+    def __init__(self,
+                 user: Hashable,
+                 date: Date,
+                 timeline: AsyncTimeLineRepository,
+                 adjustments: AsyncAdjustmentsRepository):
+        self.user = user
+        self.date = date
+        self.timeline = timeline
+        self.adjustments = adjustments
+
+
+async def async_workflow(
+        sources: Iterable[AsyncDaySource],
+        do_travel_time: bool=False,
+        do_first_time: bool=False,
+        do_full_day: bool=False,
+        plugins: Iterable[Callable[[AdjustedTLPDuration], AdjustedTLPDuration]]=(),
+        max_concurrency: int=8,
+        semaphore: asyncio.Semaphore=None,
+        adjustments_repository: AdjustmentsRepository=None
+        ) -> AsyncIterator[BatchResult]:
+    # Fetches the sources' lines and adjustments concurrently and runs
+    # full_workflow on each day as soon as its data is in. Sources are
+    # taken lazily, max_concurrency days at a time, so only that many are
+    # ever held; a day's two fetches run together, and each takes a place
+    # in the semaphore, which allows max_concurrency requests in flight
+    # unless one is given to share a limit between drivers. Results come out
+    # in the order the days finish.
+    if semaphore is None:
+        semaphore = asyncio.BoundedSemaphore(max_concurrency)
+    plugins = tuple(plugins)
+    sources = iter(sources)
+    pending = set()
+    try:
+        while True:
+            for source in islice(sources, max_concurrency - len(pending)):
+                pending.add(asyncio.ensure_future(_fetch(source, semaphore)))
+            if not pending:
+                break
+            done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+            for fetched in done:
+                source, lines, adjustments = fetched.result()
+                for adjusted in full_workflow(
+                        lines, adjustments, do_travel_time, do_first_time,
+                        do_full_day, plugins,
+                        adjustments_repository=adjustments_repository):
+                    yield BatchResult(source.user, source.date, adjusted)
+    finally:
+        for fetch in pending:
+            fetch.cancel()
+
+
+async def _fetch(
+        source: AsyncDaySource,
+        semaphore: asyncio.Semaphore
+        ) -> Tuple[AsyncDaySource, List[TLPLine], Dict[TLP, int]]:
+    lines, adjustments = await asyncio.gather(_lines(source, semaphore),
+                                              _adjustments(source, semaphore))
+    return source, lines, adjustments
+
+
+async def _lines(source: AsyncDaySource,
+                 semaphore: asyncio.Semaphore) -> List[TLPLine]:
+    async with semaphore:
+        return [line async for line in source.timeline.retrieve_lines()]
+
+
+async def _adjustments(source: AsyncDaySource,
+                       semaphore: asyncio.Semaphore) -> Dict[TLP, int]:
+    async with semaphore:
+        return {tlp_dur.tlp: tlp_dur.duration.minutes
+                async for tlp_dur in source.adjustments.retrieve_all()}
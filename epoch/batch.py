@@ -0,0 +1,95 @@
+# coding=utf-8
+from datetime import date as Date
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Tuple
+
+from epoch.repo import AdjustmentsRepository
+from epoch.rounding import apply_day_adjustments
+from epoch.time import AdjustedDuration, Minutes, RoundingInterval
+from epoch.time_tracking import AdjustedTLPDuration, TLP, TLPLine
+from epoch.timeline import DayTimeline
+from epoch.tlp_registry import TLPRegistry
+
+__all__ = ['DayRecord', 'BatchResult', 'RoundingTable', 'batch_workflow',
+           'round_timeline']
+
+
+class DayRecord:
+    def __init__(self,
+                 user: Hashable,
+                 date: Date,
+                 lines: Iterable[TLPLine],
+                 adjustments: Dict[TLP, int]):
+        self.user = user
+        self.date = date
+        self.lines = lines
+        self.adjustments = adjustments
+
+
+class BatchResult:
+    def __init__(self, user: Hashable, date: Date,
+                 adjusted: AdjustedTLPDuration):
+        self.user = user
+        self.date = date
+        self.adjusted = adjusted
+
+
+class RoundingTable:
+    # Rounded durations shared by every day in a batch, keyed on the total
+    # minutes and the accumulated adjustment going in. Both are small
+    # numbers in practice, so the table stays small while most lookups hit.
+    def __init__(self, interval: RoundingInterval=None, max_size: int=1 << 16):
+        self.interval = interval
+        self.max_size = max_size
+        self._adjusted: Dict[Tuple[int, int], AdjustedDuration] = {}
+
+    def adjust(self, minutes: int, acc_adjustment: int) -> AdjustedDuration:
+        key = (minutes, acc_adjustment)
+        try:
+            return self._adjusted[key]
+        except KeyError:
+            adjusted = Minutes(minutes).with_accumulated_adjustment(
+                    Minutes(acc_adjustment), self.interval)
+            if len(self._adjusted) < self.max_size:
+                self._adjusted[key] = adjusted
+            return adjusted
+
+    def __len__(self) -> int:
+        return len(self._adjusted)
+
+
+def batch_workflow(
+        records: Iterable[DayRecord],
+        do_travel_time: bool=False,
+        do_first_time: bool=False,
+        do_full_day: bool=False,
+        plugins: Iterable[Callable[[AdjustedTLPDuration], AdjustedTLPDuration]]=(),
+        interval: RoundingInterval=None,
+        registry: TLPRegistry=None,
+        adjustments_repository: AdjustmentsRepository=None
+        ) -> Iterator[BatchResult]:
+    # Each day gets a registry of its own unless one is given, so the free
+    # text descriptions seen don't pile up over the batch; a registry passed
+    # in is shared by every day and grows with every distinct TLP.
+    table = RoundingTable(interval)
+    plugins = tuple(plugins)
+    for record in records:
+        day_registry = TLPRegistry() if registry is None else registry
+        adjusted_tlps = round_timeline(
+                DayTimeline.from_lines(record.lines, day_registry),
+                record.adjustments,
+                table)
+        for adjusted in apply_day_adjustments(
+                adjusted_tlps, do_travel_time, do_first_time, do_full_day,
+                plugins, adjustments_repository, record.adjustments):
+            yield BatchResult(record.user, record.date, adjusted)
+
+
+def round_timeline(
+        timeline: DayTimeline,
+        adjustments: Dict[TLP, int],
+        table: RoundingTable) -> List[AdjustedTLPDuration]:
+    return [AdjustedTLPDuration(
+                tlp_duration.tlp,
+                table.adjust(tlp_duration.duration.minutes,
+                             adjustments.get(tlp_duration.tlp, 0)))
+            for tlp_duration in timeline.combined_durations()]
@@ -1,11 +1,11 @@
 # coding=utf-8
 from datetime import datetime
-from re import fullmatch, IGNORECASE
+from re import compile as compile_regex, fullmatch, IGNORECASE
 from typing import Callable, Tuple
 
-from epoch.time import Time
+from epoch.time import MINUTES_PER_DAY, Time
 
-__all__ = ['parse_user_time', 'now']
+__all__ = ['parse_user_time', 'parse_many', 'now']
 
 
 def now():
@@ -17,25 +17,112 @@ def from_user_time(user_time: str, cutoff_config: Callable[[int], bool]):
     return Time(*parse_user_time(user_time, cutoff_config))
 
 
+def fix_under_over(hour, minute):
+    # carries minutes below 0 or above 59 into the hour
+    return divmod(hour * 60 + minute, 60)
+
+
 Time.now = staticmethod(now)
 Time.from_user_time = staticmethod(from_user_time)
+Time.fix_under_over = staticmethod(fix_under_over)
 
 
 separator_characters = ['.', ';', ':']
 
+# The well formed inputs, in one pattern: a relative time, a 24 hour time and
+# a time with AM/PM. Anything else, valid or not, goes through the step by
+# step parsing below, so errors are always the ones it raises.
+_user_time_pattern = compile_regex(
+        r'([+-][0-9]+)'
+        r'|([0-9]+)[.;:]([0-9]+)'
+        r'|([0-9]+)[.;:]([0-9]{2}) *([AaPp])[Mm]? *')
+
 
 def parse_user_time(user_time, pm_cutoff):
+    minutes = _fast_minutes(user_time, pm_cutoff, _now_minutes)
+    if minutes is None:
+        return _parse_user_time(user_time, pm_cutoff, now)
+    return divmod(minutes, 60)
+
+
+def parse_many(user_times, pm_cutoff, current_time=None, errors=None):
+    # Parses user_times into minutes since midnight, with relative times
+    # taken from the one current_time (hour, minute), which defaults to now.
+    # Without an errors list the first invalid time raises the error
+    # from_user_time would; with one, invalid times give None and
+    # (index, error) is appended to errors.
+    if current_time is None:
+        current_time = now()
+    current_minutes = current_time[0] * 60 + current_time[1]
+
+    def snapshot():
+        return current_time
+
+    def snapshot_minutes():
+        return current_minutes
+
+    results = []
+    for index, user_time in enumerate(user_times):
+        minutes = _fast_minutes(user_time, pm_cutoff, snapshot_minutes)
+        if minutes is None:
+            try:
+                minutes = Time(*_parse_user_time(
+                        user_time, pm_cutoff, snapshot)).minutes
+            except (ValueError, AttributeError) as error:
+                if errors is None:
+                    raise
+                errors.append((index, error))
+        results.append(minutes)
+    return results
+
+
+def _now_minutes():
+    hour, minute = now()
+    return hour * 60 + minute
+
+
+def _fast_minutes(user_time, pm_cutoff, now_minutes):
+    # The minutes for a well formed, valid time of day, otherwise None.
+    match = _user_time_pattern.fullmatch(user_time)
+    if match is None:
+        return None
+    relative, hour, minute, ampm_hour, ampm_minute, ampm = match.groups()
+    if relative is not None:
+        minutes = now_minutes() + int(relative)
+    elif hour is not None:
+        hour = int(hour)
+        if hour < 12 and pm_cutoff(hour):
+            hour += 12
+        minutes = _minutes_if_valid(hour, int(minute), 0 <= hour < 24)
+    else:
+        hour = int(ampm_hour)
+        valid_hour = 0 < hour <= 12
+        if ampm in 'Pp':
+            hour += 12
+        minutes = _minutes_if_valid(hour, int(ampm_minute), valid_hour)
+    if minutes is None or not 0 <= minutes < MINUTES_PER_DAY:
+        return None
+    return minutes
+
+
+def _minutes_if_valid(hour, minute, valid_hour):
+    if valid_hour and minute < 60:
+        return hour * 60 + minute
+    return None
+
+
+def _parse_user_time(user_time, pm_cutoff, current_time):
     if user_time == "":
-        return now()
+        return current_time()
     elif user_time.startswith('+') or user_time.startswith('-'):
-        return _parse_relative_time(user_time)
+        return _parse_relative_time(user_time, current_time)
     else:
         return _parse_absolute_time(user_time, pm_cutoff)
 
 
-def _parse_relative_time(user_time):
+def _parse_relative_time(user_time, current_time):
     minute_adjustment = int(user_time)
-    now_hour, now_minute = now()
+    now_hour, now_minute = current_time()
     return Time.fix_under_over(now_hour, now_minute + minute_adjustment)
 
 
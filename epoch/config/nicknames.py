@@ -1,5 +1,6 @@
 # coding=utf-8
 from epoch.option import DictOption
+from epoch.time_tracking import TLP, undefined
 
 
 class Nickname:
@@ -15,9 +16,21 @@ class Nickname:
         self.dlg = optional["dlg"]
         self.prj = optional["prj"]
 
+    def to_tlp(self) -> TLP:
+        return TLP(self.tlp,
+                   self.description.orElse(self.name),
+                   self.customer.orElse(undefined),
+                   self.product.orElse(undefined),
+                   self.code.orElse(undefined),
+                   self.slg.orElse(undefined),
+                   self.dlg.orElse(undefined),
+                   self.prj.orElse(undefined))
+
 
 day = "day"
 break_ = "break"
 lunch = "lunch"
+travel = "travel"
 
-builtin_nicknames = {day: Nickname(day, 0), break_: Nickname(break_, -1), lunch: Nickname(lunch, -2)}
+builtin_nicknames = {day: Nickname(day, 0), break_: Nickname(break_, -1), lunch: Nickname(lunch, -2),
+                     travel: Nickname(travel, -3)}
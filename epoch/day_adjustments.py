@@ -0,0 +1,143 @@
+# coding=utf-8
+from typing import AbstractSet, Iterable, List, Mapping
+
+from epoch.config.nicknames import break_, builtin_nicknames, lunch, travel
+from epoch.repo import AdjustmentsRepository
+from epoch.time import AdjustedDuration, FIFTEEN_MINUTES, Minutes, RoundingInterval
+from epoch.time_tracking import AdjustedTLPDuration, TLP
+
+__all__ = ['TravelTimeAdjustment', 'FirstTimeAdjustment', 'FullDayAdjustment',
+           'TRAVEL_CODES', 'NON_WORKING_CODES']
+
+# The day adjustments work on the day's rounded per TLP totals, as
+# basic_workflow produces them, in one pass each: their cost grows with the
+# number of distinct TLPs in a day, not with its lines.
+
+TRAVEL_CODES = frozenset([builtin_nicknames[travel].tlp])
+NON_WORKING_CODES = frozenset([builtin_nicknames[break_].tlp,
+                               builtin_nicknames[lunch].tlp])
+
+
+class TravelTimeAdjustment:
+    # Charges travel to the work it was for: the time of every travel entry
+    # is added to the day's largest billable (positive TLP code) entry,
+    # which is rounded again with its own accumulated adjustment, and the
+    # travel entries are dropped. A day with no billable entry is left as
+    # it is.
+    def __init__(self, travel_codes: AbstractSet[int]=TRAVEL_CODES,
+                 interval: RoundingInterval=None):
+        self.travel_codes = travel_codes
+        self.interval = FIFTEEN_MINUTES if interval is None else interval
+
+    def __call__(self, adjusted_tlps: Iterable[AdjustedTLPDuration]
+                 ) -> List[AdjustedTLPDuration]:
+        adjusted_tlps = list(adjusted_tlps)
+        kept: List[AdjustedTLPDuration] = []
+        travel_minutes = 0
+        target = None
+        for adjusted in adjusted_tlps:
+            if adjusted.tlp.tlp_code in self.travel_codes:
+                travel_minutes += adjusted.adjusted_duration.duration.minutes
+                continue
+            if adjusted.tlp.tlp_code > 0 and (
+                    target is None
+                    or adjusted.adjusted_duration.duration
+                    > kept[target].adjusted_duration.duration):
+                target = len(kept)
+            kept.append(adjusted)
+        if target is None:
+            return adjusted_tlps
+        if travel_minutes:
+            charged = kept[target].adjusted_duration
+            kept[target] = _rounded(
+                    kept[target],
+                    charged.duration.minutes + travel_minutes,
+                    charged.acc_adjustment.minutes,
+                    self.interval)
+        return kept
+
+
+class FirstTimeAdjustment:
+    # An entry whose TLP the day's adjustment lookup doesn't have is rounded
+    # again with the adjustment the repository carried over for it, if
+    # there is one. TLPs in the lookup are left alone, even with an
+    # adjustment of 0.
+    def __init__(self, repository: AdjustmentsRepository,
+                 adjustment_lookup: Mapping[TLP, int]=None,
+                 interval: RoundingInterval=None):
+        self.repository = repository
+        self.adjustment_lookup = {} if adjustment_lookup is None else adjustment_lookup
+        self.interval = FIFTEEN_MINUTES if interval is None else interval
+
+    def __call__(self, adjusted_tlps: Iterable[AdjustedTLPDuration]
+                 ) -> List[AdjustedTLPDuration]:
+        result = []
+        for adjusted in adjusted_tlps:
+            if adjusted.tlp not in self.adjustment_lookup:
+                carried = self._carried(adjusted)
+                if carried:
+                    adjusted = _rounded(
+                            adjusted,
+                            adjusted.adjusted_duration.duration.minutes,
+                            carried,
+                            self.interval)
+            result.append(adjusted)
+        return result
+
+    def _carried(self, adjusted: AdjustedTLPDuration) -> int:
+        try:
+            return self.repository.retrieve(adjusted.tlp).duration.minutes
+        except KeyError:
+            return 0
+
+
+class FullDayAdjustment:
+    # A day whose rounded working time (everything but breaks and lunch)
+    # ends up one interval away from a full day of day_minutes is made a
+    # full day, by moving the one entry whose accumulated adjustment the
+    # change brings closest to zero up or down an interval.
+    def __init__(self, day_minutes: int=8 * 60,
+                 non_working_codes: AbstractSet[int]=NON_WORKING_CODES,
+                 interval: RoundingInterval=None):
+        self.interval = FIFTEEN_MINUTES if interval is None else interval
+        if self.interval.distance_down(day_minutes):
+            raise ValueError(f'A full day of {day_minutes} minutes is not a '
+                             f'multiple of {self.interval.minutes} minutes')
+        self.day_minutes = day_minutes
+        self.non_working_codes = non_working_codes
+
+    def __call__(self, adjusted_tlps: Iterable[AdjustedTLPDuration]
+                 ) -> List[AdjustedTLPDuration]:
+        adjusted_tlps = list(adjusted_tlps)
+        working = [i for i, adjusted in enumerate(adjusted_tlps)
+                   if adjusted.tlp.tlp_code not in self.non_working_codes]
+        worked = sum(adjusted_tlps[i].adjusted_duration.adjusted_duration.minutes
+                     for i in working)
+        change = self.day_minutes - worked
+        if change == 0 or abs(change) > self.interval.minutes:
+            return adjusted_tlps
+        best = None
+        best_drift = None
+        for i in working:
+            rounded = adjusted_tlps[i].adjusted_duration
+            if rounded.adjusted_duration.minutes + change < 0:
+                continue
+            drift = abs(rounded.new_acc_adjustment.minutes + change)
+            if best is None or drift < best_drift:
+                best, best_drift = i, drift
+        if best is not None:
+            rounded = adjusted_tlps[best].adjusted_duration
+            adjusted_tlps[best] = AdjustedTLPDuration(
+                    adjusted_tlps[best].tlp,
+                    AdjustedDuration(rounded.duration,
+                                     rounded.adjustment + Minutes(change),
+                                     rounded.acc_adjustment))
+        return adjusted_tlps
+
+
+def _rounded(adjusted: AdjustedTLPDuration, minutes: int, acc_adjustment: int,
+             interval: RoundingInterval) -> AdjustedTLPDuration:
+    return AdjustedTLPDuration(
+            adjusted.tlp,
+            Minutes(minutes).with_accumulated_adjustment(
+                    Minutes(acc_adjustment), interval))
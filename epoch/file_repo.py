@@ -0,0 +1,230 @@
+# coding=utf-8
+from array import array
+from datetime import date as Date, datetime
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from epoch.repo import TimeLineRepository
+from epoch.rounding import basic_workflow
+from epoch.time import Time
+from epoch.time_tracking import AdjustedTLPDuration, TLP, TLPLine
+
+__all__ = ['FileTimeLineRepository', 'rounded_days', 'format_tlp', 'parse_tlp']
+
+# The log is plain text, one record per line, appended to and never
+# rewritten:
+#
+#     <date>\t<op>\t<HH:MM>[\t<tlp_code>\t<customer>\t...\t<prj>\t<description>]
+#
+# where op is ADD, UPDATE or REMOVE (which carries no TLP). Undefined TLP
+# components are left empty and the description is escaped so that it never
+# contains a tab or a newline. Records for a day can be anywhere in the log;
+# an index of where each day's records start is built as the log is read
+# and only extended with what was appended since.
+ADD = '+'
+UPDATE = '='
+REMOVE = '-'
+
+_escapes = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_unescapes = {'\\': '\\', 't': '\t', 'n': '\n', 'r': '\r'}
+
+
+class _Log:
+    # The log file shared by a repository and every repository for_day()
+    # gives out: one appender, and the byte offsets of each day's records.
+    def __init__(self, path: str, buffer_size: int):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.offsets: Dict[str, array] = {}
+        self.indexed = 0
+        self._appender = None
+
+    def append(self, records: Iterable[str]) -> None:
+        if self._appender is None:
+            # newline='' so records end in \n everywhere, as the byte
+            # offsets in the index expect
+            self._appender = open(self.path, 'a', encoding='utf-8',
+                                  newline='', buffering=self.buffer_size)
+        self._appender.writelines(records)
+        self._appender.flush()
+
+    def days(self) -> List[str]:
+        self._extend_index()
+        return sorted(self.offsets)
+
+    def records(self, day: str) -> Iterator[List]:
+        self._extend_index()
+        offsets = self.offsets.get(day)
+        if not offsets:
+            return
+        tlps: Dict[str, TLP] = {}
+        with open(self.path, 'rb') as log:
+            for offset in offsets:
+                log.seek(offset)
+                yield self._parse(log.readline(), offset, tlps)
+
+    def close(self) -> None:
+        if self._appender is not None:
+            self._appender.close()
+            self._appender = None
+
+    def _extend_index(self) -> None:
+        try:
+            log = open(self.path, 'rb', buffering=self.buffer_size)
+        except FileNotFoundError:
+            self.offsets, self.indexed = {}, 0
+            return
+        with log:
+            if log.seek(0, 2) < self.indexed:
+                # replaced or truncated behind our back
+                self.offsets, self.indexed = {}, 0
+            log.seek(self.indexed)
+            offset = self.indexed
+            for line in log:
+                if not line.endswith(b'\n'):
+                    # still being written
+                    break
+                day = line[:line.find(b'\t')].decode('ascii', 'replace')
+                days = self.offsets.get(day)
+                if days is None:
+                    days = self.offsets[day] = array('q')
+                days.append(offset)
+                offset += len(line)
+            self.indexed = offset
+
+    def _parse(self, line: bytes, offset: int, tlps: Dict[str, TLP]) -> List:
+        try:
+            fields = line.decode('utf-8').rstrip('\n').split('\t', 3)
+            if len(fields) < 3 or fields[1] not in (ADD, UPDATE, REMOVE):
+                raise ValueError('unknown record')
+            fields[2] = _parse_time(fields[2])
+            if len(fields) == 4:
+                fields[3] = parse_tlp(fields[3], tlps)
+            elif fields[1] != REMOVE:
+                raise ValueError('no TLP')
+            return fields
+        except (ValueError, AttributeError) as error:
+            raise ValueError(f'{self.path}: malformed record at byte {offset}, '
+                             f'{line!r}: {error}') from None
+
+
+class FileTimeLineRepository(TimeLineRepository):
+    # Repositories from for_day() share this one's file handle and index;
+    # closing any of them closes the appender for all.
+    def __init__(self, path: str, day: Date=None, buffer_size: int=1 << 16,
+                 log: _Log=None):
+        self.path = path
+        self.day = Date.today() if day is None else day
+        self.buffer_size = buffer_size
+        self._log = _Log(path, buffer_size) if log is None else log
+
+    def for_day(self, day: Date) -> 'FileTimeLineRepository':
+        return FileTimeLineRepository(self.path, day, self.buffer_size,
+                                      self._log)
+
+    def add_line(self, tlp_line: TLPLine) -> None:
+        self._append(ADD, tlp_line.time, tlp_line.tlp)
+
+    def add_lines(self, tlp_lines: Iterable[TLPLine]) -> None:
+        self._log.append(
+                _format_record(self.day, ADD, tlp_line.time, tlp_line.tlp)
+                for tlp_line in tlp_lines)
+
+    def retrieve_lines(self) -> Iterable[TLPLine]:
+        # reads only this day's records
+        return _replay(self._log.records(self.day.isoformat()))
+
+    def remove_line_by_time(self, time: Time) -> None:
+        self._append(REMOVE, time)
+
+    def update_line_tlp(self, tlp_line: TLPLine) -> None:
+        self._append(UPDATE, tlp_line.time, tlp_line.tlp)
+
+    def retrieve_days(self) -> Iterator[Tuple[Date, List[TLPLine]]]:
+        # Every day in date order, holding only one day's lines at a time.
+        for day in self._log.days():
+            yield _parse_date(day), _replay(self._log.records(day))
+
+    def close(self) -> None:
+        self._log.close()
+
+    def __enter__(self) -> 'FileTimeLineRepository':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _append(self, op: str, time: Time, tlp: TLP=None) -> None:
+        self._log.append((_format_record(self.day, op, time, tlp),))
+
+
+def rounded_days(
+        repo: FileTimeLineRepository,
+        adjustment_lookup: Dict[TLP, int]
+        ) -> Iterator[Tuple[Date, Iterable[AdjustedTLPDuration]]]:
+    for day, lines in repo.retrieve_days():
+        yield day, basic_workflow(lines, adjustment_lookup)
+
+
+def _replay(records: Iterable[List]) -> List[TLPLine]:
+    lines: Dict[int, TLPLine] = {}
+    for record in records:
+        _, op, time, *tlp = record
+        if op == REMOVE:
+            lines.pop(time.minutes, None)
+        else:
+            lines[time.minutes] = TLPLine(tlp[0], time)
+    return [lines[minutes] for minutes in sorted(lines)]
+
+
+def _format_record(day: Date, op: str, time: Time, tlp: TLP=None) -> str:
+    if tlp is None:
+        return f'{day.isoformat()}\t{op}\t{time}\n'
+    return f'{day.isoformat()}\t{op}\t{time}\t{format_tlp(tlp)}\n'
+
+
+def format_tlp(tlp: TLP) -> str:
+    tlp_code, description, *components = tlp.to_row()
+    return '\t'.join(
+            [str(tlp_code)]
+            + ['' if component is None else str(component)
+               for component in components]
+            + [description.translate(_escapes)])
+
+
+def parse_tlp(text: str, tlps: Dict[str, TLP]=None) -> TLP:
+    # lines for the same TLP share one instance
+    if tlps is None:
+        tlps = {}
+    try:
+        return tlps[text]
+    except KeyError:
+        tlp_code, *components, description = text.split('\t', 7)
+        tlp = TLP.from_row([int(tlp_code), _unescape(description)] +
+                           [int(component) if component else None
+                            for component in components])
+        tlps[text] = tlp
+        return tlp
+
+
+def _parse_date(text: str) -> Date:
+    return datetime.strptime(text, '%Y-%m-%d').date()
+
+
+def _parse_time(text: str) -> Time:
+    hour, minute = text.split(':')
+    return Time(int(hour), int(minute))
+
+
+def _unescape(text: str) -> str:
+    if '\\' not in text:
+        return text
+    parts = []
+    chars = iter(text)
+    for char in chars:
+        if char == '\\':
+            escaped = next(chars, '')
+            if escaped not in _unescapes:
+                raise ValueError(f'Bad escape in {text!r}')
+            char = _unescapes[escaped]
+        parts.append(char)
+    return ''.join(parts)
@@ -1,7 +1,7 @@
 # coding=utf-8
 from _collections_abc import Iterable as IterableABC
 from itertools import tee
-from typing import Iterable
+from typing import Callable, Iterable, Sequence
 
 
 def pipe(func, *args, **kwargs):
@@ -60,6 +60,9 @@ class Stream:
             intermediate = func(intermediate)
         return intermediate
 
+    def pairwise(self):
+        return Stream(_pairwise(self.iterable))
+
     def skip_first(self):
         try:
             temp = self.iterable
@@ -77,3 +80,28 @@ class Stream:
 
 
 IterableABC.register(Stream)
+
+
+def compose(funcs: Sequence[Callable]) -> Callable:
+    # funcs[-1](...(funcs[0](item))) as a single function
+    composed = funcs[0]
+    for func in funcs[1:]:
+        composed = _then(composed, func)
+    return composed
+
+
+def _then(first: Callable, second: Callable) -> Callable:
+    def both(item):
+        return second(first(item))
+    return both
+
+
+def _pairwise(iterable):
+    iterator = iter(iterable)
+    try:
+        previous = next(iterator)
+    except StopIteration:
+        return
+    for item in iterator:
+        yield previous, item
+        previous = item
@@ -0,0 +1,15 @@
+# coding=utf-8
+__all__ = ['Immutable', 'init_attr']
+
+# Value types assign their slots once, in __init__, through init_attr.
+init_attr = object.__setattr__
+
+
+class Immutable:
+    __slots__ = ()
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, item):
+        raise AttributeError(f'{type(self).__name__} is immutable')
@@ -0,0 +1,198 @@
+# coding=utf-8
+import csv
+from datetime import date as Date, datetime
+from timeit import default_timer
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from epoch.cli._time_parsing import now, parse_many
+from epoch.repo import TimeLineRepository
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+
+__all__ = ['ImportReport', 'import_lines', 'import_file']
+
+# An export has a header row naming its columns. time and tlp_code are
+# required; date is required to import into more than one day, which needs a
+# repository with for_day(); the other TLP columns may be left out or empty.
+TIME = 'time'
+DATE = 'date'
+TLP_COLUMNS = ('tlp_code', 'description', 'customer', 'product', 'code', 'slg',
+               'dlg', 'prj')
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        # (line number, reason) for every row that was left out
+        self.rejected: List[Tuple[int, str]] = []
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (f'{self.imported} of {self.rows} rows imported, '
+                f'{len(self.rejected)} rejected, '
+                f'{self.rows_per_second:.0f} rows/s')
+
+
+class _Row:
+    __slots__ = ('line_number', 'day', 'tlp', 'time_text')
+
+    def __init__(self, line_number: int, day: Date, tlp: TLP, time_text: str):
+        self.line_number = line_number
+        self.day = day
+        self.tlp = tlp
+        self.time_text = time_text
+
+
+def import_lines(
+        source: Iterable[str],
+        repo: TimeLineRepository,
+        pm_cutoff: Callable[[int], bool],
+        delimiter: str=',',
+        chunk_size: int=1000,
+        current_time: Tuple[int, int]=None) -> ImportReport:
+    # Reads the export in chunks of chunk_size rows and writes each chunk's
+    # lines to repo, a day at a time. Each day's repository from for_day() is
+    # reused across chunks and closed, if it can be, once the import is done.
+    # Rows that can't be read are recorded in the report and skipped.
+    # Relative times are all taken from current_time, by default the time
+    # the import started.
+    report = ImportReport()
+    if current_time is None:
+        current_time = now()
+    start = default_timer()
+    reader = csv.reader(source, delimiter=delimiter)
+    try:
+        header = next(reader)
+    except StopIteration:
+        return report
+    columns = _Columns(header, repo)
+    tlps: Dict[Tuple[str, ...], TLP] = {}
+    days: Dict[str, Date] = {}
+    day_repos: Dict[Date, TimeLineRepository] = {}
+    chunk: List[_Row] = []
+    try:
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as error:
+                # the reader picks up again on the next line
+                report.rows += 1
+                report.rejected.append((reader.line_num, str(error)))
+                continue
+            report.rows += 1
+            try:
+                chunk.append(columns.read(reader.line_num, row, tlps, days))
+            except ValueError as error:
+                report.rejected.append((reader.line_num, str(error)))
+            if len(chunk) == chunk_size:
+                _write_chunk(chunk, repo, day_repos, pm_cutoff, current_time,
+                             report)
+                chunk = []
+        if chunk:
+            _write_chunk(chunk, repo, day_repos, pm_cutoff, current_time,
+                         report)
+    finally:
+        for day_repo in day_repos.values():
+            close = getattr(day_repo, 'close', None)
+            if close is not None:
+                close()
+    # bad times are only found when their chunk is written
+    report.rejected.sort()
+    report.seconds = default_timer() - start
+    return report
+
+
+def import_file(
+        path: str,
+        repo: TimeLineRepository,
+        pm_cutoff: Callable[[int], bool],
+        delimiter: str=None,
+        **options) -> ImportReport:
+    # delimiter defaults to a tab for .tsv files and a comma otherwise
+    if delimiter is None:
+        delimiter = '\t' if path.lower().endswith('.tsv') else ','
+    with open(path, newline='', encoding='utf-8') as source:
+        return import_lines(source, repo, pm_cutoff, delimiter, **options)
+
+
+class _Columns:
+    def __init__(self, header: Sequence[str], repo: TimeLineRepository):
+        positions = {name.strip().lower(): i for i, name in enumerate(header)}
+        for required in (TIME, TLP_COLUMNS[0]):
+            if required not in positions:
+                raise ValueError(f'The export has no {required} column')
+        if DATE in positions and not hasattr(repo, 'for_day'):
+            raise ValueError(f'{type(repo).__name__} holds a single day; '
+                             'it cannot import an export with dates')
+        self.time = positions[TIME]
+        self.date = positions.get(DATE)
+        self.tlp = [positions.get(name) for name in TLP_COLUMNS]
+        self.width = len(header)
+
+    def read(self, line_number: int, row: List[str],
+             tlps: Dict[Tuple[str, ...], TLP],
+             days: Dict[str, Date]) -> _Row:
+        if len(row) != self.width:
+            raise ValueError(f'Expected {self.width} fields, found {len(row)}')
+        key = tuple(['' if i is None else row[i] for i in self.tlp])
+        tlp = tlps.get(key)
+        if tlp is None:
+            tlp = tlps[key] = _parse_tlp(key)
+        day = None
+        if self.date is not None:
+            day = days.get(row[self.date])
+            if day is None:
+                day = days[row[self.date]] = _parse_date(row[self.date])
+        return _Row(line_number, day, tlp, row[self.time].strip())
+
+
+def _parse_tlp(key: Tuple[str, ...]) -> TLP:
+    tlp_code, description, *components = key
+    return TLP.from_row([int(tlp_code), description] +
+                        [int(component) if component.strip() else None
+                         for component in components])
+
+
+def _parse_date(text: str) -> Date:
+    return datetime.strptime(text.strip(), '%Y-%m-%d').date()
+
+
+def _write_chunk(chunk: List[_Row], repo: TimeLineRepository,
+                 day_repos: Dict[Date, TimeLineRepository],
+                 pm_cutoff: Callable[[int], bool],
+                 current_time: Tuple[int, int], report: ImportReport) -> None:
+    errors = []
+    minutes = parse_many([row.time_text for row in chunk], pm_cutoff,
+                         current_time, errors)
+    for index, error in errors:
+        report.rejected.append((chunk[index].line_number, str(error)))
+    by_day: Dict[Date, List[TLPLine]] = {}
+    for row, row_minutes in zip(chunk, minutes):
+        if row_minutes is not None:
+            by_day.setdefault(row.day, []).append(
+                    TLPLine(row.tlp, Time.from_minutes(row_minutes)))
+    for day, tlp_lines in by_day.items():
+        if day is None:
+            day_repo = repo
+        else:
+            day_repo = day_repos.get(day)
+            if day_repo is None:
+                day_repo = day_repos[day] = repo.for_day(day)
+        _add_lines(day_repo, tlp_lines)
+        report.imported += len(tlp_lines)
+
+
+def _add_lines(repo: TimeLineRepository, tlp_lines: List[TLPLine]) -> None:
+    add_lines = getattr(repo, 'add_lines', None)
+    if add_lines is None:
+        for tlp_line in tlp_lines:
+            repo.add_line(tlp_line)
+    else:
+        add_lines(tlp_lines)
@@ -0,0 +1,184 @@
+# coding=utf-8
+from bisect import bisect_left
+from typing import Dict, Iterable, List
+
+from epoch.repo import TimeLineRepository
+from epoch.time import Minutes, RoundingInterval, Time
+from epoch.time_tracking import (AdjustedTLPDuration, Descriptions, TLP,
+                                 TLPDuration, TLPLine)
+
+__all__ = ['IncrementalDay', 'IncrementalTimeLineRepository']
+
+
+class _Aggregate:
+    # The lines of one TLP that have a following line, and so a duration.
+    def __init__(self):
+        self.total = 0
+        self.members: List[int] = []
+        self.adjusted: AdjustedTLPDuration = None
+
+
+class IncrementalDay:
+    # Keeps a day's lines together with the per TLP totals and rounded
+    # results that basic_workflow would produce for them. Adding, removing
+    # or changing a line only touches the line before it and the TLPs
+    # involved, and only those TLPs are rounded again.
+    #
+    # Edits are not constant time: finding a line is a bisect, but the
+    # day's lines and each TLP's line starts are sorted lists, so an insert
+    # or delete shifts up to all of a day's lines and all of the TLP's. For
+    # the tens of lines a day holds that is a short memmove. rounded() sorts
+    # the TLPs again only after a TLP has appeared, gone, or had its first
+    # line change.
+    def __init__(self,
+                 tlp_lines: Iterable[TLPLine]=(),
+                 adjustment_lookup: Dict[TLP, int]=None,
+                 interval: RoundingInterval=None):
+        # a copy; set_adjustment changes it
+        self.adjustment_lookup = ({} if adjustment_lookup is None
+                                  else dict(adjustment_lookup))
+        self.interval = interval
+        self._minutes: List[int] = []
+        self._tlps: List[TLP] = []
+        self._aggregates: Dict[TLP, _Aggregate] = {}
+        self._order: List[_Aggregate] = None
+        for tlp_line in tlp_lines:
+            self.add_line(tlp_line)
+
+    def add_line(self, tlp_line: TLPLine) -> None:
+        minutes = tlp_line.time.minutes
+        position = bisect_left(self._minutes, minutes)
+        if self._holds(position, minutes):
+            self._replace_tlp(position, tlp_line.tlp)
+            return
+        self._withdraw(position - 1)
+        self._minutes.insert(position, minutes)
+        self._tlps.insert(position, tlp_line.tlp)
+        self._contribute(position - 1)
+        self._contribute(position)
+
+    def remove_line_by_time(self, time: Time) -> None:
+        position = self._position(time)
+        self._withdraw(position - 1)
+        self._withdraw(position)
+        del self._minutes[position]
+        del self._tlps[position]
+        self._contribute(position - 1)
+
+    def update_line_tlp(self, tlp_line: TLPLine) -> None:
+        self._replace_tlp(self._position(tlp_line.time), tlp_line.tlp)
+
+    def set_adjustment(self, tlp: TLP, adjustment: int) -> None:
+        self.adjustment_lookup[tlp] = adjustment
+        aggregate = self._aggregates.get(tlp)
+        if aggregate is not None:
+            aggregate.adjusted = None
+
+    def lines(self) -> List[TLPLine]:
+        return [TLPLine(tlp, Time.from_minutes(minutes))
+                for minutes, tlp in zip(self._minutes, self._tlps)]
+
+    def rounded(self) -> List[AdjustedTLPDuration]:
+        # in order of each TLP's first line, like basic_workflow
+        if self._order is None:
+            self._order = sorted(self._aggregates.values(),
+                                 key=lambda aggregate: aggregate.members[0])
+        return [self._rounded(aggregate) for aggregate in self._order]
+
+    def __contains__(self, time: Time) -> bool:
+        return self._holds(bisect_left(self._minutes, time.minutes), time.minutes)
+
+    def __len__(self) -> int:
+        return len(self._minutes)
+
+    def _replace_tlp(self, position: int, tlp: TLP) -> None:
+        self._withdraw(position)
+        self._tlps[position] = tlp
+        self._contribute(position)
+
+    def _withdraw(self, position: int) -> None:
+        if 0 <= position < len(self._minutes) - 1:
+            tlp = self._tlps[position]
+            aggregate = self._aggregates[tlp]
+            aggregate.total -= self._minutes[position + 1] - self._minutes[position]
+            members = aggregate.members
+            index = bisect_left(members, self._minutes[position])
+            del members[index]
+            aggregate.adjusted = None
+            if index == 0:
+                self._order = None
+            if not members:
+                del self._aggregates[tlp]
+
+    def _contribute(self, position: int) -> None:
+        if 0 <= position < len(self._minutes) - 1:
+            tlp = self._tlps[position]
+            aggregate = self._aggregates.get(tlp)
+            if aggregate is None:
+                aggregate = self._aggregates[tlp] = _Aggregate()
+            aggregate.total += self._minutes[position + 1] - self._minutes[position]
+            members = aggregate.members
+            index = bisect_left(members, self._minutes[position])
+            members.insert(index, self._minutes[position])
+            aggregate.adjusted = None
+            if index == 0:
+                self._order = None
+
+    def _rounded(self, aggregate: _Aggregate) -> AdjustedTLPDuration:
+        if aggregate.adjusted is None:
+            tlps = [self._tlps[bisect_left(self._minutes, minutes)]
+                    for minutes in aggregate.members]
+            descriptions = Descriptions(tlps[0].description)
+            for tlp in tlps[1:]:
+                descriptions.append(tlp.description)
+            aggregate.adjusted = TLPDuration(
+                    descriptions.render_onto(tlps[0]),
+                    Minutes(aggregate.total)
+                    ).with_adjustment_from(self.adjustment_lookup, self.interval)
+        return aggregate.adjusted
+
+    def _holds(self, position: int, minutes: int) -> bool:
+        return position < len(self._minutes) and self._minutes[position] == minutes
+
+    def _position(self, time: Time) -> int:
+        position = bisect_left(self._minutes, time.minutes)
+        if not self._holds(position, time.minutes):
+            raise KeyError(time)
+        return position
+
+
+class IncrementalTimeLineRepository(TimeLineRepository):
+    # Passes edits on to the wrapped repository and keeps the day's rounding
+    # up to date as they happen. Edits to lines the day doesn't have raise
+    # KeyError before the wrapped repository sees them.
+    def __init__(self,
+                 wrapped: TimeLineRepository,
+                 adjustment_lookup: Dict[TLP, int]=None,
+                 interval: RoundingInterval=None):
+        self.wrapped = wrapped
+        self.day = IncrementalDay(
+                wrapped.retrieve_lines(), adjustment_lookup, interval)
+
+    def add_line(self, tlp_line: TLPLine) -> None:
+        self.wrapped.add_line(tlp_line)
+        self.day.add_line(tlp_line)
+
+    def retrieve_lines(self) -> Iterable[TLPLine]:
+        return self.day.lines()
+
+    def remove_line_by_time(self, time: Time) -> None:
+        self._check(time)
+        self.wrapped.remove_line_by_time(time)
+        self.day.remove_line_by_time(time)
+
+    def update_line_tlp(self, tlp_line: TLPLine) -> None:
+        self._check(tlp_line.time)
+        self.wrapped.update_line_tlp(tlp_line)
+        self.day.update_line_tlp(tlp_line)
+
+    def rounded(self) -> List[AdjustedTLPDuration]:
+        return self.day.rounded()
+
+    def _check(self, time: Time) -> None:
+        if time not in self.day:
+            raise KeyError(time)
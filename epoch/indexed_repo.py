@@ -0,0 +1,169 @@
+# coding=utf-8
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date as Date
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from epoch.repo import TimeLineRepository
+from epoch.sorted_columns import SortedColumns, nearest, put
+from epoch.time import Time
+from epoch.time_tracking import TLPLine
+from epoch.timeline import DayTimeline
+from epoch.tlp_registry import TLPRegistry
+
+__all__ = ['IndexedTimeLineStore', 'IndexedTimeLineRepository']
+
+
+class _Day(SortedColumns):
+    # a day's lines as sorted minutes with the TLP handles alongside
+    __slots__ = ('_minutes', '_handles')
+
+    def __init__(self):
+        self._minutes = array('i')
+        self._handles = array('i')
+
+    @property
+    def minutes(self) -> array:
+        return self._minutes
+
+    @property
+    def handles(self) -> array:
+        return self._handles
+
+    def insert(self, position: int, minutes: int, handle: int) -> None:
+        self._minutes.insert(position, minutes)
+        self._handles.insert(position, handle)
+
+    def delete(self, position: int) -> None:
+        del self._minutes[position]
+        del self._handles[position]
+
+    def set_handle(self, position: int, handle: int) -> None:
+        self._handles[position] = handle
+
+
+class IndexedTimeLineStore:
+    # Lines for any number of days, ordered by date and then by minute of
+    # the day. Days are found by bisecting the sorted date ordinals, lines
+    # by bisecting a day's minutes, so lookups and range queries are
+    # O(log n) in the number of lines, and an insert only moves the lines
+    # of its own day.
+    def __init__(self, registry: TLPRegistry=None):
+        self.registry = TLPRegistry() if registry is None else registry
+        self._ordinals: List[int] = []
+        self._days: Dict[int, _Day] = {}
+        self._count = 0
+
+    def add(self, day: Date, tlp_line: TLPLine) -> None:
+        # replaces the day's line at the same time, if there is one
+        entry = self._days.get(day.toordinal())
+        if entry is None:
+            entry = self._days[day.toordinal()] = _Day()
+            insort(self._ordinals, day.toordinal())
+        if put(entry, tlp_line.time.minutes, self.registry.intern(tlp_line.tlp)):
+            self._count += 1
+
+    def add_lines(self, day: Date, tlp_lines: Iterable[TLPLine]) -> None:
+        for tlp_line in tlp_lines:
+            self.add(day, tlp_line)
+
+    def day(self, day: Date) -> DayTimeline:
+        # a view of the day's columns, valid until the next write to the day
+        entry = self._days.get(day.toordinal())
+        if entry is None:
+            return DayTimeline(self.registry)
+        return DayTimeline.from_columns(entry.minutes, entry.handles,
+                                        self.registry)
+
+    def days(self) -> List[Date]:
+        return [Date.fromordinal(ordinal) for ordinal in self._ordinals
+                if self._days[ordinal].minutes]
+
+    def range(self, start_day: Date, end_day: Date, start: Time=None,
+              end: Time=None) -> Iterator[Tuple[Date, TLPLine]]:
+        # Lines from start on start_day to end on end_day, both included.
+        # Without times the days are taken whole.
+        first = start_day.toordinal()
+        last = end_day.toordinal()
+        for index in range(bisect_left(self._ordinals, first),
+                           bisect_right(self._ordinals, last)):
+            ordinal = self._ordinals[index]
+            yield from self._lines(
+                    ordinal,
+                    start if ordinal == first else None,
+                    end if ordinal == last else None)
+
+    def window(self, start_day: Date, end_day: Date, start: Time,
+               end: Time) -> Iterator[Tuple[Date, TLPLine]]:
+        # Lines from start to end, both included, on each day from
+        # start_day to end_day.
+        for index in range(bisect_left(self._ordinals, start_day.toordinal()),
+                           bisect_right(self._ordinals, end_day.toordinal())):
+            yield from self._lines(self._ordinals[index], start, end)
+
+    def nearest(self, day: Date, time: Time) -> TLPLine:
+        # the day's line closest to time, the earlier one on a tie
+        entry = self._days.get(day.toordinal())
+        position = -1 if entry is None else nearest(entry.minutes, time.minutes)
+        if position < 0:
+            raise KeyError(f'No lines on {day}')
+        return self._line(entry, position)
+
+    def remove(self, day: Date, time: Time, max_distance: int=0) -> TLPLine:
+        # Removes and returns the day's line nearest to time, if it is no
+        # more than max_distance minutes away (None for any distance).
+        entry = self._days.get(day.toordinal())
+        position = (-1 if entry is None
+                    else nearest(entry.minutes, time.minutes, max_distance))
+        if position < 0:
+            raise KeyError(f'No line at {time} on {day}')
+        line = self._line(entry, position)
+        entry.delete(position)
+        self._count -= 1
+        return line
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _lines(self, ordinal: int, start: Time=None,
+               end: Time=None) -> Iterator[Tuple[Date, TLPLine]]:
+        entry = self._days[ordinal]
+        low = 0 if start is None else bisect_left(entry.minutes, start.minutes)
+        high = (len(entry.minutes) if end is None
+                else bisect_right(entry.minutes, end.minutes))
+        if low < high:
+            day = Date.fromordinal(ordinal)
+            for position in range(low, high):
+                yield day, self._line(entry, position)
+
+    def _line(self, entry: _Day, position: int) -> TLPLine:
+        return TLPLine(self.registry[entry.handles[position]],
+                       Time.from_minutes(entry.minutes[position]))
+
+
+class IndexedTimeLineRepository(TimeLineRepository):
+    # remove_line_by_time takes away the nearest line no more than
+    # max_distance minutes from the time given (None for any distance).
+    def __init__(self, store: IndexedTimeLineStore, day: Date=None,
+                 max_distance: int=0):
+        self.store = store
+        self.day = Date.today() if day is None else day
+        self.max_distance = max_distance
+
+    def for_day(self, day: Date) -> 'IndexedTimeLineRepository':
+        return IndexedTimeLineRepository(self.store, day, self.max_distance)
+
+    def add_line(self, tlp_line: TLPLine) -> None:
+        self.store.add(self.day, tlp_line)
+
+    def add_lines(self, tlp_lines: Iterable[TLPLine]) -> None:
+        self.store.add_lines(self.day, tlp_lines)
+
+    def retrieve_lines(self) -> DayTimeline:
+        return self.store.day(self.day)
+
+    def remove_line_by_time(self, time: Time) -> None:
+        self.store.remove(self.day, time, self.max_distance)
+
+    def update_line_tlp(self, tlp_line: TLPLine) -> None:
+        self.store.add(self.day, tlp_line)
@@ -0,0 +1,134 @@
+# coding=utf-8
+import tracemalloc
+from functools import partial
+from timeit import default_timer
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from epoch.repo import AdjustmentsRepository
+from epoch.rounding import (add_adjustments, combine_tlp_durations,
+                            day_adjustments, times_to_durations)
+from epoch.time_tracking import AdjustedTLPDuration, TLP, TLPLine
+
+__all__ = ['StageRecord', 'WorkflowProfiler']
+
+
+class StageRecord:
+    # One stage of one full_workflow call. The allocation figures are None
+    # unless allocations are traced; peak_bytes also needs Python 3.9 or
+    # later, for tracemalloc.reset_peak().
+    __slots__ = ('call', 'stage', 'seconds', 'items_in', 'items_out',
+                 'allocated_bytes', 'peak_bytes')
+
+    def __init__(self, call: int, stage: str, seconds: float, items_in: int,
+                 items_out: int, allocated_bytes: int=None,
+                 peak_bytes: int=None):
+        self.call = call
+        self.stage = stage
+        self.seconds = seconds
+        self.items_in = items_in
+        self.items_out = items_out
+        self.allocated_bytes = allocated_bytes
+        self.peak_bytes = peak_bytes
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class WorkflowProfiler:
+    # Pass one to full_workflow(..., profiler=...) to have the call recorded
+    # stage by stage. Each stage's output is materialized so it can be timed
+    # and counted; without a profiler full_workflow runs untouched.
+    def __init__(self, trace_allocations: bool=False):
+        self.trace_allocations = trace_allocations
+        self.records: List[StageRecord] = []
+        self.calls = 0
+
+    def workflow(
+            self,
+            tlp_lines: Iterable[TLPLine],
+            adjustment_lookup: Dict[TLP, int],
+            do_travel_time: bool,
+            do_first_time: bool,
+            do_full_day: bool,
+            plugins: Iterable[Callable[[AdjustedTLPDuration], AdjustedTLPDuration]],
+            adjustments_repository: AdjustmentsRepository=None
+            ) -> List[AdjustedTLPDuration]:
+        stages = [('times_to_durations', times_to_durations),
+                  ('combine_tlp_durations', combine_tlp_durations),
+                  ('add_adjustments', partial(add_adjustments, adjustment_lookup))]
+        # the day adjustments as compiled, fused per item ones as one stage
+        stages.extend(day_adjustments(
+                do_travel_time, do_first_time, do_full_day, plugins,
+                adjustments_repository, adjustment_lookup).steps)
+        return self.run(stages, tlp_lines)
+
+    def run(self, stages: Iterable[Tuple[str, Callable]], value: Iterable) -> List:
+        # Feeds value through the named stages, recording each.
+        call = self.calls
+        self.calls += 1
+        started_tracing = self.trace_allocations and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            value = list(value)
+            for name, stage in stages:
+                value = self._run_stage(call, name, stage, value)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+        return value
+
+    def _run_stage(self, call: int, name: str, stage: Callable,
+                   value: List) -> List:
+        allocated = peak = None
+        if self.trace_allocations:
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = default_timer()
+        result = list(stage(value))
+        seconds = default_timer() - start
+        if self.trace_allocations:
+            current, traced_peak = tracemalloc.get_traced_memory()
+            allocated = current - before
+            if hasattr(tracemalloc, 'reset_peak'):
+                peak = traced_peak - before
+        self.records.append(StageRecord(call, name, seconds, len(value),
+                                        len(result), allocated, peak))
+        return result
+
+    def report(self) -> List[Dict]:
+        return [record.as_dict() for record in self.records]
+
+    def totals(self) -> Dict[str, Dict]:
+        # per stage, over every call, in the order the stages first ran
+        totals: Dict[str, Dict] = {}
+        for record in self.records:
+            total = totals.setdefault(record.stage, {
+                'calls': 0, 'seconds': 0.0, 'items_in': 0, 'items_out': 0,
+                'allocated_bytes': None})
+            total['calls'] += 1
+            total['seconds'] += record.seconds
+            total['items_in'] += record.items_in
+            total['items_out'] += record.items_out
+            if record.allocated_bytes is not None:
+                total['allocated_bytes'] = ((total['allocated_bytes'] or 0)
+                                            + record.allocated_bytes)
+        return totals
+
+    def clear(self) -> None:
+        self.records = []
+        self.calls = 0
+
+    def __str__(self) -> str:
+        lines = [f'{"stage":<32} {"calls":>6} {"ms":>10} {"in":>9} {"out":>9}'
+                 f' {"KiB":>9}']
+        for stage, total in self.totals().items():
+            allocated = total['allocated_bytes']
+            lines.append(
+                    f'{stage:<32} {total["calls"]:6} '
+                    f'{total["seconds"] * 1000:10.3f} {total["items_in"]:9} '
+                    f'{total["items_out"]:9} '
+                    + ('        -' if allocated is None
+                       else f'{allocated / 1024:9.1f}'))
+        return '\n'.join(lines)
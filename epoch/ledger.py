@@ -0,0 +1,168 @@
+# coding=utf-8
+import os
+from datetime import date as Date, datetime
+from typing import Dict, Iterable, List, Tuple
+
+from epoch.file_repo import format_tlp, parse_tlp
+from epoch.time_tracking import AdjustedTLPDuration, TLP
+
+__all__ = ['DriftLedger']
+
+# A ledger is a directory holding
+#
+#   deltas.log                 one line per change, appended in date order:
+#                              <date>\t<drift>\t<TLP as format_tlp writes it>
+#                              where a drift of 0 clears the TLP, and after
+#                              each day's changes, even if it had none, a
+#                              line holding just <date>.
+#   snapshot-<date>.tsv        every TLP's drift after that date, one
+#                              <drift>\t<TLP> per line, after a first line
+#                              holding the size of deltas.log at the time.
+#
+# Getting to a date means loading the last snapshot up to it and replaying
+# only the deltas written after that snapshot.
+_LOG = 'deltas.log'
+_SNAPSHOT_PREFIX = 'snapshot-'
+_SNAPSHOT_SUFFIX = '.tsv'
+
+
+class DriftLedger:
+    # The accumulated rounding adjustment of every TLP, as of the last day
+    # recorded. drift can be passed straight to the workflows as their
+    # adjustment lookup.
+    def __init__(self, directory: str, snapshot_every: int=28):
+        if snapshot_every < 1:
+            raise ValueError(f'snapshot_every must be positive, not {snapshot_every}')
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.drift: Dict[TLP, int] = {}
+        self.date: Date = None
+        self._tlps: Dict[str, TLP] = {}
+        self._log_path = os.path.join(directory, _LOG)
+        self._drop_partial_delta()
+        self.drift, self.date, self._days_since_snapshot = self._replay(None)
+        self._log = open(self._log_path, 'ab')
+
+    def record_day(self, day: Date,
+                   adjusted_tlps: Iterable[AdjustedTLPDuration]) -> None:
+        # Takes the day's new accumulated adjustments. Days have to be
+        # recorded in order.
+        if self.date is not None and day <= self.date:
+            raise ValueError(f'{day} is not after {self.date}, the last day '
+                             'in the ledger')
+        day_text = day.isoformat()
+        deltas = []
+        for adjusted in adjusted_tlps:
+            tlp = adjusted.tlp
+            drift = adjusted.adjusted_duration.new_acc_adjustment.minutes
+            if self.drift.get(tlp, 0) != drift:
+                _set_drift(self.drift, tlp, drift)
+                deltas.append(f'{day_text}\t{drift}\t{format_tlp(tlp)}\n')
+        deltas.append(f'{day_text}\n')
+        self._log.write(''.join(deltas).encode('utf-8'))
+        self._log.flush()
+        self.date = day
+        self._days_since_snapshot += 1
+        if self._days_since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def get(self, tlp: TLP) -> int:
+        return self.drift.get(tlp, 0)
+
+    def state_at(self, day: Date) -> Dict[TLP, int]:
+        # every TLP's drift as it was once day was recorded
+        return self._replay(day)[0]
+
+    def snapshot(self) -> None:
+        if self.date is None:
+            return
+        self._log.flush()
+        path = self._snapshot_path(self.date)
+        with open(path + '.tmp', 'w', encoding='utf-8') as out:
+            out.write(f'{self._log.tell()}\n')
+            out.writelines(f'{drift}\t{format_tlp(tlp)}\n'
+                           for tlp, drift in self.drift.items())
+        os.replace(path + '.tmp', path)
+        self._days_since_snapshot = 0
+
+    def snapshots(self) -> List[Date]:
+        return sorted(_parse_date(name[len(_SNAPSHOT_PREFIX):-len(_SNAPSHOT_SUFFIX)])
+                      for name in os.listdir(self.directory)
+                      if name.startswith(_SNAPSHOT_PREFIX)
+                      and name.endswith(_SNAPSHOT_SUFFIX))
+
+    def close(self) -> None:
+        self._log.close()
+
+    def __enter__(self) -> 'DriftLedger':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _replay(self, day: Date=None) -> Tuple[Dict[TLP, int], Date, int]:
+        # The drift after day (after everything, if None), the last day seen
+        # and how many days were replayed on top of the snapshot.
+        drift: Dict[TLP, int] = {}
+        last = None
+        offset = 0
+        snapshots = [snapshot for snapshot in self.snapshots()
+                     if day is None or snapshot <= day]
+        if snapshots:
+            last = snapshots[-1]
+            offset = self._load_snapshot(last, drift)
+        limit = None if day is None else day.isoformat()
+        days = 0
+        previous = None
+        with open(self._log_path, 'ab+') as log:
+            log.seek(offset)
+            for line in log:
+                day_text, *delta = (
+                        line.decode('utf-8').rstrip('\n').split('\t', 2))
+                if limit is not None and day_text > limit:
+                    break
+                if day_text != previous:
+                    previous = day_text
+                    days += 1
+                if delta:
+                    drift_text, tlp_text = delta
+                    _set_drift(drift, parse_tlp(tlp_text, self._tlps),
+                               int(drift_text))
+        if previous is not None:
+            last = _parse_date(previous)
+        return drift, last, days
+
+    def _load_snapshot(self, day: Date, drift: Dict[TLP, int]) -> int:
+        with open(self._snapshot_path(day), encoding='utf-8') as snapshot:
+            offset = int(next(snapshot))
+            for line in snapshot:
+                drift_text, tlp_text = line.rstrip('\n').split('\t', 1)
+                drift[parse_tlp(tlp_text, self._tlps)] = int(drift_text)
+        return offset
+
+    def _drop_partial_delta(self) -> None:
+        # a crash part way through a write can leave half a line at the end
+        with open(self._log_path, 'ab+') as log:
+            size = log.seek(0, 2)
+            if size == 0:
+                return
+            log.seek(max(0, size - (1 << 16)))
+            tail = log.read()
+            if not tail.endswith(b'\n'):
+                log.truncate(size - len(tail) + tail.rfind(b'\n') + 1)
+
+    def _snapshot_path(self, day: Date) -> str:
+        return os.path.join(self.directory,
+                            f'{_SNAPSHOT_PREFIX}{day.isoformat()}{_SNAPSHOT_SUFFIX}')
+
+
+def _set_drift(drift: Dict[TLP, int], tlp: TLP, value: int) -> None:
+    if value:
+        drift[tlp] = value
+    else:
+        drift.pop(tlp, None)
+
+
+def _parse_date(text: str) -> Date:
+    return datetime.strptime(text, '%Y-%m-%d').date()
@@ -0,0 +1,257 @@
+# coding=utf-8
+import mmap
+import struct
+from datetime import date as Date
+from typing import Dict, Iterator, Sequence, Tuple
+
+from epoch.file_repo import format_tlp, parse_tlp
+from epoch.repo import TimeLineRepository
+from epoch.sorted_columns import SortedColumns, nearest, put
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+from epoch.timeline import DayTimeline
+from epoch.tlp_registry import TLPRegistry
+
+__all__ = ['MappedTimeLineStore', 'MappedTimeLineRepository']
+
+# A store is three files next to each other:
+#
+#   <path>       fixed-width records of native ints (minute offset, TLP
+#                handle). Each day owns a contiguous region of records kept
+#                sorted by minute; a day that outgrows its region is moved to
+#                the end of the file with twice the room.
+#
+#                The regions days move out of are never reused or reclaimed:
+#                the file only grows. With the doubling, a day holding n
+#                lines has taken at most max(4 * n, initial_capacity)
+#                records of it in all. The file itself is grown in
+#                doubling steps ahead of the regions, so it is at most twice
+#                what the regions take and is rarely resized. Views handed
+#                out map the file directly, so shrinking it under them is
+#                not an option; to compact, copy the days into a new store.
+#
+#                The store is POSIX-only: views can still map the file when
+#                it grows, and Windows refuses to resize a mapped file.
+#   <path>.idx   one fixed-width entry per day: (date ordinal, first record,
+#                record count, region capacity).
+#   <path>.tlps  the TLPs behind the handles, one per line, in handle order.
+_RECORD = struct.Struct('ii')
+_INDEX = struct.Struct('iiii')
+_INTS_PER_RECORD = 2
+
+
+class _DayEntry:
+    def __init__(self, slot: int, ordinal: int, start: int, count: int,
+                 capacity: int):
+        self.slot = slot
+        self.ordinal = ordinal
+        self.start = start
+        self.count = count
+        self.capacity = capacity
+
+
+class _MappedColumns(SortedColumns):
+    # a day's region of the mapping, as the columns put() and nearest() sort
+    def __init__(self, store: 'MappedTimeLineStore', entry: _DayEntry):
+        self.store = store
+        self.entry = entry
+
+    @property
+    def minutes(self) -> Sequence[int]:
+        return self._column(0)
+
+    @property
+    def handles(self) -> Sequence[int]:
+        return self._column(1)
+
+    def insert(self, position: int, minutes: int, handle: int) -> None:
+        entry = self.entry
+        if entry.count == entry.capacity:
+            self.store._relocate(entry, 2 * entry.capacity)
+        offset = (entry.start + position) * _RECORD.size
+        self.store._map.move(offset + _RECORD.size, offset,
+                             (entry.count - position) * _RECORD.size)
+        entry.count += 1
+        self.store._write_entry(entry)
+        _RECORD.pack_into(self.store._map, offset, minutes, handle)
+
+    def delete(self, position: int) -> None:
+        entry = self.entry
+        offset = (entry.start + position) * _RECORD.size
+        self.store._map.move(offset, offset + _RECORD.size,
+                             (entry.count - position - 1) * _RECORD.size)
+        entry.count -= 1
+        self.store._write_entry(entry)
+
+    def set_handle(self, position: int, handle: int) -> None:
+        offset = (self.entry.start + position) * _RECORD.size
+        _RECORD.pack_into(self.store._map, offset,
+                          _RECORD.unpack_from(self.store._map, offset)[0],
+                          handle)
+
+    def _column(self, index: int) -> Sequence[int]:
+        if self.entry.count == 0:
+            return ()
+        records = self.store._records(self.entry, self.entry.count)
+        return records[index::_INTS_PER_RECORD]
+
+
+class MappedTimeLineStore:
+    def __init__(self, path: str, initial_capacity: int=32):
+        if initial_capacity < 1:
+            raise ValueError('initial_capacity must be positive, '
+                             f'not {initial_capacity}')
+        self.path = path
+        self.initial_capacity = initial_capacity
+        self.registry = TLPRegistry()
+        self._data = _open_binary(path)
+        self._index = _open_binary(path + '.idx')
+        self._tlps = open(path + '.tlps', 'a+', encoding='utf-8')
+        self._days: Dict[int, _DayEntry] = {}
+        # records in the file, and the end of the last region handed out
+        self._size = self._data.seek(0, 2) // _RECORD.size
+        self._end = 0
+        self._map = None
+        self._load()
+
+    def _load(self) -> None:
+        self._tlps.seek(0)
+        for line in self._tlps:
+            self.registry.intern(parse_tlp(line.rstrip('\n')))
+        self._index.seek(0)
+        for slot, fields in enumerate(_INDEX.iter_unpack(self._index.read())):
+            entry = _DayEntry(slot, *fields)
+            self._days[entry.ordinal] = entry
+            self._end = max(self._end, entry.start + entry.capacity)
+        self._remap()
+
+    def day(self, day: Date) -> DayTimeline:
+        # A zero-copy view of the day, valid until the next write to the day.
+        entry = self._days.get(day.toordinal())
+        if entry is None or entry.count == 0:
+            return DayTimeline(self.registry)
+        records = self._records(entry, entry.count)
+        return DayTimeline.from_columns(
+                records[0::_INTS_PER_RECORD],
+                records[1::_INTS_PER_RECORD],
+                self.registry)
+
+    def days(self) -> Iterator[Tuple[Date, DayTimeline]]:
+        for ordinal in sorted(self._days):
+            if self._days[ordinal].count:
+                day = Date.fromordinal(ordinal)
+                yield day, self.day(day)
+
+    def add(self, day: Date, tlp_line: TLPLine) -> None:
+        put(_MappedColumns(self, self._entry(day)), tlp_line.time.minutes,
+            self._intern(tlp_line.tlp))
+
+    def remove(self, day: Date, time: Time) -> None:
+        entry = self._days.get(day.toordinal())
+        columns = None if entry is None else _MappedColumns(self, entry)
+        position = (-1 if columns is None
+                    else nearest(columns.minutes, time.minutes, 0))
+        if position < 0:
+            raise KeyError(f'No line at {time} on {day}')
+        columns.delete(position)
+
+    def flush(self) -> None:
+        if self._map is not None:
+            self._map.flush()
+        self._index.flush()
+        self._tlps.flush()
+
+    def close(self) -> None:
+        self.flush()
+        # views handed out keep their own reference to the mapping
+        self._map = None
+        self._data.close()
+        self._index.close()
+        self._tlps.close()
+
+    def __enter__(self) -> 'MappedTimeLineStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _intern(self, tlp: TLP) -> int:
+        known = len(self.registry)
+        handle = self.registry.intern(tlp)
+        if handle == known:
+            self._tlps.write(format_tlp(tlp) + '\n')
+        return handle
+
+    def _entry(self, day: Date) -> _DayEntry:
+        ordinal = day.toordinal()
+        entry = self._days.get(ordinal)
+        if entry is None:
+            entry = _DayEntry(len(self._days), ordinal, self._end, 0, 0)
+            self._days[ordinal] = entry
+            self._relocate(entry, self.initial_capacity)
+        return entry
+
+    def _records(self, entry: _DayEntry, count: int) -> memoryview:
+        start = entry.start * _RECORD.size
+        end = start + count * _RECORD.size
+        return memoryview(self._map)[start:end].cast('i')
+
+    def _relocate(self, entry: _DayEntry, capacity: int) -> None:
+        old_start = entry.start
+        start = self._end
+        self._end += capacity
+        if self._end > self._size:
+            self._grow(max(self._end, 2 * self._size))
+        if entry.count:
+            self._map.move(start * _RECORD.size, old_start * _RECORD.size,
+                           entry.count * _RECORD.size)
+        entry.start = start
+        entry.capacity = capacity
+        self._write_entry(entry)
+
+    def _grow(self, size: int) -> None:
+        # Let go of the old mapping first; it stays open only while views
+        # of it are still around.
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._map = None
+        self._data.truncate(size * _RECORD.size)
+        self._size = size
+        self._remap()
+
+    def _remap(self) -> None:
+        # A new mapping rather than mmap.resize(), which fails while views of
+        # the old mapping are still around.
+        if self._size:
+            self._map = mmap.mmap(self._data.fileno(), 0)
+
+    def _write_entry(self, entry: _DayEntry) -> None:
+        self._index.seek(entry.slot * _INDEX.size)
+        self._index.write(_INDEX.pack(entry.ordinal, entry.start, entry.count,
+                                      entry.capacity))
+
+
+class MappedTimeLineRepository(TimeLineRepository):
+    def __init__(self, store: MappedTimeLineStore, day: Date=None):
+        self.store = store
+        self.day = Date.today() if day is None else day
+
+    def add_line(self, tlp_line: TLPLine) -> None:
+        self.store.add(self.day, tlp_line)
+
+    def retrieve_lines(self) -> DayTimeline:
+        return self.store.day(self.day)
+
+    def remove_line_by_time(self, time: Time) -> None:
+        self.store.remove(self.day, time)
+
+    def update_line_tlp(self, tlp_line: TLPLine) -> None:
+        self.store.add(self.day, tlp_line)
+
+
+def _open_binary(path: str):
+    open(path, 'ab').close()
+    return open(path, 'r+b')
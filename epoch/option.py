@@ -18,14 +18,14 @@ class Optional:
         def map(self, trans):
             return Optional.ofNullable(trans(self.value))
 
-        def orElse(self):
+        def orElse(self, value):
             return self.value
 
     empty = Empty()
 
     @staticmethod
     def full(value):
-        return None
+        return Optional.Some(value)
 
     @staticmethod
     def ofNullable(value):
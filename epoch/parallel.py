@@ -0,0 +1,166 @@
+# coding=utf-8
+from array import array
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from os import cpu_count
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from epoch.batch import BatchResult, DayRecord, RoundingTable, round_timeline
+from epoch.repo import AdjustmentsRepository
+from epoch.rounding import apply_day_adjustments
+from epoch.time import (AdjustedDuration, FIFTEEN_MINUTES, Minutes,
+                        RoundingInterval)
+from epoch.time_tracking import AdjustedTLPDuration, TLP, TLPDuration
+from epoch.timeline import DayTimeline
+from epoch.tlp_registry import TLPRegistry
+
+__all__ = ['parallel_workflow']
+
+# What crosses the process boundary is kept to plain tuples, ints and
+# arrays. A chunk of days shares one table of TLP rows; each day is sent as
+# its minute and TLP handle columns plus (handle, adjustment) pairs, and
+# (handle, carried adjustment) pairs for the first time adjustment, looked
+# up in the adjustments repository before the chunk is sent.
+_DayPayload = Tuple[array, array, List[Tuple[int, int]], List[Tuple[int, int]]]
+_ChunkPayload = Tuple[List[Tuple], List[_DayPayload], int,
+                      Tuple[bool, bool, bool], Tuple[Callable, ...]]
+_ResultRow = Tuple[Tuple, int, int, int]
+
+
+def parallel_workflow(
+        records: Iterable[DayRecord],
+        do_travel_time: bool=False,
+        do_first_time: bool=False,
+        do_full_day: bool=False,
+        plugins: Iterable[Callable[[AdjustedTLPDuration], AdjustedTLPDuration]]=(),
+        interval: RoundingInterval=None,
+        chunk_size: int=64,
+        max_workers: int=None,
+        max_pending: int=None,
+        executor: Executor=None,
+        adjustments_repository: AdjustmentsRepository=None
+        ) -> Iterator[BatchResult]:
+    # Plugins must be picklable, i.e. module level functions.
+    # adjustments_repository is only read in this process.
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be positive, not {chunk_size}')
+    interval = FIFTEEN_MINUTES if interval is None else interval
+    options = ((do_travel_time, do_first_time, do_full_day), tuple(plugins),
+               adjustments_repository)
+    max_pending = max_pending or 2 * (max_workers or cpu_count() or 1)
+    if executor is None:
+        return _run_in_own_pool(records, interval, options, chunk_size,
+                                max_workers, max_pending)
+    return _run(executor, records, interval, options, chunk_size, max_pending)
+
+
+def _run_in_own_pool(records, interval, options, chunk_size, max_workers,
+                     max_pending) -> Iterator[BatchResult]:
+    with ProcessPoolExecutor(max_workers) as executor:
+        yield from _run(executor, records, interval, options, chunk_size,
+                        max_pending)
+
+
+def _run(executor, records, interval, options, chunk_size,
+         max_pending) -> Iterator[BatchResult]:
+    # Keeps at most max_pending chunks in flight, yielding in input order.
+    flags, plugins, adjustments_repository = options
+    pending = deque()
+    records = iter(records)
+    while True:
+        while len(pending) < max_pending:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            tlp_rows, days = _encode_chunk(
+                    chunk, adjustments_repository if flags[1] else None)
+            pending.append((chunk, executor.submit(
+                    _round_chunk,
+                    (tlp_rows, days, interval.minutes, flags, plugins))))
+        if not pending:
+            return
+        chunk, future = pending.popleft()
+        for record, rows in zip(chunk, future.result()):
+            for row in rows:
+                yield BatchResult(record.user, record.date, _decode_result(row))
+
+
+def _encode_chunk(
+        chunk: Sequence[DayRecord],
+        adjustments_repository: AdjustmentsRepository=None
+        ) -> Tuple[List[Tuple], List[_DayPayload]]:
+    registry = TLPRegistry()
+    # each TLP is looked up in the repository once per chunk
+    carried_by_tlp: Dict[TLP, int] = {}
+    days = []
+    for record in chunk:
+        timeline = DayTimeline.from_lines(record.lines, registry)
+        adjustments = [(registry.intern(tlp), acc)
+                       for tlp, acc in record.adjustments.items()]
+        carried = []
+        if adjustments_repository is not None:
+            for handle in sorted(set(timeline.tlp_ids)):
+                tlp = registry[handle]
+                if tlp in record.adjustments:
+                    continue
+                if tlp not in carried_by_tlp:
+                    carried_by_tlp[tlp] = _carried(adjustments_repository, tlp)
+                if carried_by_tlp[tlp]:
+                    carried.append((handle, carried_by_tlp[tlp]))
+        days.append((timeline.minutes, timeline.tlp_ids, adjustments, carried))
+    return [registry[handle].to_row() for handle in range(len(registry))], days
+
+
+def _carried(adjustments_repository: AdjustmentsRepository, tlp: TLP) -> int:
+    try:
+        return adjustments_repository.retrieve(tlp).duration.minutes
+    except KeyError:
+        return 0
+
+
+class _CarriedAdjustments:
+    # The carried adjustments sent with a day, read by FirstTimeAdjustment
+    # in place of the adjustments repository.
+    def __init__(self, carried: Dict[TLP, int]):
+        self.carried = carried
+
+    def retrieve(self, tlp: TLP) -> TLPDuration:
+        return TLPDuration(tlp, Minutes(self.carried[tlp]))
+
+
+def _round_chunk(payload: _ChunkPayload) -> List[List[_ResultRow]]:
+    tlp_rows, days, interval_minutes, flags, plugins = payload
+    registry = TLPRegistry()
+    for row in tlp_rows:
+        registry.intern(TLP.from_row(row))
+    table = RoundingTable(RoundingInterval(interval_minutes))
+    results = []
+    for minutes, tlp_ids, adjustments, carried in days:
+        timeline = DayTimeline.from_columns(minutes, tlp_ids, registry)
+        lookup = {registry[handle]: acc for handle, acc in adjustments}
+        repository = None
+        if carried:
+            repository = _CarriedAdjustments(
+                    {registry[handle]: minutes for handle, minutes in carried})
+        adjusted_tlps = apply_day_adjustments(
+                round_timeline(timeline, lookup, table), *flags, plugins,
+                repository, lookup)
+        results.append([_encode_result(adjusted) for adjusted in adjusted_tlps])
+    return results
+
+
+def _encode_result(adjusted: AdjustedTLPDuration) -> _ResultRow:
+    duration = adjusted.adjusted_duration
+    return (adjusted.tlp.to_row(),
+            duration.duration.minutes,
+            duration.adjustment.minutes,
+            duration.acc_adjustment.minutes)
+
+
+def _decode_result(row: _ResultRow) -> AdjustedTLPDuration:
+    tlp_row, minutes, adjustment, acc_adjustment = row
+    return AdjustedTLPDuration(
+            TLP.from_row(tlp_row),
+            AdjustedDuration(Minutes(minutes), Minutes(adjustment),
+                             Minutes(acc_adjustment)))
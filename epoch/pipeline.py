@@ -0,0 +1,125 @@
+# coding=utf-8
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+from epoch.functions import compose
+from epoch.time_tracking import AdjustedTLPDuration
+
+__all__ = ['PER_ITEM', 'WHOLE_DAY', 'Adjustment', 'AdjustmentRegistry',
+           'CompiledPipeline']
+
+# A per item adjustment maps one AdjustedTLPDuration to another; a whole day
+# adjustment takes the day's AdjustedTLPDurations and returns new ones.
+PER_ITEM = 'per item'
+WHOLE_DAY = 'whole day'
+
+DayAdjustment = Callable[[Iterable[AdjustedTLPDuration]],
+                         Iterable[AdjustedTLPDuration]]
+
+
+class Adjustment:
+    __slots__ = ('name', 'func', 'kind')
+
+    def __init__(self, name: str, func: Callable, kind: str=WHOLE_DAY):
+        if kind not in (PER_ITEM, WHOLE_DAY):
+            raise ValueError(f'Unknown kind of adjustment, {kind!r}')
+        self.name = name
+        self.func = func
+        self.kind = kind
+
+
+class CompiledPipeline:
+    # The day adjustments for one configuration, with runs of per item
+    # adjustments fused into a single pass. steps holds (name, whole day
+    # function) pairs, in order.
+    def __init__(self, steps: Iterable[Tuple[str, DayAdjustment]]):
+        self.steps: Tuple[Tuple[str, DayAdjustment], ...] = tuple(steps)
+
+    def __call__(self, adjusted_tlps: Iterable[AdjustedTLPDuration]
+                 ) -> Iterable[AdjustedTLPDuration]:
+        for _, step in self.steps:
+            adjusted_tlps = step(adjusted_tlps)
+        return adjusted_tlps
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+class AdjustmentRegistry:
+    # Adjustments by name. Stages to compile are given as registered names
+    # or as callables, which are looked up by identity and otherwise taken
+    # to be whole day adjustments. Compiled pipelines are kept per sequence
+    # of stages and dropped when anything is registered.
+    def __init__(self, max_compiled: int=256):
+        self.max_compiled = max_compiled
+        self._by_name: Dict[str, Adjustment] = {}
+        self._by_func: Dict[Callable, Adjustment] = {}
+        self._compiled: Dict[Tuple, CompiledPipeline] = {}
+
+    def register(self, name: str, kind: str=WHOLE_DAY):
+        # as a decorator
+        def register_func(func: Callable) -> Callable:
+            self.add(Adjustment(name, func, kind))
+            return func
+        return register_func
+
+    def add(self, adjustment: Adjustment) -> None:
+        self._by_name[adjustment.name] = adjustment
+        self._by_func[adjustment.func] = adjustment
+        self._compiled.clear()
+
+    def __getitem__(self, name: str) -> Adjustment:
+        return self._by_name[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def compile(self, stages: Iterable[Union[str, Callable]]) -> CompiledPipeline:
+        stages = tuple(stages)
+        try:
+            return self._compiled[stages]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable plugins can't be cached
+            return self._compile(stages)
+        if len(self._compiled) >= self.max_compiled:
+            self._compiled.clear()
+        pipeline = self._compiled[stages] = self._compile(stages)
+        return pipeline
+
+    def _compile(self, stages: Tuple[Union[str, Callable], ...]) -> CompiledPipeline:
+        steps: List[Tuple[str, DayAdjustment]] = []
+        per_item: List[Adjustment] = []
+        for stage in stages:
+            adjustment = self._adjustment(stage)
+            if adjustment.kind == PER_ITEM:
+                per_item.append(adjustment)
+            else:
+                if per_item:
+                    steps.append(_fuse(per_item))
+                    per_item = []
+                steps.append((adjustment.name, adjustment.func))
+        if per_item:
+            steps.append(_fuse(per_item))
+        return CompiledPipeline(steps)
+
+    def _adjustment(self, stage: Union[str, Callable]) -> Adjustment:
+        if isinstance(stage, str):
+            return self._by_name[stage]
+        try:
+            return self._by_func[stage]
+        except (KeyError, TypeError):
+            return Adjustment(_name_of(stage), stage, WHOLE_DAY)
+
+
+def _fuse(adjustments: List[Adjustment]) -> Tuple[str, DayAdjustment]:
+    # a run of per item adjustments as one pass over the day
+    composed = compose([adjustment.func for adjustment in adjustments])
+
+    def run(adjusted_tlps):
+        return [composed(adjusted) for adjusted in adjusted_tlps]
+    return '+'.join(adjustment.name for adjustment in adjustments), run
+
+
+def _name_of(func: Callable) -> str:
+    return getattr(func, '__qualname__', None) or repr(func)
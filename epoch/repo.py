@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Iterable, Union, MutableMapping
+from collections import OrderedDict
+from typing import AsyncIterator, Iterable, Union, MutableMapping
 
 from epoch.time import Time
 from epoch.time_tracking import TLP, TLPDuration, TLPLine
@@ -45,38 +46,132 @@ class TimeLineRepository(ABC):
         pass
 
 
+class AsyncAdjustmentsRepository(ABC):
+    # AdjustmentsRepository for stores reached over the network, with every
+    # method a coroutine and retrieve_all an async iterator.
+    @abstractmethod
+    def retrieve_all(self) -> AsyncIterator[TLPDuration]:
+        pass
+
+    @abstractmethod
+    async def retrieve(self, tlp: TLP) -> TLPDuration:
+        pass
+
+    @abstractmethod
+    async def remove(self, tlp: Union[TLP, TLPDuration]) -> None:
+        pass
+
+    @abstractmethod
+    async def set(self, tlp_dur: TLPDuration) -> None:
+        pass
+
+    @abstractmethod
+    async def set_all(self, durs: Iterable[TLPDuration]) -> None:
+        pass
+
+
+class AsyncTimeLineRepository(ABC):
+    @abstractmethod
+    async def add_line(self, tlp_line: TLPLine) -> None:
+        pass
+
+    @abstractmethod
+    def retrieve_lines(self) -> AsyncIterator[TLPLine]:
+        pass
+
+    @abstractmethod
+    async def remove_line_by_time(self, time: Time) -> None:
+        pass
+
+    @abstractmethod
+    async def update_line_tlp(self, tlp_line: TLPLine) -> None:
+        pass
+
+
 class CachedAdjustmentsRepository(AdjustmentsRepository):
-    def __init__(self, wrapped: AdjustmentsRepository):
+    # Keeps up to max_size recently used adjustments (unbounded if None),
+    # loading them from the wrapped repository on a miss. Writes are buffered
+    # in memory and coalesced per TLP. Nothing happens in the background:
+    # the set() that brings the buffer to flush_size TLPs writes all of them
+    # with one call to the wrapped repository's set_all, synchronously, as
+    # do flush(), close() and retrieve_all(). Writes still buffered when the
+    # process dies are lost.
+    def __init__(self, wrapped: AdjustmentsRepository,
+                 max_size: int=None, flush_size: int=64):
+        if max_size is not None and max_size < 1:
+            raise ValueError(f'max_size must be positive, not {max_size}')
+        if flush_size < 1:
+            raise ValueError(f'flush_size must be positive, not {flush_size}')
         self.wrapped: AdjustmentsRepository = wrapped
-        self.cache: MutableMapping[TLP, TLPDuration] = {}
-        self.invalidate()
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.cache: MutableMapping[TLP, TLPDuration] = OrderedDict()
+        self.pending: MutableMapping[TLP, TLPDuration] = {}
 
     def invalidate(self):
-        del self.cache
-        self.cache = {}
-        for tlp_dur in self.wrapped.retrieve_all():
-            self.cache[tlp_dur.tlp] = tlp_dur
+        self.flush()
+        self.cache = OrderedDict()
 
     def retrieve_all(self) -> Iterable[TLPDuration]:
-        return self.cache.values()
+        self.flush()
+        return self.wrapped.retrieve_all()
 
     def retrieve(self, tlp: TLP) -> TLPDuration:
-        return self.cache[tlp]
+        try:
+            tlp_dur = self.cache[tlp]
+            self.cache.move_to_end(tlp)
+            return tlp_dur
+        except KeyError:
+            pass
+        tlp_dur = self.pending.get(tlp)
+        if tlp_dur is None:
+            tlp_dur = self.wrapped.retrieve(tlp)
+        self._cache(tlp_dur)
+        return tlp_dur
 
     def remove(self, tlp: Union[TLP, TLPDuration]) -> None:
         if isinstance(tlp, TLPDuration):
             tlp = tlp.tlp
-        del self.cache[tlp]
-        self.wrapped.remove(tlp)
+        self.cache.pop(tlp, None)
+        if self.pending.pop(tlp, None) is None:
+            self.wrapped.remove(tlp)
+        else:
+            try:
+                self.wrapped.remove(tlp)
+            except KeyError:
+                # it had only been set here, and never written
+                pass
 
     def set(self, tlp_dur: TLPDuration) -> None:
-        self.cache[tlp_dur.tlp] = tlp_dur
-        self.wrapped.set(tlp_dur)
+        self._cache(tlp_dur)
+        self.pending[tlp_dur.tlp] = tlp_dur
+        if len(self.pending) >= self.flush_size:
+            self.flush()
 
     def set_all(self, durs: Iterable[TLPDuration]) -> None:
         for tlp_dur in durs:
-            self.cache[tlp_dur.tlp] = tlp_dur
-        self.wrapped.set_all(durs)
+            self.set(tlp_dur)
+
+    def flush(self) -> None:
+        if self.pending:
+            self.wrapped.set_all(list(self.pending.values()))
+            self.pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'CachedAdjustmentsRepository':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _cache(self, tlp_dur: TLPDuration) -> None:
+        self.cache[tlp_dur.tlp] = tlp_dur
+        self.cache.move_to_end(tlp_dur.tlp)
+        if self.max_size is not None:
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
 
     def __getattr__(self, item):
-        return getattr(self.wrapped, item)
\ No newline at end of file
+        return getattr(self.wrapped, item)
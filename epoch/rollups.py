@@ -0,0 +1,138 @@
+# coding=utf-8
+from datetime import date as Date
+from typing import Dict, Hashable, Iterable, List, Mapping, Sequence, Tuple
+
+from epoch.time_tracking import AdjustedTLPDuration, TLP
+
+__all__ = ['DAY', 'WEEK', 'MONTH', 'TLP_LEVEL', 'TLPRollups']
+
+DAY = 'day'
+WEEK = 'week'
+MONTH = 'month'
+PERIODS = (DAY, WEEK, MONTH)
+
+# breakdown() by TLP_LEVEL gives the totals of each TLP
+TLP_LEVEL = 'tlp'
+
+
+class TLPRollups:
+    # Per day per TLP totals, with the totals of every day, ISO week and
+    # month kept ready at each level of a hierarchy of TLP components: all
+    # of it, per customer, per customer and product, ... and per TLP.
+    # Recording a day again only applies the difference from what was
+    # recorded for it before.
+    def __init__(self, hierarchy: Sequence[str]=('customer', 'product', 'prj')):
+        self.hierarchy: Tuple[str, ...] = tuple(hierarchy)
+        self._days: Dict[Date, Dict[TLP, int]] = {}
+        # (period, period key) -> group -> minutes, where a group is a tuple
+        # of component values down some level of the hierarchy
+        self._totals: Dict[Tuple[str, Hashable], Dict[Tuple, int]] = {}
+        # (period, period key) -> TLP -> minutes, kept apart from the groups
+        # as comparing a TLP with a tuple raises
+        self._tlp_totals: Dict[Tuple[str, Hashable], Dict[TLP, int]] = {}
+
+    def record_day(self, day: Date,
+                   adjusted_tlps: Iterable[AdjustedTLPDuration]) -> None:
+        # the rounded durations of the day's workflow results
+        totals: Dict[TLP, int] = {}
+        for adjusted in adjusted_tlps:
+            minutes = adjusted.adjusted_duration.adjusted_duration.minutes
+            totals[adjusted.tlp] = totals.get(adjusted.tlp, 0) + minutes
+        self.record_totals(day, totals)
+
+    def record_totals(self, day: Date, totals: Mapping[TLP, int]) -> None:
+        old = self._days.get(day, {})
+        new = {tlp: minutes for tlp, minutes in totals.items() if minutes}
+        periods = _period_keys(day)
+        for tlp in set(old) | set(new):
+            change = new.get(tlp, 0) - old.get(tlp, 0)
+            if change:
+                self._apply(periods, tlp, change)
+        if new:
+            self._days[day] = new
+        else:
+            self._days.pop(day, None)
+
+    def remove_day(self, day: Date) -> None:
+        self.record_totals(day, {})
+
+    def day_totals(self, day: Date) -> Dict[TLP, int]:
+        return dict(self._days.get(day, {}))
+
+    def total(self, period: str, day: Date, **components) -> int:
+        # The minutes in the period holding day, for the group the
+        # components name, which have to be the first levels of the
+        # hierarchy; total(WEEK, day, customer=3) for a customer's week.
+        group = self._group(components)
+        return self._period_totals(period, day).get(group, 0)
+
+    def breakdown(self, period: str, day: Date,
+                  by: str=TLP_LEVEL) -> Dict[Hashable, int]:
+        # Every group's minutes at the level of the hierarchy named by `by`,
+        # in the period holding day. Groups are tuples of the component
+        # values down to that level, or TLPs by TLP_LEVEL.
+        if by == TLP_LEVEL:
+            return dict(self._period_totals(period, day, self._tlp_totals))
+        depth = self._depth(by)
+        return {group: minutes
+                for group, minutes in self._period_totals(period, day).items()
+                if len(group) == depth}
+
+    def _apply(self, periods: List[Tuple[str, Hashable]], tlp: TLP,
+               change: int) -> None:
+        groups = self._groups(tlp)
+        for period in periods:
+            _add(self._totals, period, groups, change)
+            _add(self._tlp_totals, period, [tlp], change)
+
+    def _groups(self, tlp: TLP) -> List[Tuple]:
+        values = tuple(getattr(tlp, level) for level in self.hierarchy)
+        return [values[:depth] for depth in range(len(values) + 1)]
+
+    def _group(self, components: Mapping[str, Hashable]) -> Tuple:
+        names = self.hierarchy[:len(components)]
+        if set(components) != set(names):
+            raise ValueError(f'{sorted(components)} are not the first levels of '
+                             f'the hierarchy {self.hierarchy}')
+        return tuple(components[name] for name in names)
+
+    def _depth(self, level: str) -> int:
+        try:
+            return self.hierarchy.index(level) + 1
+        except ValueError:
+            raise ValueError(f'{level} is not a level of {self.hierarchy}')
+
+    def _period_totals(self, period: str, day: Date,
+                       totals: Dict[Tuple[str, Hashable], Dict]=None
+                       ) -> Dict[Hashable, int]:
+        if period not in PERIODS:
+            raise ValueError(f'Unknown period, {period!r}')
+        totals = self._totals if totals is None else totals
+        return totals.get((period, _period_key(period, day)), {})
+
+
+def _add(totals_by_period: Dict[Tuple[str, Hashable], Dict[Hashable, int]],
+         period: Tuple[str, Hashable], keys: Iterable[Hashable],
+         change: int) -> None:
+    # dropping whatever comes to 0, so only periods with time are kept
+    totals = totals_by_period.setdefault(period, {})
+    for key in keys:
+        minutes = totals.get(key, 0) + change
+        if minutes:
+            totals[key] = minutes
+        else:
+            del totals[key]
+    if not totals:
+        del totals_by_period[period]
+
+
+def _period_key(period: str, day: Date) -> Hashable:
+    if period == DAY:
+        return day
+    if period == WEEK:
+        return tuple(day.isocalendar()[:2])
+    return day.year, day.month
+
+
+def _period_keys(day: Date) -> List[Tuple[str, Hashable]]:
+    return [(period, _period_key(period, day)) for period in PERIODS]
@@ -4,8 +4,17 @@
 from functools import partial
 from typing import Tuple, Callable
 
+from .day_adjustments import (FirstTimeAdjustment, FullDayAdjustment,
+                              TravelTimeAdjustment)
 from .functions import *
+from .pipeline import AdjustmentRegistry, CompiledPipeline
+from .repo import AdjustmentsRepository
 from .time_tracking import *
+from .timeline import DayTimeline
+
+# The day adjustments full_workflow can run, its own and any plugins
+# registered with their kind.
+adjustments = AdjustmentRegistry()
 
 
 def full_workflow(
@@ -14,30 +23,85 @@ def full_workflow(
         do_travel_time: bool,
         do_first_time: bool,
         do_full_day: bool,
-        plugins: Iterable[Callable[[AdjustedTLPDuration], AdjustedTLPDuration]]
+        plugins: Iterable[Callable[[AdjustedTLPDuration], AdjustedTLPDuration]],
+        profiler: 'WorkflowProfiler'=None,
+        adjustments_repository: AdjustmentsRepository=None
+        ) -> Iterable[AdjustedTLPDuration]:
+    # profiler is an epoch.instrumentation.WorkflowProfiler, to record the
+    # call stage by stage. adjustments_repository is where first_time looks
+    # up adjustments carried over for TLPs adjustment_lookup doesn't have.
+    if profiler is not None:
+        return profiler.workflow(tlp_lines, adjustment_lookup, do_travel_time,
+                                 do_first_time, do_full_day, plugins,
+                                 adjustments_repository)
+    return apply_day_adjustments(
+        basic_workflow(tlp_lines, adjustment_lookup),
+        do_travel_time,
+        do_first_time,
+        do_full_day,
+        plugins,
+        adjustments_repository,
+        adjustment_lookup)
+
+
+def apply_day_adjustments(
+        adjusted_tlps: Iterable[AdjustedTLPDuration],
+        do_travel_time: bool,
+        do_first_time: bool,
+        do_full_day: bool,
+        plugins: Iterable[Callable[[AdjustedTLPDuration], AdjustedTLPDuration]],
+        adjustments_repository: AdjustmentsRepository=None,
+        adjustment_lookup: Dict[TLP, int]=None
         ) -> Iterable[AdjustedTLPDuration]:
-    return Stream(plugins).pipe(
-        pipe(basic_workflow, tlp_lines, adjustment_lookup)
-        .then(do_if(do_travel_time, travel_time_adjustment))
-        .then(do_if(do_first_time, first_time_adjustment))
-        .then(do_if(do_full_day, full_day_adjustment)))
+    return day_adjustments(
+        do_travel_time, do_first_time, do_full_day, plugins,
+        adjustments_repository, adjustment_lookup)(adjusted_tlps)
 
 
+def day_adjustments(
+        do_travel_time: bool,
+        do_first_time: bool,
+        do_full_day: bool,
+        plugins: Iterable[Callable]=(),
+        adjustments_repository: AdjustmentsRepository=None,
+        adjustment_lookup: Dict[TLP, int]=None
+        ) -> CompiledPipeline:
+    # With an adjustments_repository, first_time is a FirstTimeAdjustment
+    # for this day's adjustment_lookup, between the compiled stages before
+    # and after it; without one there is nothing to look up and the
+    # registered pass through is used.
+    before = ['travel_time'] if do_travel_time else []
+    after = ['full_day'] if do_full_day else []
+    after.extend(plugins)
+    if not do_first_time:
+        return adjustments.compile(before + after)
+    if adjustments_repository is None:
+        return adjustments.compile(before + ['first_time'] + after)
+    first_time = FirstTimeAdjustment(adjustments_repository, adjustment_lookup)
+    return CompiledPipeline(adjustments.compile(before).steps
+                            + (('first_time', first_time),)
+                            + adjustments.compile(after).steps)
+
+
+_travel_time = TravelTimeAdjustment()
+_full_day = FullDayAdjustment()
+
+
+@adjustments.register('travel_time')
 def travel_time_adjustment(adjusted_tlps):
-    # TODO
-    return adjusted_tlps
+    return _travel_time(adjusted_tlps)
 
 
+@adjustments.register('first_time')
 def first_time_adjustment(adjusted_tlps):
-    # TODO
-    # nonlocal adjustment_lookup
-
+    # without an adjustments repository there is nowhere to find carried
+    # over adjustments
     return adjusted_tlps
 
 
+@adjustments.register('full_day')
 def full_day_adjustment(adjusted_tlps):
-    # TODO
-    return adjusted_tlps
+    return _full_day(adjusted_tlps)
 
 
 def basic_workflow(
@@ -46,12 +110,21 @@ def basic_workflow(
         ) -> Iterable[AdjustedTLPDuration]:
     return (pipe(times_to_durations, tlp_lines)
             .then(combine_tlp_durations)
-            .then_post(add_adjustments, adjustment_lookup))
+            .then_post(add_adjustments, adjustment_lookup)
+            .value)
+
+
+def columnar_basic_workflow(
+        timeline: DayTimeline,
+        adjustment_lookup: Dict[TLP, int]
+        ) -> Iterable[AdjustedTLPDuration]:
+    return [tlp_duration.with_adjustment_from(adjustment_lookup)
+            for tlp_duration in timeline.combined_durations()]
 
 
 def times_to_durations(tlp_lines: Iterable[TLPLine]) -> Iterable[TLPDuration]:
-    orig, offset = Stream(tlp_lines).tee()
-    return (orig.zip(offset.skip_first())
+    return (Stream(tlp_lines)
+            .pairwise()
             .map(_combine_to_duration))
 
 
@@ -62,14 +135,18 @@ def _combine_to_duration(times: Tuple[TLPLine, TLPLine]) -> TLPDuration:
 def combine_tlp_durations(
         tlp_durations: Iterable[TLPDuration]
         ) -> Iterable[TLPDuration]:
-    tlps = {}
+    totals: Dict[TLP, int] = {}
+    descriptions: Dict[TLP, Descriptions] = {}
     for tlp_duration in tlp_durations:
         tlp = tlp_duration.tlp
-        if tlp in tlps:
-            tlps[tlp] += tlp_duration
+        if tlp in totals:
+            totals[tlp] += tlp_duration.duration.minutes
+            descriptions[tlp].append(tlp.description)
         else:
-            tlps[tlp] = tlp_duration
-    return Stream(tlps.items())
+            totals[tlp] = tlp_duration.duration.minutes
+            descriptions[tlp] = Descriptions(tlp.description)
+    return Stream(TLPDuration(descriptions[tlp].render_onto(tlp), Minutes(total))
+                  for tlp, total in totals.items())
 
 
 def add_adjustments(
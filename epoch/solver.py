@@ -0,0 +1,67 @@
+# coding=utf-8
+from typing import Dict, Iterable, List
+
+from epoch.rounding import combine_tlp_durations, times_to_durations
+from epoch.time import (AdjustedDuration, FIFTEEN_MINUTES, Minutes,
+                        RoundingInterval)
+from epoch.time_tracking import AdjustedTLPDuration, TLP, TLPDuration, TLPLine
+
+__all__ = ['solve_rounding', 'solved_workflow']
+
+
+def solve_rounding(
+        tlp_durations: Iterable[TLPDuration],
+        adjustment_lookup: Dict[TLP, int],
+        interval: RoundingInterval=None
+        ) -> List[AdjustedTLPDuration]:
+    # Rounds every total up or down so that together they add up to the
+    # grand total rounded to the nearest interval (halves round up), while
+    # keeping the sum of the accumulated adjustments' sizes as small as
+    # possible.
+    #
+    # Rounding everything down misses that target by a whole number, k, of
+    # intervals, so exactly k of the totals that are not already multiples
+    # must round up instead. Rounding total i up rather than down changes
+    # the objective by |acc_i + up_i| - |acc_i - down_i| independently of
+    # the others, so the k totals with the smallest change are the best
+    # choice. Sorting those changes makes it O(n log n).
+    interval = FIFTEEN_MINUTES if interval is None else interval
+    tlp_durations = list(tlp_durations)
+    size = interval.minutes
+    accs = [adjustment_lookup.get(tlp_duration.tlp, 0)
+            for tlp_duration in tlp_durations]
+    downs = [interval.distance_down(tlp_duration.duration.minutes)
+             for tlp_duration in tlp_durations]
+    total = sum(tlp_duration.duration.minutes for tlp_duration in tlp_durations)
+    target = total - interval.distance_down(total)
+    if 2 * interval.distance_down(total) >= size:
+        target += size
+    rounds_up = (target - (total - sum(downs))) // size
+
+    candidates = [i for i, down in enumerate(downs) if down]
+    candidates.sort(key=lambda i: (abs(accs[i] + size - downs[i])
+                                   - abs(accs[i] - downs[i])))
+    up = [False] * len(tlp_durations)
+    for i in candidates[:rounds_up]:
+        up[i] = True
+
+    return [AdjustedTLPDuration(
+                tlp_duration.tlp,
+                AdjustedDuration(tlp_duration.duration,
+                                 Minutes(size - down if is_up else -down),
+                                 Minutes(acc)))
+            for tlp_duration, acc, down, is_up
+            in zip(tlp_durations, accs, downs, up)]
+
+
+def solved_workflow(
+        tlp_lines: Iterable[TLPLine],
+        adjustment_lookup: Dict[TLP, int],
+        interval: RoundingInterval=None
+        ) -> List[AdjustedTLPDuration]:
+    # basic_workflow, with the day's totals rounded together by
+    # solve_rounding instead of one at a time.
+    return solve_rounding(
+            combine_tlp_durations(times_to_durations(tlp_lines)),
+            adjustment_lookup,
+            interval)
@@ -0,0 +1,61 @@
+# coding=utf-8
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Sequence
+
+__all__ = ['SortedColumns', 'put', 'nearest']
+
+
+class SortedColumns(ABC):
+    # A day's lines as minutes in ascending order with a TLP handle beside
+    # each. Stores say where the columns live and how to shift them; put()
+    # and nearest() keep them in order.
+    @property
+    @abstractmethod
+    def minutes(self) -> Sequence[int]:
+        pass
+
+    @property
+    @abstractmethod
+    def handles(self) -> Sequence[int]:
+        pass
+
+    @abstractmethod
+    def insert(self, position: int, minutes: int, handle: int) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, position: int) -> None:
+        pass
+
+    @abstractmethod
+    def set_handle(self, position: int, handle: int) -> None:
+        pass
+
+
+def put(columns: SortedColumns, minutes: int, handle: int) -> bool:
+    # Gives the line at minutes the handle, adding the line if there isn't
+    # one. True if it was added.
+    column = columns.minutes
+    position = bisect_left(column, minutes)
+    if position < len(column) and column[position] == minutes:
+        columns.set_handle(position, handle)
+        return False
+    columns.insert(position, minutes, handle)
+    return True
+
+
+def nearest(column: Sequence[int], minutes: int, max_distance: int=None) -> int:
+    # The position of the line closest to minutes, the earlier one on a tie,
+    # or -1 if there is none within max_distance (None for any distance).
+    if not column:
+        return -1
+    position = bisect_left(column, minutes)
+    if position == len(column) or (
+            position > 0
+            and minutes - column[position - 1] <= column[position] - minutes):
+        position -= 1
+    if (max_distance is not None
+            and abs(column[position] - minutes) > max_distance):
+        return -1
+    return position
@@ -0,0 +1,183 @@
+# coding=utf-8
+import sqlite3
+from contextlib import contextmanager
+from datetime import date as Date
+from queue import Empty, LifoQueue
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from epoch.repo import AdjustmentsRepository, TimeLineRepository
+from epoch.time import Minutes, Time
+from epoch.time_tracking import TLP, TLPDuration, TLPLine
+
+__all__ = ['ConnectionPool', 'SQLiteAdjustmentsRepository',
+           'SQLiteTimeLineRepository']
+
+# TLPs are stored as their columns plus a text key made of the non
+# description components, because SQLite treats NULLs (undefined
+# components) as distinct in unique indexes.
+_TLP_COLUMNS = 'tlp_code, description, customer, product, code, slg, dlg, prj'
+
+_TLP_COLUMN_DEFINITIONS = '''
+    tlp_code INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    customer INTEGER,
+    product INTEGER,
+    code INTEGER,
+    slg INTEGER,
+    dlg INTEGER,
+    prj INTEGER'''
+
+_SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS adjustments (
+    tlp_key TEXT PRIMARY KEY,{_TLP_COLUMN_DEFINITIONS},
+    minutes INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS lines (
+    day TEXT NOT NULL,
+    minute INTEGER NOT NULL,
+    tlp_key TEXT NOT NULL,{_TLP_COLUMN_DEFINITIONS},
+    PRIMARY KEY (day, minute));
+CREATE INDEX IF NOT EXISTS lines_by_tlp ON lines (tlp_key, day);
+'''
+
+# The statements are constants so every pooled connection keeps them
+# prepared in its statement cache.
+_SET_ADJUSTMENT = ('INSERT OR REPLACE INTO adjustments '
+                   f'(tlp_key, {_TLP_COLUMNS}, minutes) '
+                   'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+_SELECT_ADJUSTMENTS = f'SELECT {_TLP_COLUMNS}, minutes FROM adjustments'
+_SELECT_ADJUSTMENT = _SELECT_ADJUSTMENTS + ' WHERE tlp_key = ?'
+_DELETE_ADJUSTMENT = 'DELETE FROM adjustments WHERE tlp_key = ?'
+
+_SET_LINE = ('INSERT OR REPLACE INTO lines '
+             f'(day, minute, tlp_key, {_TLP_COLUMNS}) '
+             'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+_SELECT_LINES = (f'SELECT minute, {_TLP_COLUMNS} FROM lines '
+                 'WHERE day = ? ORDER BY minute')
+_DELETE_LINE = 'DELETE FROM lines WHERE day = ? AND minute = ?'
+
+
+class ConnectionPool:
+    def __init__(self, path: str, size: int=4, cached_statements: int=64):
+        self.path = path
+        self.cached_statements = cached_statements
+        self._idle = LifoQueue(maxsize=size)
+        with self.connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            connection = self._idle.get_nowait()
+        except Empty:
+            connection = sqlite3.connect(
+                    self.path,
+                    check_same_thread=False,
+                    cached_statements=self.cached_statements)
+        try:
+            yield connection
+        finally:
+            if self._idle.full():
+                connection.close()
+            else:
+                self._idle.put_nowait(connection)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.connection() as connection:
+            with connection:
+                yield connection
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                return
+
+
+class SQLiteAdjustmentsRepository(AdjustmentsRepository):
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def retrieve_all(self) -> Iterable[TLPDuration]:
+        with self.pool.connection() as connection:
+            return [_to_tlp_duration(row)
+                    for row in connection.execute(_SELECT_ADJUSTMENTS)]
+
+    def retrieve(self, tlp: TLP) -> TLPDuration:
+        with self.pool.connection() as connection:
+            row = connection.execute(
+                    _SELECT_ADJUSTMENT, (_tlp_key(tlp),)).fetchone()
+        if row is None:
+            raise KeyError(tlp)
+        return _to_tlp_duration(row)
+
+    def remove(self, tlp: Union[TLP, TLPDuration]) -> None:
+        if isinstance(tlp, TLPDuration):
+            tlp = tlp.tlp
+        with self.pool.transaction() as connection:
+            if connection.execute(
+                    _DELETE_ADJUSTMENT, (_tlp_key(tlp),)).rowcount == 0:
+                raise KeyError(tlp)
+
+    def set(self, tlp_dur: TLPDuration) -> None:
+        with self.pool.transaction() as connection:
+            connection.execute(_SET_ADJUSTMENT, _adjustment_row(tlp_dur))
+
+    def set_all(self, durs: Iterable[TLPDuration]) -> None:
+        with self.pool.transaction() as connection:
+            connection.executemany(
+                    _SET_ADJUSTMENT, map(_adjustment_row, durs))
+
+
+class SQLiteTimeLineRepository(TimeLineRepository):
+    def __init__(self, pool: ConnectionPool, day: Date=None):
+        self.pool = pool
+        self.day = Date.today() if day is None else day
+
+    def for_day(self, day: Date) -> 'SQLiteTimeLineRepository':
+        return SQLiteTimeLineRepository(self.pool, day)
+
+    def add_line(self, tlp_line: TLPLine) -> None:
+        with self.pool.transaction() as connection:
+            connection.execute(_SET_LINE, self._line_row(tlp_line))
+
+    def add_lines(self, tlp_lines: Iterable[TLPLine]) -> None:
+        with self.pool.transaction() as connection:
+            connection.executemany(_SET_LINE, map(self._line_row, tlp_lines))
+
+    def retrieve_lines(self) -> Iterable[TLPLine]:
+        with self.pool.connection() as connection:
+            rows = connection.execute(_SELECT_LINES, (self.day.isoformat(),))
+            return [TLPLine(TLP.from_row(row[1:]), Time.from_minutes(row[0]))
+                    for row in rows]
+
+    def remove_line_by_time(self, time: Time) -> None:
+        with self.pool.transaction() as connection:
+            if connection.execute(
+                    _DELETE_LINE,
+                    (self.day.isoformat(), time.minutes)).rowcount == 0:
+                raise KeyError(time)
+
+    def update_line_tlp(self, tlp_line: TLPLine) -> None:
+        self.add_line(tlp_line)
+
+    def _line_row(self, tlp_line: TLPLine) -> Tuple:
+        tlp = tlp_line.tlp
+        return ((self.day.isoformat(), tlp_line.time.minutes, _tlp_key(tlp))
+                + tlp.to_row())
+
+
+def _tlp_key(tlp: TLP) -> str:
+    tlp_code, _, *components = tlp.to_row()
+    return '|'.join(['' if component is None else str(component)
+                     for component in [tlp_code] + components])
+
+
+def _adjustment_row(tlp_dur: TLPDuration) -> List:
+    tlp = tlp_dur.tlp
+    return [_tlp_key(tlp), *tlp.to_row(), tlp_dur.duration.minutes]
+
+
+def _to_tlp_duration(row: Tuple) -> TLPDuration:
+    return TLPDuration(TLP.from_row(row[:-1]), Minutes(row[-1]))
@@ -1,22 +1,44 @@
 # coding=utf-8
-from typing import Tuple
+from array import array
+from typing import Dict, List, Tuple
 
-from epoch.functions import Stream
+from epoch.immutable import Immutable, init_attr
 
-__all__ = ['Time', 'Duration', 'DurationWithAdjustment', 'AdjustedDuration']
+__all__ = ['Time', 'Duration', 'Minutes', 'RoundingInterval',
+           'DurationWithAdjustment', 'AdjustedDuration', 'SIX_MINUTES',
+           'TEN_MINUTES', 'FIFTEEN_MINUTES', 'THIRTY_MINUTES']
 
 
-class Time:
-    def __init__(self, hour: int, minute: int):
+MINUTES_PER_DAY = 24 * 60
+
+
+class Time(Immutable):
+    # There are only MINUTES_PER_DAY distinct whole minute times, so they
+    # are all created up front and shared. Anything else, like a float,
+    # gets an instance of its own, as before.
+    __slots__ = ('minutes',)
+
+    def __new__(cls, hour: int, minute: int):
         if hour < 0 or hour > 23 or minute < 0 or minute > 59:
             raise AttributeError('Time must a proper time of day')
-        self.minutes = minute + (hour * 60)
+        return Time.from_minutes(minute + (hour * 60))
+
+    @staticmethod
+    def from_minutes(minutes: int) -> 'Time':
+        if not 0 <= minutes < MINUTES_PER_DAY:
+            raise AttributeError('Time must a proper time of day')
+        if type(minutes) is int:
+            return _times[minutes]
+        return _new_time(minutes)
+
+    def __reduce__(self):
+        return Time, mins_to_hours_and_mins(self.minutes)
 
     def time_between(self, other: 'Time') -> 'Duration':
         if self < other:
-            return Duration(minutes=(other.minutes - self.minutes))
+            return Minutes(other.minutes - self.minutes)
         else:
-            return Duration(minutes=(self.minutes - other.minutes))
+            return Minutes(self.minutes - other.minutes)
 
     def __str__(self) -> str:
         hour, minute = mins_to_hours_and_mins(self.minutes)
@@ -41,65 +63,86 @@ class Time:
         return hash(self.minutes) * 19001
 
     def __add__(self, other: 'Duration') -> 'Time':
-        return Time(*mins_to_hours_and_mins(self.minutes + other.minutes))
+        return Time.from_minutes(self.minutes + other.minutes)
 
     def __sub__(self, other: 'Duration') -> 'Time':
-        return Time(*mins_to_hours_and_mins(self.minutes - other.minutes))
+        return Time.from_minutes(self.minutes - other.minutes)
+
+
+def _new_time(minutes: int) -> Time:
+    time = object.__new__(Time)
+    init_attr(time, 'minutes', minutes)
+    return time
+
+
+_times: List[Time] = [_new_time(minutes) for minutes in range(MINUTES_PER_DAY)]
 
 
 def mins_to_hours_and_mins(mins: int) -> Tuple[int, int]:
     return mins // 60, mins % 60
 
 
-class Duration:
-    def __init__(self, *, hours: int=0, minutes: int):
-        self.minutes = minutes + (hours * 60)
+class Duration(Immutable):
+    # Whole minute durations of up to a day either way are shared
+    # instances; see Minutes().
+    __slots__ = ('minutes',)
+
+    def __new__(cls, *, hours: int=0, minutes: int):
+        return Minutes(minutes + (hours * 60))
+
+    def __reduce__(self):
+        return Minutes, (self.minutes,)
 
     @property
     def is_fifteen_minute_interval(self) -> bool:
         return self.minutes % 15 == 0
 
-    def with_accumulated_adjustment(self, acc_adjustment: 'Duration') -> 'AdjustedDuration':
-        return DurationWithAdjustment(self, acc_adjustment).adjust()
+    def with_accumulated_adjustment(
+            self, acc_adjustment: 'Duration',
+            interval: 'RoundingInterval'=None) -> 'AdjustedDuration':
+        if interval is None:
+            interval = FIFTEEN_MINUTES
+        return AdjustedDuration(
+                self,
+                Minutes(interval.best_adjustment(
+                        self.minutes, acc_adjustment.minutes)),
+                acc_adjustment)
 
     def distance_to_nearest_15(
             self, acc_adjustment: 'Duration') -> 'Duration':
-        adjustment_up, adjustment_down = self.adjustments_to_nearest_15s
-        new_adj_up = acc_adjustment + adjustment_up
-        new_adj_down = acc_adjustment + adjustment_down
-        if abs(new_adj_up) < abs(new_adj_down):
-            return adjustment_up
-        else:
-            return adjustment_down
+        return self.distance_to_nearest(acc_adjustment, FIFTEEN_MINUTES)
+
+    def distance_to_nearest(
+            self, acc_adjustment: 'Duration',
+            interval: 'RoundingInterval') -> 'Duration':
+        return Minutes(interval.best_adjustment(
+                self.minutes, acc_adjustment.minutes))
 
     @property
     def adjustments_to_nearest_15s(self) -> Tuple['Duration', 'Duration']:
-        if self.is_fifteen_minute_interval:
-            return Duration(minutes=0), Duration(minutes=0)
-        else:
-            adjustment_up = self.distance_up_to_nearest_15
-            adjustment_down = Duration(minutes=15) - adjustment_up
-            return adjustment_up, adjustment_down
+        return self.adjustments_to_nearest(FIFTEEN_MINUTES)
+
+    def adjustments_to_nearest(
+            self, interval: 'RoundingInterval'
+            ) -> Tuple['Duration', 'Duration']:
+        up, down = interval.adjustments(self.minutes)
+        return Minutes(up), Minutes(down)
 
     @property
     def distance_up_to_nearest_15(self) -> 'Duration':
-        if self.is_fifteen_minute_interval:
-            return Duration(minutes=0)
-        return (Stream(range(1, 15))
-                .map(lambda x: Duration(minutes=x))
-                .map(self.__add__)
-                .filter(Duration.is_fifteen_minute_interval)
-                .first)
+        return self.distance_up_to_nearest(FIFTEEN_MINUTES)
 
     @property
-    def distance_down_to_nearest_15(self):
-        if self.is_fifteen_minute_interval:
-            return Duration(minutes=0)
-        return (Stream(range(1, 15))
-                .map(lambda x: Duration(minutes=x))
-                .map(self.__sub__)
-                .filter(Duration.is_fifteen_minute_interval)
-                .first)
+    def distance_down_to_nearest_15(self) -> 'Duration':
+        return self.distance_down_to_nearest(FIFTEEN_MINUTES)
+
+    def distance_up_to_nearest(
+            self, interval: 'RoundingInterval') -> 'Duration':
+        return Minutes(interval.distance_up(self.minutes))
+
+    def distance_down_to_nearest(
+            self, interval: 'RoundingInterval') -> 'Duration':
+        return Minutes(interval.distance_down(self.minutes))
 
     def __str__(self) -> str:
         opening = "" if self.minutes > 0 else "negative "
@@ -112,56 +155,175 @@ class Duration:
     def __eq__(self, other: 'Duration') -> bool:
         return self.minutes == other.minutes
 
+    def __lt__(self, other: 'Duration') -> bool:
+        return self.minutes < other.minutes
+
+    def __gt__(self, other: 'Duration') -> bool:
+        return self.minutes > other.minutes
+
+    def __ge__(self, other: 'Duration') -> bool:
+        return self.minutes >= other.minutes
+
+    def __le__(self, other: 'Duration') -> bool:
+        return self.minutes <= other.minutes
+
     def __hash__(self) -> int:
         return (hash(self.minutes) * 19001)
 
     def __add__(self, other: 'Duration') -> 'Duration':
-        return Duration(minutes=(self.minutes + other.minutes))
+        return Minutes(self.minutes + other.minutes)
 
     def __sub__(self, other: 'Duration') -> 'Duration':
-        return Duration(minutes=(self.minutes - other.minutes))
+        return Minutes(self.minutes - other.minutes)
 
     def __abs__(self) -> 'Duration':
-        return Duration(minutes=abs(self.minutes))
+        return Minutes(abs(self.minutes))
 
     def __neg__(self) -> 'Duration':
-        return Duration(minutes=-self.minutes)
+        return Minutes(-self.minutes)
 
     def __int__(self) -> int:
         return self.minutes
 
 
+def Minutes(minutes: int) -> Duration:
+    if type(minutes) is int and -MINUTES_PER_DAY <= minutes <= MINUTES_PER_DAY:
+        return _durations[minutes + MINUTES_PER_DAY]
+    return _new_duration(minutes)
+
+
+def _new_duration(minutes: int) -> Duration:
+    duration = object.__new__(Duration)
+    init_attr(duration, 'minutes', minutes)
+    return duration
+
+
+# fixed at import; shared instances must never change under their users
+_durations: Tuple[Duration, ...] = tuple(
+        _new_duration(minutes)
+        for minutes in range(-MINUTES_PER_DAY, MINUTES_PER_DAY + 1))
+
+
+class RoundingInterval:
+    # Rounds whole minutes to multiples of a fixed interval using plain
+    # integer arithmetic. Adjustments are signed: rounding up gives a
+    # positive adjustment, rounding down a negative one.
+    #
+    # best_adjustment computes its answer every time. use_table=True looks
+    # it up in a decision table shared by all intervals of the same size
+    # instead; that makes no measurable difference to a whole rounding, so
+    # it is opt-in.
+    def __init__(self, minutes: int, use_table: bool=False):
+        if minutes <= 0:
+            raise ValueError(f'Rounding interval must be positive, not {minutes}')
+        self.minutes = minutes
+        self.use_table = use_table
+        self.table = _decision_table(minutes) if use_table else None
+
+    def distance_up(self, minutes: int) -> int:
+        return -minutes % self.minutes
+
+    def distance_down(self, minutes: int) -> int:
+        return minutes % self.minutes
+
+    def adjustments(self, minutes: int) -> Tuple[int, int]:
+        down = minutes % self.minutes
+        if down == 0:
+            return 0, 0
+        return self.minutes - down, -down
+
+    def best_adjustment(self, minutes: int, acc_adjustment: int) -> int:
+        if not self.use_table:
+            return self.computed_adjustment(minutes, acc_adjustment)
+        size = self.minutes
+        # Past a whole interval of drift the answer only depends on its
+        # sign, so the table covers -size to size and clamps the rest.
+        if acc_adjustment > size:
+            acc_adjustment = size
+        elif acc_adjustment < -size:
+            acc_adjustment = -size
+        return self.table[(minutes % size) * (size + size + 1)
+                          + acc_adjustment + size]
+
+    def computed_adjustment(self, minutes: int, acc_adjustment: int) -> int:
+        down = minutes % self.minutes
+        if down == 0:
+            return 0
+        up = self.minutes - down
+        if abs(acc_adjustment + up) < abs(acc_adjustment - down):
+            return up
+        else:
+            return -down
+
+    def __eq__(self, other: 'RoundingInterval') -> bool:
+        return self.minutes == other.minutes
+
+    def __hash__(self) -> int:
+        return hash(self.minutes)
+
+
+def _decision_table(size: int) -> array:
+    # One row per remainder (minutes % size), one column per accumulated
+    # adjustment from -size to size, holding the signed adjustment.
+    table = _decision_tables.get(size)
+    if table is None:
+        interval = RoundingInterval(size)
+        table = array('i', (interval.computed_adjustment(remainder, acc)
+                            for remainder in range(size)
+                            for acc in range(-size, size + 1)))
+        _decision_tables[size] = table
+    return table
+
+
+_decision_tables: Dict[int, array] = {}
+
+SIX_MINUTES = RoundingInterval(6)
+TEN_MINUTES = RoundingInterval(10)
+FIFTEEN_MINUTES = RoundingInterval(15)
+THIRTY_MINUTES = RoundingInterval(30)
+
+
 class DurationWithAdjustment:
-    def __init__(self, duration: Duration, acc_adjustment: Duration):
+    def __init__(self, duration: Duration, acc_adjustment: Duration,
+                 interval: RoundingInterval=None):
         self.duration = duration
         self.acc_adjustment = acc_adjustment
+        self.interval = FIFTEEN_MINUTES if interval is None else interval
         self.adjustment: Duration = None
 
     def adjust(self) -> 'AdjustedDuration':
         return AdjustedDuration(
                 self.duration,
-                self.duration.distance_to_nearest_15(self.acc_adjustment),
+                self.duration.distance_to_nearest(
+                        self.acc_adjustment, self.interval),
                 self.acc_adjustment)
 
 
-class AdjustedDuration:
+class AdjustedDuration(Immutable):
+    __slots__ = ('duration', 'adjusted_duration', 'adjustment',
+                 'acc_adjustment', 'new_acc_adjustment')
+
     def __init__(self, old_duration, adjustment, acc_adjustment):
-        self.duration = old_duration
-        self.adjusted_duration = old_duration + adjustment
-        self.adjustment = adjustment
-        self.acc_adjustment = acc_adjustment
-        self.new_acc_adjustment = acc_adjustment + adjustment
+        init_attr(self, 'duration', old_duration)
+        init_attr(self, 'adjusted_duration', old_duration + adjustment)
+        init_attr(self, 'adjustment', adjustment)
+        init_attr(self, 'acc_adjustment', acc_adjustment)
+        init_attr(self, 'new_acc_adjustment', acc_adjustment + adjustment)
+
+    def __reduce__(self):
+        return AdjustedDuration, (self.duration, self.adjustment,
+                                  self.acc_adjustment)
 
     def force_round_up(self):
         return AdjustedDuration(
                 self.duration,
-                self.adjustment + Duration(minutes=0),
+                self.adjustment + Minutes(0),
                 self.acc_adjustment)
 
     def force_round_down(self):
         return AdjustedDuration(
                 self.duration,
-                self.adjustment - Duration(minutes=0),
+                self.adjustment - Minutes(0),
                 self.acc_adjustment)
 
     @property
@@ -177,10 +339,4 @@ class AdjustedDuration:
 
 def _best_adjustment(
         num_to_round: Duration, acc_adjustment: Duration) -> Duration:
-    adjustment_up, adjustment_down = num_to_round.adjustments_to_nearest_15s
-    new_adj_up = acc_adjustment + adjustment_up
-    new_adj_down = acc_adjustment + adjustment_down
-    if abs(new_adj_up) < abs(new_adj_down):
-        return adjustment_up
-    else:
-        return adjustment_down
+    return num_to_round.distance_to_nearest_15(acc_adjustment)
@@ -1,12 +1,30 @@
 # coding=utf-8
-from typing import Dict
+from typing import Dict, Sequence, Tuple
 
+from .immutable import Immutable, init_attr
 from .time import *
 
-undefined = object()
 
+class _Undefined:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'undefined'
+
+    def __reduce__(self):
+        return 'undefined'
+
+
+undefined = _Undefined()
+
+
+def _component(index: int) -> property:
+    return property(lambda self: self._components[index])
+
+
+class TLP(Immutable):
+    __slots__ = ('description', '_components', '_hash')
 
-class TLP:
     def __init__(self,
                  tlp_code: int,
                  description: str,
@@ -16,88 +34,142 @@ class TLP:
                  slg: int=undefined,
                  dlg: int=undefined,
                  prj: int=undefined):
-        self.tlp_code = tlp_code
-        self.description = description
-        self.customer = customer
-        self.product = product
-        self.code = code
-        self.slg = slg
-        self.dlg = dlg
-        self.prj = prj
+        components = (tlp_code, customer, product, code, slg, dlg, prj)
+        init_attr(self, 'description', description)
+        init_attr(self, '_components', components)
+        init_attr(self, '_hash', hash(components))
+
+    tlp_code = _component(0)
+    customer = _component(1)
+    product = _component(2)
+    code = _component(3)
+    slg = _component(4)
+    dlg = _component(5)
+    prj = _component(6)
 
     def __eq__(self, other: 'TLP') -> bool:
-        return (self._non_desc_components() == other._non_desc_components())
+        return self is other or self._components == other._components
 
     def __hash__(self):
-        return hash(self._non_desc_components())
+        return self._hash
+
+    def __reduce__(self):
+        return TLP, (self.tlp_code, self.description) + self._components[1:]
 
     def _non_desc_components(self):
-        return (self.tlp_code, self.customer, self.product, self.code, self.slg, self.dlg, self.prj)
+        return self._components
+
+    def to_row(self) -> Tuple:
+        return (self.tlp_code, self.description) + tuple(
+            None if component is undefined else component
+            for component in self._components[1:])
+
+    @staticmethod
+    def from_row(row: Sequence) -> 'TLP':
+        tlp_code, description, *components = row
+        return TLP(tlp_code, description, *(
+            undefined if component is None else component
+            for component in components))
+
+    def with_description(self, description: str) -> 'TLP':
+        return TLP(self.tlp_code, description, *self._components[1:])
 
     def __add__(self, other) -> 'TLP':
         if self != other:
             raise ValueError('Cannot add/combine two TLGs that have a different'
                              ' set of values (excluding description)')
-        return TLP(
-                self.tlp_code,
-                self.description + "; " + other.description,
-                self.customer,
-                self.product,
-                self.code,
-                self.slg,
-                self.dlg,
-                self.prj)
-
-
-class TLPLine:
+        return self.with_description(
+                self.description + "; " + other.description)
+
+
+class Descriptions:
+    # Collects the descriptions of TLPs being combined and joins them once,
+    # when the combined TLP is produced, instead of on every addition.
+    __slots__ = ('_parts',)
+
+    def __init__(self, first: str):
+        self._parts = [first]
+
+    def append(self, description: str) -> None:
+        self._parts.append(description)
+
+    def render(self) -> str:
+        return "; ".join(self._parts)
+
+    def render_onto(self, tlp: TLP) -> TLP:
+        if len(self._parts) == 1:
+            return tlp
+        return tlp.with_description(self.render())
+
+
+class TLPLine(Immutable):
+    __slots__ = ('time', 'tlp')
+
     def __init__(self, tlp: TLP, time: Time):
-        self.time = time
-        self.tlp = tlp
+        init_attr(self, 'time', time)
+        init_attr(self, 'tlp', tlp)
+
+    def __reduce__(self):
+        return TLPLine, (self.tlp, self.time)
 
     def to_next(self, next_line: 'TLPLine') -> 'TLPDuration':
         return TLPDuration(self.tlp, next_line.time.time_between(self.time))
 
 
-class TLPDuration:
+class TLPDuration(Immutable):
+    __slots__ = ('duration', 'tlp')
+
     def __init__(self, tlp: TLP, duration: Duration):
-        self.duration = duration
-        self.tlp = tlp
+        init_attr(self, 'duration', duration)
+        init_attr(self, 'tlp', tlp)
+
+    def __reduce__(self):
+        return TLPDuration, (self.tlp, self.duration)
 
     def has_same_tlp_as(self, other: 'TLPDuration') -> bool:
         return self.tlp == other.tlp
 
     def with_adjustment_from(
-            self, adjustment_lookup: Dict[TLP, int]
+            self, adjustment_lookup: Dict[TLP, int],
+            interval: RoundingInterval=None
             ) -> 'AdjustedTLPDuration':
         try:
             adjustment = adjustment_lookup[self.tlp]
-            return self.with_accum_adjustment(adjustment)
+            return self.with_accum_adjustment(adjustment, interval)
         except KeyError:
-            return self.with_no_accum_adjustment()
+            return self.with_no_accum_adjustment(interval)
 
     def with_accum_adjustment(
-            self, adjustment: int) -> 'AdjustedTLPDuration':
+            self, adjustment: int,
+            interval: RoundingInterval=None) -> 'AdjustedTLPDuration':
         return AdjustedTLPDuration(
             self.tlp,
-            self.duration.with_accumulated_adjustment(Minutes(adjustment)))
+            self.duration.with_accumulated_adjustment(
+                    Minutes(adjustment), interval))
 
-    def with_no_accum_adjustment(self) -> 'AdjustedTLPDuration':
-        return self.with_accum_adjustment(0)
+    def with_no_accum_adjustment(
+            self, interval: RoundingInterval=None) -> 'AdjustedTLPDuration':
+        return self.with_accum_adjustment(0, interval)
 
     def __add__(self, other: 'TLPDuration') -> 'TLPDuration':
         return TLPDuration(self.tlp + other.tlp, self.duration + other.duration)
 
     def __eq__(self, other) -> bool:
-        return self.tlp == other.TLP
+        return self.tlp == other.tlp
 
     def __hash__(self) -> int:
-        return hash(self.tlp)
+        return self.tlp._hash
+
 
+class AdjustedTLPDuration(Immutable):
+    __slots__ = ('tlp', 'adjusted_duration')
 
-class AdjustedTLPDuration:
     def __init__(self, tlp: TLP, adjusted_duration: AdjustedDuration):
-        self.tlp = tlp
-        self.adjusted_duration = adjusted_duration
+        init_attr(self, 'tlp', tlp)
+        init_attr(self, 'adjusted_duration', adjusted_duration)
+
+    def __reduce__(self):
+        return AdjustedTLPDuration, (self.tlp, self.adjusted_duration)
 
     def force_round_up(self):
         return AdjustedTLPDuration(
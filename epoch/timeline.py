@@ -0,0 +1,82 @@
+# coding=utf-8
+from array import array
+from operator import sub
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from epoch.time import Minutes, Time
+from epoch.time_tracking import Descriptions, TLPDuration, TLPLine
+from epoch.tlp_registry import TLPRegistry
+
+__all__ = ['DayTimeline']
+
+
+class DayTimeline:
+    # A day's time lines stored column-wise: minute offsets into the day and
+    # the handles of their TLPs in a (possibly shared) TLPRegistry.
+    def __init__(self, registry: TLPRegistry=None):
+        self.registry = TLPRegistry() if registry is None else registry
+        self.minutes = array('i')
+        self.tlp_ids = array('i')
+
+    @staticmethod
+    def from_lines(
+            tlp_lines: Iterable[TLPLine],
+            registry: TLPRegistry=None) -> 'DayTimeline':
+        timeline = DayTimeline(registry)
+        timeline.extend(tlp_lines)
+        return timeline
+
+    @staticmethod
+    def from_columns(
+            minutes: Sequence[int],
+            tlp_ids: Sequence[int],
+            registry: TLPRegistry) -> 'DayTimeline':
+        # Uses the given columns as they are, without copying them. They can
+        # be any int sequences, such as arrays or memoryviews.
+        timeline = DayTimeline(registry)
+        timeline.minutes = minutes
+        timeline.tlp_ids = tlp_ids
+        return timeline
+
+    def append(self, tlp_line: TLPLine) -> None:
+        self.minutes.append(tlp_line.time.minutes)
+        self.tlp_ids.append(self.registry.intern(tlp_line.tlp))
+
+    def extend(self, tlp_lines: Iterable[TLPLine]) -> None:
+        intern = self.registry.intern
+        for tlp_line in tlp_lines:
+            self.minutes.append(tlp_line.time.minutes)
+            self.tlp_ids.append(intern(tlp_line.tlp))
+
+    def durations(self) -> array:
+        minutes = self.minutes
+        return array('i', map(abs, map(sub, minutes[1:], minutes[:-1])))
+
+    def combined_durations(self) -> List[TLPDuration]:
+        registry = self.registry
+        groups = registry.groups
+        totals = {}
+        firsts: Dict[int, int] = {}
+        descriptions: Dict[int, Descriptions] = {}
+        for tlp_id, minutes in zip(self.tlp_ids, self.durations()):
+            group = groups[tlp_id]
+            if group in totals:
+                totals[group] += minutes
+                descriptions[group].append(registry[tlp_id].description)
+            else:
+                totals[group] = minutes
+                firsts[group] = tlp_id
+                descriptions[group] = Descriptions(registry[tlp_id].description)
+        return [TLPDuration(
+                    descriptions[group].render_onto(registry[firsts[group]]),
+                    Minutes(total))
+                for group, total in totals.items()]
+
+    def __iter__(self) -> Iterator[TLPLine]:
+        registry = self.registry
+        for minutes, tlp_id in zip(self.minutes, self.tlp_ids):
+            yield TLPLine(registry[tlp_id], Time.from_minutes(minutes))
+
+    def __len__(self) -> int:
+        return len(self.minutes)
+
@@ -0,0 +1,68 @@
+# coding=utf-8
+from array import array
+from typing import Dict, List, Mapping, Tuple
+
+from epoch.config.nicknames import Nickname, builtin_nicknames
+from epoch.time_tracking import TLP
+
+__all__ = ['TLPRegistry']
+
+
+class TLPRegistry:
+    # Hands out small integer handles for TLPs. Every distinct TLP (including
+    # its description) gets its own handle, and every handle belongs to a
+    # group of TLPs that compare equal, which is what durations are combined
+    # under.
+    def __init__(self):
+        self._tlps: List[TLP] = []
+        self._handles: Dict[Tuple, int] = {}
+        self._groups = array('i')
+        self._group_handles: Dict[TLP, int] = {}
+        self._names: Dict[str, int] = {}
+
+    @staticmethod
+    def from_nicknames(
+            nicknames: Mapping[str, Nickname]=None) -> 'TLPRegistry':
+        registry = TLPRegistry()
+        if nicknames is None:
+            nicknames = builtin_nicknames
+        for name, nickname in nicknames.items():
+            registry._names[name] = registry.intern(nickname.to_tlp())
+        return registry
+
+    def by_name(self, name: str) -> int:
+        return self._names[name]
+
+    def handle(self, tlp: TLP) -> int:
+        # the handle of the group the TLP belongs to
+        return self._groups[self.intern(tlp)]
+
+    def intern(self, tlp: TLP) -> int:
+        key = (tlp._non_desc_components(), tlp.description)
+        try:
+            return self._handles[key]
+        except KeyError:
+            return self._add(key, tlp)
+
+    def _add(self, key: Tuple, tlp: TLP) -> int:
+        handle = len(self._tlps)
+        self._tlps.append(tlp)
+        self._handles[key] = handle
+        self._groups.append(self._group_handles.setdefault(tlp, handle))
+        return handle
+
+    def group(self, handle: int) -> int:
+        return self._groups[handle]
+
+    @property
+    def groups(self) -> array:
+        return self._groups
+
+    def __getitem__(self, handle: int) -> TLP:
+        return self._tlps[handle]
+
+    def __len__(self) -> int:
+        return len(self._tlps)
+
+    def __contains__(self, tlp: TLP) -> bool:
+        return (tlp._non_desc_components(), tlp.description) in self._handles
@@ -0,0 +1,12 @@
+# coding=utf-8
+from timeit import Timer
+
+
+def per_call(func, *, number: int=10000, repeat: int=5) -> float:
+    # best of `repeat` runs, in seconds per call
+    return min(Timer(func).repeat(repeat=repeat, number=number)) / number
+
+
+def report(name: str, before: float, after: float) -> None:
+    print(f'{name:<40} before {before * 1e6:9.3f} us/call   '
+          f'after {after * 1e6:9.3f} us/call   x{before / after:6.1f}')
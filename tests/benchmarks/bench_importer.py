@@ -0,0 +1,48 @@
+# coding=utf-8
+# Rows per second importing a synthetic export, into an in memory repository
+# one add_line at a time and into the append only log with add_lines.
+#
+#     python -m tests.benchmarks.bench_importer
+import io
+import os
+import random
+import tempfile
+
+from epoch.file_repo import FileTimeLineRepository
+from epoch.importer import import_lines
+from tests.mock_repos import MockTimeLineRepo
+
+
+def is_afternoon(hour: int) -> bool:
+    return hour < 7
+
+
+def synthetic_export(days: int, lines_per_day: int, rng: random.Random,
+                     dated: bool=True) -> str:
+    date_column = 'date,' if dated else ''
+    rows = [date_column + 'time,tlp_code,description,customer,prj']
+    for day in range(1, days + 1):
+        date = f'2018-05-{day:02},' if dated else ''
+        for line in range(lines_per_day):
+            minutes = 7 * 60 + line * (10 * 60 // lines_per_day)
+            rows.append(f'{date}{minutes // 60}:{minutes % 60:02},'
+                        f'{rng.randrange(8)},task {rng.randrange(40)},'
+                        f'{rng.randrange(5)},{rng.randrange(3)}')
+    return '\n'.join(rows) + '\n'
+
+
+def main():
+    rng = random.Random(17)
+    export = synthetic_export(28, 2000, rng)
+    undated = synthetic_export(28, 2000, rng, dated=False)
+    report = import_lines(io.StringIO(undated), MockTimeLineRepo(),
+                          is_afternoon)
+    print(f'{"in memory, add_line":<30} {report}')
+    with tempfile.TemporaryDirectory() as directory:
+        with FileTimeLineRepository(os.path.join(directory, 'log')) as repo:
+            report = import_lines(io.StringIO(export), repo, is_afternoon)
+    print(f'{"log file, add_lines":<30} {report}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# coding=utf-8
+# Queries over five years of lines in the indexed store, against scanning a
+# flat list of every line the way retrieve_lines() forces today.
+#
+#     python -m tests.benchmarks.bench_indexed_repo
+import random
+from datetime import date, timedelta
+from timeit import default_timer
+
+from epoch.indexed_repo import IndexedTimeLineStore
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+from tests.benchmarks import per_call, report
+
+FIRST_DAY = date(2014, 1, 1)
+DAYS = 5 * 365
+LINES_PER_DAY = 40
+
+
+def five_years(rng: random.Random):
+    tlps = [TLP(code, f'task {code}', customer=code % 7) for code in range(60)]
+    for offset in range(DAYS):
+        day = FIRST_DAY + timedelta(days=offset)
+        minutes = sorted(rng.sample(range(6 * 60, 20 * 60), LINES_PER_DAY))
+        yield day, [TLPLine(rng.choice(tlps), Time.from_minutes(m))
+                    for m in minutes]
+
+
+def scan_window(flat, start_day, end_day, start, end):
+    return [(day, line) for day, line in flat
+            if start_day <= day <= end_day and start <= line.time.minutes <= end]
+
+
+def scan_nearest(flat, day, minutes):
+    return min((line for line_day, line in flat if line_day == day),
+               key=lambda line: abs(line.time.minutes - minutes))
+
+
+def main():
+    data = list(five_years(random.Random(24)))
+    flat = [(day, line) for day, lines in data for line in lines]
+    store = IndexedTimeLineStore()
+    start = default_timer()
+    for day, lines in data:
+        store.add_lines(day, lines)
+    seconds = default_timer() - start
+    print(f'{"insert":<40} {len(store)} lines, '
+          f'{seconds / len(store) * 1e6:.3f} us/line')
+
+    week = FIRST_DAY + timedelta(days=DAYS - 7)
+    last_day = FIRST_DAY + timedelta(days=DAYS - 1)
+    report('13:00-15:00 over the last week',
+           per_call(lambda: scan_window(flat, week, last_day, 13 * 60, 15 * 60),
+                    number=5),
+           per_call(lambda: list(store.window(week, last_day, Time(13, 0),
+                                              Time(15, 0))),
+                    number=5000))
+    report('nearest line on a day',
+           per_call(lambda: scan_nearest(flat, week, 14 * 60), number=5),
+           per_call(lambda: store.nearest(week, Time(14, 0)), number=50000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# coding=utf-8
+# Day adjustments applied the old way, each plugin re-iterating the whole day
+# after do_if pass-throughs, against the compiled pipeline that fuses the per
+# item plugins into one pass.
+#
+#     python -m tests.benchmarks.bench_pipeline
+from epoch.functions import Stream, do_if, pipe
+from epoch.pipeline import PER_ITEM, Adjustment, AdjustmentRegistry
+from epoch.rounding import (first_time_adjustment, full_day_adjustment,
+                            travel_time_adjustment)
+from epoch.time import AdjustedDuration, Minutes
+from epoch.time_tracking import AdjustedTLPDuration, TLP
+from tests.benchmarks import per_call, report
+
+
+def relabel(adjusted: AdjustedTLPDuration) -> AdjustedTLPDuration:
+    return AdjustedTLPDuration(adjusted.tlp.with_description('billed'),
+                               adjusted.adjusted_duration)
+
+
+def identity(adjusted: AdjustedTLPDuration) -> AdjustedTLPDuration:
+    return adjusted
+
+
+def per_item(func):
+    def whole_day(adjusted_tlps):
+        return [func(adjusted) for adjusted in adjusted_tlps]
+    return whole_day
+
+
+def legacy_day_adjustments(adjusted_tlps, plugins):
+    return Stream(plugins).pipe(
+        pipe(do_if(False, travel_time_adjustment), adjusted_tlps)
+        .then(do_if(False, first_time_adjustment))
+        .then(do_if(False, full_day_adjustment))
+        .value)
+
+
+def main():
+    # a registry of its own, to leave epoch.rounding.adjustments alone
+    registry = AdjustmentRegistry()
+    registry.add(Adjustment('relabel', relabel, PER_ITEM))
+    registry.add(Adjustment('identity', identity, PER_ITEM))
+    legacy_plugins = [per_item(relabel), per_item(identity), per_item(identity)]
+    stages = ['relabel', 'identity', 'identity']
+    compiled = registry.compile(stages)
+    for size in (40, 1000):
+        day = [AdjustedTLPDuration(TLP(code, 'work'),
+                                   AdjustedDuration(Minutes(code % 300),
+                                                    Minutes(2), Minutes(0)))
+               for code in range(size)]
+        number = 80000 // size
+        legacy = per_call(lambda: list(legacy_day_adjustments(day, legacy_plugins)),
+                          number=number)
+        report(f'3 per item plugins, {size} TLPs', legacy,
+               per_call(lambda: list(registry.compile(stages)(day)),
+                        number=number))
+        report(f'  reusing the compiled pipeline', legacy,
+               per_call(lambda: list(compiled(day)), number=number))
+
+
+if __name__ == '__main__':
+    main()
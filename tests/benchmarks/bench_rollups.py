@@ -0,0 +1,62 @@
+# coding=utf-8
+# Monthly per customer totals over a year of days, from the rollups against
+# rerunning the workflow over every day of the month, and the cost of
+# recording a day again once it has been re-rounded.
+#
+#     python -m tests.benchmarks.bench_rollups
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+
+from epoch.rollups import MONTH, TLPRollups
+from epoch.rounding import full_workflow
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+from tests.benchmarks import per_call, report
+
+FIRST_DAY = date(2018, 1, 1)
+DAYS = 365
+LINES_PER_DAY = 12
+
+
+def a_year(rng: random.Random):
+    tlps = [TLP(code, f'task {code}', customer=code % 7, product=code % 3,
+                prj=code) for code in range(1, 40)]
+    for offset in range(DAYS):
+        day = FIRST_DAY + timedelta(days=offset)
+        minutes = sorted(rng.sample(range(7 * 60, 18 * 60), LINES_PER_DAY))
+        yield day, [TLPLine(rng.choice(tlps), Time.from_minutes(m))
+                    for m in minutes]
+
+
+def rerun_month(data, month):
+    totals = defaultdict(int)
+    for day, lines in data:
+        if day.month == month:
+            for adjusted in full_workflow(lines, {}, False, False, False, ()):
+                totals[(adjusted.tlp.customer,)] += (
+                        adjusted.adjusted_duration.adjusted_duration.minutes)
+    return totals
+
+
+def main():
+    data = list(a_year(random.Random(25)))
+    rollups = TLPRollups()
+    for day, lines in data:
+        rollups.record_day(day, full_workflow(lines, {}, False, False, False, ()))
+    assert rerun_month(data, 6) == rollups.breakdown(MONTH, date(2018, 6, 1),
+                                                     'customer')
+
+    report('customer totals for a month',
+           per_call(lambda: rerun_month(data, 6), number=5),
+           per_call(lambda: rollups.breakdown(MONTH, date(2018, 6, 1), 'customer'),
+                    number=20000))
+    day, lines = data[160]
+    rounded = list(full_workflow(lines, {}, False, False, False, ()))
+    report('record a re-rounded day',
+           per_call(lambda: rerun_month(data, day.month), number=5),
+           per_call(lambda: rollups.record_day(day, rounded), number=20000))
+
+
+if __name__ == '__main__':
+    main()
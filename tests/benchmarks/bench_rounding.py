@@ -0,0 +1,57 @@
+# coding=utf-8
+# Per-call cost of the 15 minute rounding in epoch.time.Duration compared to
+# the Stream based search it replaced.
+#
+#     python -m tests.benchmarks.bench_rounding
+from epoch.functions import Stream
+from epoch.time import (Duration, DurationWithAdjustment, FIFTEEN_MINUTES,
+                        RoundingInterval, SIX_MINUTES, THIRTY_MINUTES)
+from tests.benchmarks import per_call, report
+
+
+def legacy_distance_up_to_nearest_15(duration: Duration) -> Duration:
+    if duration.is_fifteen_minute_interval:
+        return Duration(minutes=0)
+    return (Stream(range(1, 15))
+            .map(lambda x: Duration(minutes=x))
+            .map(duration.__add__)
+            .filter(Duration.is_fifteen_minute_interval.fget)
+            .first)
+
+
+def legacy_distance_to_nearest_15(
+        duration: Duration, acc_adjustment: Duration) -> Duration:
+    if duration.is_fifteen_minute_interval:
+        adjustment_up = adjustment_down = Duration(minutes=0)
+    else:
+        adjustment_up = legacy_distance_up_to_nearest_15(duration)
+        adjustment_down = Duration(minutes=15) - adjustment_up
+    if abs(acc_adjustment + adjustment_up) < abs(acc_adjustment + adjustment_down):
+        return adjustment_up
+    return adjustment_down
+
+
+def main():
+    duration = Duration(minutes=127)
+    acc = Duration(minutes=-4)
+    report('distance_up_to_nearest_15',
+           per_call(lambda: legacy_distance_up_to_nearest_15(duration)),
+           per_call(lambda: duration.distance_up_to_nearest_15))
+    report('distance_to_nearest_15',
+           per_call(lambda: legacy_distance_to_nearest_15(duration, acc)),
+           per_call(lambda: duration.distance_to_nearest_15(acc)))
+    for interval in (SIX_MINUTES, FIFTEEN_MINUTES, THIRTY_MINUTES):
+        report(f'best_adjustment ({interval.minutes} min, ints)',
+               per_call(lambda: legacy_distance_to_nearest_15(duration, acc)),
+               per_call(lambda: interval.best_adjustment(127, -4)))
+    tabled = RoundingInterval(15, use_table=True)
+    report('best_adjustment (15 min, table)',
+           per_call(lambda: FIFTEEN_MINUTES.best_adjustment(127, -4)),
+           per_call(lambda: tabled.best_adjustment(127, -4)))
+    report('with_accumulated_adjustment (table)',
+           per_call(lambda: duration.with_accumulated_adjustment(acc)),
+           per_call(lambda: DurationWithAdjustment(duration, acc, tabled).adjust()))
+
+
+if __name__ == '__main__':
+    main()
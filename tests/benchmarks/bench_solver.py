@@ -0,0 +1,53 @@
+# coding=utf-8
+# The joint rounding solver against the greedy per-entry rounding, on
+# synthetic days with thousands of distinct TLP totals.
+#
+#     python -m tests.benchmarks.bench_solver
+import random
+from timeit import default_timer
+
+from epoch.solver import solve_rounding
+from epoch.time import Minutes
+from epoch.time_tracking import TLP, TLPDuration
+
+
+def synthetic_day(entries: int, rng: random.Random):
+    durations = [TLPDuration(TLP(i, "work"), Minutes(rng.randrange(1, 120)))
+                 for i in range(entries)]
+    lookup = {TLP(i, ""): rng.randrange(-7, 8) for i in range(entries)}
+    return durations, lookup
+
+
+def timed(func):
+    start = default_timer()
+    result = func()
+    return default_timer() - start, result
+
+
+def summary(adjusted_tlps):
+    drift = sum(abs(adj.adjusted_duration.new_acc_adjustment.minutes)
+                for adj in adjusted_tlps)
+    total = sum(adj.adjusted_duration.adjusted_duration.minutes
+                for adj in adjusted_tlps)
+    return drift, total
+
+
+def main():
+    rng = random.Random(2018)
+    for entries in (1000, 5000, 20000):
+        durations, lookup = synthetic_day(entries, rng)
+        exact = sum(d.duration.minutes for d in durations)
+        greedy_time, greedy = timed(lambda: [d.with_adjustment_from(lookup)
+                                             for d in durations])
+        solver_time, solved = timed(lambda: solve_rounding(durations, lookup))
+        greedy_drift, greedy_total = summary(greedy)
+        solved_drift, solved_total = summary(solved)
+        print(f'{entries:>6} entries (exact total {exact}):  '
+              f'greedy {greedy_time * 1e3:7.2f} ms drift {greedy_drift:6d} '
+              f'total {greedy_total}   '
+              f'solver {solver_time * 1e3:7.2f} ms drift {solved_drift:6d} '
+              f'total {solved_total}')
+
+
+if __name__ == '__main__':
+    main()
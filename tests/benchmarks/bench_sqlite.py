@@ -0,0 +1,51 @@
+# coding=utf-8
+# Write throughput of the SQLite repositories, one row per transaction
+# compared to set_all/add_lines batches.
+#
+#     python -m tests.benchmarks.bench_sqlite
+import os
+from datetime import date
+from tempfile import TemporaryDirectory
+from timeit import default_timer
+
+from epoch.sqlite_repo import (ConnectionPool, SQLiteAdjustmentsRepository,
+                               SQLiteTimeLineRepository)
+from epoch.time import Minutes, Time
+from epoch.time_tracking import TLP, TLPDuration, TLPLine
+
+ROWS = 2000
+
+
+def rows_per_second(write, rows) -> float:
+    start = default_timer()
+    write(rows)
+    return len(rows) / (default_timer() - start)
+
+
+def report(name: str, per_row: float, batched: float) -> None:
+    print(f'{name:<40} per row {per_row:10.0f} rows/s   '
+          f'batched {batched:10.0f} rows/s   x{batched / per_row:6.1f}')
+
+
+def main():
+    durations = [TLPDuration(TLP(n, "work", customer=n % 7), Minutes(n % 15))
+                 for n in range(ROWS)]
+    lines = [TLPLine(TLP(n % 20, "work"), Time.from_minutes(n % 1440))
+             for n in range(ROWS)]
+    with TemporaryDirectory() as directory:
+        pool = ConnectionPool(os.path.join(directory, "bench.db"))
+        adjustments = SQLiteAdjustmentsRepository(pool)
+        report('adjustments',
+               rows_per_second(lambda rows: [adjustments.set(r) for r in rows],
+                               durations),
+               rows_per_second(adjustments.set_all, durations))
+        timeline = SQLiteTimeLineRepository(pool, date(2018, 5, 1))
+        report('time lines',
+               rows_per_second(lambda rows: [timeline.add_line(r) for r in rows],
+                               lines),
+               rows_per_second(timeline.add_lines, lines))
+        pool.close()
+
+
+if __name__ == '__main__':
+    main()
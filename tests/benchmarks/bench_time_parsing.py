@@ -0,0 +1,45 @@
+# coding=utf-8
+# Parsing a batch of user entered times one at a time, the step by step way,
+# against parse_many with its precompiled pattern and shared current time.
+#
+#     python -m tests.benchmarks.bench_time_parsing
+import random
+
+from epoch.cli._time_parsing import _parse_user_time, parse_many
+from epoch.time import Time
+from tests.benchmarks import per_call, report
+
+CURRENT_TIME = (13, 20)
+
+
+def is_afternoon(hour: int) -> bool:
+    return hour < 7
+
+
+def user_times(count: int, rng: random.Random):
+    formats = ['{}:{:02}', '{}.{:02}', '{}:{:02}pm', '{}:{:02} AM']
+    return [rng.choice(formats).format(rng.randrange(1, 12), rng.randrange(60))
+            for _ in range(count)]
+
+
+def step_by_step(times):
+    minutes = []
+    for user_time in times:
+        try:
+            minutes.append(Time(*_parse_user_time(
+                    user_time, is_afternoon, lambda: CURRENT_TIME)).minutes)
+        except (ValueError, AttributeError):
+            minutes.append(None)
+    return minutes
+
+
+def main():
+    times = user_times(1000, random.Random(16))
+    report('1000 times, step by step vs parse_many',
+           per_call(lambda: step_by_step(times), number=100),
+           per_call(lambda: parse_many(times, is_afternoon, CURRENT_TIME, []),
+                    number=100))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# coding=utf-8
+# Memory footprint and TLP lookup throughput of a year of timelines built
+# from the slotted value types, compared to the dict backed classes they
+# replaced.
+#
+#     python -m tests.benchmarks.bench_value_types
+import tracemalloc
+
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+from tests.benchmarks import per_call, report
+
+DAYS = 365
+LINES_PER_DAY = 40
+
+
+class LegacyTime:
+    def __init__(self, hour, minute):
+        self.minutes = minute + (hour * 60)
+
+
+class LegacyTLP:
+    def __init__(self, tlp_code, description, customer=None, product=None,
+                 code=None, slg=None, dlg=None, prj=None):
+        self.tlp_code = tlp_code
+        self.description = description
+        self.customer = customer
+        self.product = product
+        self.code = code
+        self.slg = slg
+        self.dlg = dlg
+        self.prj = prj
+
+    def __eq__(self, other):
+        return self._non_desc_components() == other._non_desc_components()
+
+    def __hash__(self):
+        return hash(self._non_desc_components())
+
+    def _non_desc_components(self):
+        return (self.tlp_code, self.customer, self.product, self.code,
+                self.slg, self.dlg, self.prj)
+
+
+class LegacyTLPLine:
+    def __init__(self, tlp, time):
+        self.time = time
+        self.tlp = tlp
+
+
+def year_of_timelines(line_type, tlp_type, time_type):
+    return [[line_type(tlp_type(line % 12, "work", line % 5, 1, 2, 3, 4, 5),
+                       time_type(6 + line // 4, (line * 15) % 60))
+             for line in range(LINES_PER_DAY)]
+            for _ in range(DAYS)]
+
+
+def footprint(line_type, tlp_type, time_type):
+    tracemalloc.start()
+    year = year_of_timelines(line_type, tlp_type, time_type)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del year
+    return size
+
+
+def combine(day):
+    totals = {}
+    for line in day:
+        totals[line.tlp] = totals.get(line.tlp, 0) + 1
+    return totals
+
+
+def main():
+    before = footprint(LegacyTLPLine, LegacyTLP, LegacyTime)
+    after = footprint(TLPLine, TLP, Time)
+    print(f'{"year of timelines":<40} before {before / 2**20:9.2f} MiB        '
+          f'after {after / 2**20:9.2f} MiB        x{before / after:6.1f}')
+
+    legacy_day = year_of_timelines(LegacyTLPLine, LegacyTLP, LegacyTime)[0]
+    day = year_of_timelines(TLPLine, TLP, Time)[0]
+    report('combine one day by TLP',
+           per_call(lambda: combine(legacy_day), number=2000),
+           per_call(lambda: combine(day), number=2000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+# coding=utf-8
+# The hot paths, timed the same way on every run so that results from
+# different commits can be compared.
+#
+#     python -m tests.benchmarks.suite --json results.json
+#     python -m tests.benchmarks.suite --compare baseline.json
+#
+# --compare exits with status 1 when any benchmark got slower than the
+# baseline by more than --threshold (10% by default).
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+from typing import Callable, Dict, List, Tuple
+
+from epoch.cli._time_parsing import parse_user_time
+from epoch.repo import CachedAdjustmentsRepository
+from epoch.rounding import (add_adjustments, combine_tlp_durations,
+                            full_workflow, times_to_durations)
+from epoch.time import Minutes, Time
+from epoch.time_tracking import TLP, TLPDuration, TLPLine
+from tests.benchmarks import per_call
+from tests.mock_repos import MockAdjustmentsRepo
+
+DAY_SIZES = (10, 100, 1000, 10000, 100000)
+
+# name -> (function to time, calls per run)
+_benchmarks: Dict[str, Tuple[Callable[[], object], int]] = {}
+
+
+def benchmark(name: str, func: Callable[[], object], number: int) -> None:
+    _benchmarks[name] = (func, number)
+
+
+def synthetic_day(lines: int, rng: random.Random) -> List[TLPLine]:
+    # Times never go backwards; past one line a minute some lines share a
+    # minute and give zero length durations.
+    return [TLPLine(TLP(rng.randrange(12), f'task {rng.randrange(30)}',
+                        customer=rng.randrange(4)),
+                    Time.from_minutes(line * 1440 // lines))
+            for line in range(lines)]
+
+
+def adjustment_lookup(rng: random.Random) -> Dict[TLP, int]:
+    return {TLP(code, '', customer=customer): rng.randrange(-7, 8)
+            for code in range(12) for customer in range(4)}
+
+
+def calls_for(lines: int) -> int:
+    return max(1, 20000 // lines)
+
+
+def register_time_arithmetic() -> None:
+    time, duration = Time(9, 30), Minutes(95)
+    benchmark('time + duration', lambda: time + duration, 100000)
+    benchmark('time - time', lambda: Time(17, 5) - time, 100000)
+    benchmark('duration + duration', lambda: duration + duration, 100000)
+    benchmark('duration with accumulated adjustment',
+              lambda: duration.with_accumulated_adjustment(Minutes(-4)),
+              100000)
+
+
+def register_workflow(rng: random.Random) -> None:
+    lookup = adjustment_lookup(rng)
+    for lines in DAY_SIZES:
+        day = synthetic_day(lines, rng)
+        durations = list(times_to_durations(day))
+        totals = list(combine_tlp_durations(durations))
+        number = calls_for(lines)
+        benchmark(f'times_to_durations[{lines}]',
+                  lambda day=day: list(times_to_durations(day)), number)
+        benchmark(f'combine_tlp_durations[{lines}]',
+                  lambda durations=durations: list(
+                          combine_tlp_durations(durations)),
+                  number)
+        benchmark(f'add_adjustments[{lines}]',
+                  lambda totals=totals: list(add_adjustments(lookup, totals)),
+                  number)
+        benchmark(f'full_workflow[{lines}]',
+                  lambda day=day: list(full_workflow(
+                          day, lookup, False, False, False, ())),
+                  number)
+
+
+def register_parsing() -> None:
+    def is_afternoon(hour):
+        return hour < 7
+
+    for text in ('14:34', '4;15', '9:05 pm', '+15'):
+        benchmark(f'parse_user_time[{text}]',
+                  lambda text=text: parse_user_time(text, is_afternoon),
+                  20000)
+
+
+def register_cached_repository(rng: random.Random) -> None:
+    tlps = [TLP(code, '', customer=customer)
+            for code in range(12) for customer in range(4)]
+    wrapped = MockAdjustmentsRepo()
+    wrapped.set_all(TLPDuration(tlp, Minutes(rng.randrange(-7, 8)))
+                    for tlp in tlps)
+    cached = CachedAdjustmentsRepository(wrapped, max_size=32)
+
+    def retrieve_all_tlps():
+        for tlp in tlps:
+            cached.retrieve(tlp)
+
+    def set_all_tlps():
+        for tlp in tlps:
+            cached.set(TLPDuration(tlp, Minutes(3)))
+
+    benchmark('CachedAdjustmentsRepository.retrieve[48]', retrieve_all_tlps,
+              1000)
+    benchmark('CachedAdjustmentsRepository.set[48]', set_all_tlps, 1000)
+
+
+def register_all() -> None:
+    rng = random.Random(19)
+    register_time_arithmetic()
+    register_workflow(rng)
+    register_parsing()
+    register_cached_repository(rng)
+
+
+def run(selected: str=None, repeat: int=5) -> Dict[str, Dict]:
+    results = {}
+    for name, (func, number) in _benchmarks.items():
+        if selected is None or selected in name:
+            seconds = per_call(func, number=number, repeat=repeat)
+            results[name] = {'seconds_per_call': seconds, 'number': number,
+                             'repeat': repeat}
+            print(f'{name:<48} {seconds * 1e6:12.3f} us/call')
+    return results
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'],
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              universal_newlines=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def compare(results: Dict[str, Dict], baseline_path: str,
+            threshold: float) -> bool:
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)['results']
+    regressed = False
+    print(f'\ncompared to {baseline_path}:')
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = (result['seconds_per_call']
+                 / baseline[name]['seconds_per_call'])
+        slower = ratio > 1 + threshold
+        regressed = regressed or slower
+        print(f'{name:<48} x{ratio:6.2f}{"  SLOWER" if slower else ""}')
+    return not regressed
+
+
+def main(args: List[str]=None) -> int:
+    parser = argparse.ArgumentParser(
+            prog='python -m tests.benchmarks.suite',
+            description='Times the rounding and parsing hot paths.')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='a results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10)
+    parser.add_argument('--only', help='run the benchmarks whose name has this')
+    parser.add_argument('--repeat', type=int, default=5)
+    options = parser.parse_args(args)
+
+    register_all()
+    results = run(options.only, options.repeat)
+    if options.json:
+        with open(options.json, 'w') as out:
+            json.dump({'commit': commit(),
+                       'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'results': results},
+                      out, indent=2, sort_keys=True)
+    if options.compare and not compare(results, options.compare,
+                                       options.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 # coding=utf-8
+import asyncio
 
 from epoch.repo import *
 
@@ -34,10 +35,78 @@ class MockTimeLineRepo(TimeLineRepository):
         self.storage[tlp_line.time] = tlp_line
 
     def retrieve_lines(self) -> Iterable[TLPLine]:
-        return sorted(self.storage.values())
+        return sorted(self.storage.values(), key=lambda line: line.time)
 
     def remove_line_by_time(self, time: Time) -> None:
         del self.storage[time]
 
     def update_line_tlp(self, tlp_line: TLPLine) -> None:
-        self.storage[tlp_line.time] = tlp_line
\ No newline at end of file
+        self.storage[tlp_line.time] = tlp_line
+
+
+class LatencyMonitor:
+    # Simulated round trips to a remote store, counting how many overlap.
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def round_trip(self):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+
+class MockAsyncAdjustmentsRepo(AsyncAdjustmentsRepository):
+    def __init__(self, monitor: LatencyMonitor):
+        self.monitor = monitor
+        self.wrapped = MockAdjustmentsRepo()
+
+    async def retrieve_all(self):
+        await self.monitor.round_trip()
+        for tlp_dur in list(self.wrapped.retrieve_all()):
+            yield tlp_dur
+
+    async def retrieve(self, tlp: TLP) -> TLPDuration:
+        await self.monitor.round_trip()
+        return self.wrapped.retrieve(tlp)
+
+    async def remove(self, tlp: Union[TLP, TLPDuration]) -> None:
+        await self.monitor.round_trip()
+        self.wrapped.remove(tlp)
+
+    async def set(self, tlp_dur: TLPDuration) -> None:
+        await self.monitor.round_trip()
+        self.wrapped.set(tlp_dur)
+
+    async def set_all(self, durs: Iterable[TLPDuration]) -> None:
+        await self.monitor.round_trip()
+        self.wrapped.set_all(durs)
+
+
+class MockAsyncTimeLineRepo(AsyncTimeLineRepository):
+    def __init__(self, monitor: LatencyMonitor):
+        self.monitor = monitor
+        self.wrapped = MockTimeLineRepo()
+
+    async def add_line(self, tlp_line: TLPLine) -> None:
+        await self.monitor.round_trip()
+        self.wrapped.add_line(tlp_line)
+
+    async def retrieve_lines(self):
+        await self.monitor.round_trip()
+        for tlp_line in self.wrapped.retrieve_lines():
+            yield tlp_line
+
+    async def remove_line_by_time(self, time: Time) -> None:
+        await self.monitor.round_trip()
+        self.wrapped.remove_line_by_time(time)
+
+    async def update_line_tlp(self, tlp_line: TLPLine) -> None:
+        await self.monitor.round_trip()
+        self.wrapped.update_line_tlp(tlp_line)
@@ -0,0 +1,116 @@
+import asyncio
+from datetime import date
+
+from hamcrest import *
+
+from epoch.async_workflow import AsyncDaySource, async_workflow
+from epoch.rounding import full_workflow
+from epoch.time import Minutes, Time
+from epoch.time_tracking import TLP, TLPDuration, TLPLine
+from tests.mock_repos import (LatencyMonitor, MockAsyncAdjustmentsRepo,
+                              MockAsyncTimeLineRepo)
+
+
+def day(offset):
+    return [TLPLine(TLP(1, "build"), Time(8, offset)),
+            TLPLine(TLP(2, "review"), Time(9, 3 + offset)),
+            TLPLine(TLP(0, "day"), Time(16, 44 - offset))]
+
+
+def summary(adjusted):
+    return (adjusted.tlp.tlp_code,
+            adjusted.adjusted_duration.adjusted_duration.minutes,
+            adjusted.adjusted_duration.new_acc_adjustment.minutes)
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def sources(monitor, users):
+    result = []
+    for user in range(users):
+        timeline = MockAsyncTimeLineRepo(monitor)
+        timeline.wrapped.storage = {line.time: line for line in day(user)}
+        adjustments = MockAsyncAdjustmentsRepo(monitor)
+        adjustments.wrapped.set(TLPDuration(TLP(1, ""), Minutes(user % 7)))
+        result.append(AsyncDaySource(user, date(2018, 5, 1), timeline,
+                                     adjustments))
+    return result
+
+
+async def collect(results):
+    return [result async for result in results]
+
+
+def test_matches_full_workflow_per_day():
+    days = sources(LatencyMonitor(0.001), 12)
+
+    results = run(collect(async_workflow(days, max_concurrency=4)))
+
+    by_user = {}
+    for result in results:
+        by_user.setdefault(result.user, []).append(summary(result.adjusted))
+    expected = {source.user: [summary(adjusted) for adjusted in full_workflow(
+                    day(source.user), {TLP(1, ""): source.user % 7},
+                    False, False, False, ())]
+                for source in days}
+    assert_that(by_user, equal_to(expected))
+
+
+def test_fetches_concurrently_up_to_the_limit():
+    monitor = LatencyMonitor(0.01)
+
+    run(collect(async_workflow(sources(monitor, 20), max_concurrency=5)))
+
+    # two round trips (lines and adjustments) per day
+    assert_that(monitor.calls, equal_to(40))
+    assert_that(monitor.peak, equal_to(5))
+
+
+def test_fetches_a_days_lines_and_adjustments_together():
+    monitor = LatencyMonitor(0.01)
+
+    run(collect(async_workflow(sources(monitor, 1))))
+
+    assert_that(monitor.peak, equal_to(2))
+
+
+def test_takes_sources_lazily():
+    monitor = LatencyMonitor(0.001)
+    finished = set()
+    held = []
+
+    def lazy_sources():
+        for source in sources(monitor, 30):
+            held.append(source.user - len(finished))
+            yield source
+
+    async def consume():
+        async for result in async_workflow(lazy_sources(), max_concurrency=4):
+            finished.add(result.user)
+
+    run(consume())
+
+    assert_that(finished, has_length(30))
+    assert_that(max(held), less_than(4))
+
+
+def test_shares_a_semaphore_between_drivers():
+    monitor = LatencyMonitor(0.01)
+
+    async def both():
+        semaphore = asyncio.BoundedSemaphore(3)
+        return await asyncio.gather(
+                collect(async_workflow(sources(monitor, 6), semaphore=semaphore)),
+                collect(async_workflow(sources(monitor, 6), semaphore=semaphore)))
+
+    first, second = run(both())
+
+    assert_that(monitor.peak, equal_to(3))
+    assert_that(first, has_length(12))
+    assert_that(second, has_length(12))
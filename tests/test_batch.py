@@ -0,0 +1,72 @@
+from datetime import date
+from itertools import islice
+
+from hamcrest import *
+
+from epoch import batch
+from epoch.batch import DayRecord, batch_workflow
+from epoch.rounding import full_workflow
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+from epoch.tlp_registry import TLPRegistry
+
+
+def day(offset):
+    return [TLPLine(TLP(1, "build"), Time(8, offset)),
+            TLPLine(TLP(2, "review"), Time(9, 3 + offset)),
+            TLPLine(TLP(1, "build"), Time(11, 20)),
+            TLPLine(TLP(0, "day"), Time(16, 44 - offset))]
+
+
+def summary(adjusted):
+    return (adjusted.tlp.tlp_code,
+            adjusted.tlp.description,
+            adjusted.adjusted_duration.adjusted_duration.minutes,
+            adjusted.adjusted_duration.new_acc_adjustment.minutes)
+
+
+def test_batch_matches_full_workflow_per_day():
+    adjustments = {TLP(1, ""): -5}
+    records = [DayRecord(user, date(2018, 5, d), day(d), adjustments)
+               for user in ("ann", "bob") for d in range(1, 8)]
+
+    result = [(r.user, r.date, summary(r.adjusted))
+              for r in batch_workflow(records)]
+    expected = [(rec.user, rec.date, summary(adjusted))
+                for rec in records
+                for adjusted in full_workflow(rec.lines, adjustments,
+                                              False, False, False, ())]
+
+    assert_that(result, equal_to(expected))
+
+
+def test_batch_streams_records_lazily():
+    consumed = []
+
+    def records():
+        for d in range(1, 1000):
+            consumed.append(d)
+            yield DayRecord("ann", date(2018, 1, 1), day(d % 30), {})
+
+    first = list(islice(batch_workflow(records()), 2))
+
+    assert_that(first, has_length(2))
+    assert_that(consumed, equal_to([1]))
+
+
+def test_registry_size_stays_bounded_across_days(monkeypatch):
+    registries = []
+
+    class RecordingRegistry(TLPRegistry):
+        def __init__(self):
+            super().__init__()
+            registries.append(self)
+
+    monkeypatch.setattr(batch, "TLPRegistry", RecordingRegistry)
+    records = (DayRecord("ann", date(2018, 5, 1), [
+                   TLPLine(TLP(1, f"note {d}"), Time(8, 0)),
+                   TLPLine(TLP(0, "day"), Time(9, 0))], {})
+               for d in range(500))
+
+    assert_that(sum(1 for _ in batch_workflow(records)), equal_to(500))
+    assert_that(max(len(registry) for registry in registries), equal_to(2))
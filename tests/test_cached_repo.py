@@ -0,0 +1,100 @@
+import pytest
+from hamcrest import *
+
+from epoch.repo import CachedAdjustmentsRepository
+from epoch.time import Minutes
+from epoch.time_tracking import TLP, TLPDuration
+from tests.mock_repos import MockAdjustmentsRepo
+
+
+class CountingRepo(MockAdjustmentsRepo):
+    def __init__(self):
+        super().__init__()
+        self.retrieves = 0
+        self.batches = []
+
+    def retrieve(self, tlp):
+        self.retrieves += 1
+        return super().retrieve(tlp)
+
+    def set_all(self, durs):
+        self.batches.append(list(durs))
+        super().set_all(self.batches[-1])
+
+
+def adjustment(code, minutes):
+    return TLPDuration(TLP(code, "desc"), Minutes(minutes))
+
+
+def test_misses_are_loaded_lazily_then_cached():
+    wrapped = CountingRepo()
+    wrapped.set(adjustment(1, 5))
+    cached = CachedAdjustmentsRepository(wrapped)
+
+    cached.retrieve(TLP(1, ""))
+    cached.retrieve(TLP(1, ""))
+
+    assert_that(wrapped.retrieves, equal_to(1))
+
+
+def test_least_recently_used_entries_are_evicted():
+    wrapped = CountingRepo()
+    for code in range(3):
+        wrapped.set(adjustment(code, code))
+    cached = CachedAdjustmentsRepository(wrapped, max_size=2)
+
+    cached.retrieve(TLP(0, ""))
+    cached.retrieve(TLP(1, ""))
+    cached.retrieve(TLP(0, ""))
+    cached.retrieve(TLP(2, ""))
+
+    assert_that(list(cached.cache), equal_to([TLP(0, ""), TLP(2, "")]))
+
+
+def test_writes_are_coalesced_and_flushed_in_batches():
+    wrapped = CountingRepo()
+    cached = CachedAdjustmentsRepository(wrapped, flush_size=3)
+
+    cached.set_all(adjustment(code % 2, code) for code in range(4))
+
+    assert_that(wrapped.batches, empty())
+    assert_that(cached.retrieve(TLP(1, "")).duration, equal_to(Minutes(3)))
+
+    cached.set(adjustment(2, 9))
+
+    assert_that([[dur.duration.minutes for dur in batch]
+                 for batch in wrapped.batches],
+                equal_to([[2, 3, 9]]))
+
+
+@pytest.mark.parametrize("options", [{"flush_size": 0}, {"flush_size": -1},
+                                     {"max_size": 0}])
+def test_sizes_must_be_positive(options):
+    with pytest.raises(ValueError):
+        CachedAdjustmentsRepository(CountingRepo(), **options)
+
+
+def test_pending_writes_survive_eviction():
+    wrapped = CountingRepo()
+    cached = CachedAdjustmentsRepository(wrapped, max_size=1)
+    cached.set(adjustment(1, 1))
+    cached.set(adjustment(2, 2))
+
+    assert_that(cached.retrieve(TLP(1, "")).duration, equal_to(Minutes(1)))
+    assert_that(wrapped.retrieves, equal_to(0))
+
+
+def test_removing_unflushed_and_flushed_entries():
+    wrapped = CountingRepo()
+    wrapped.set(adjustment(1, 1))
+    with CachedAdjustmentsRepository(wrapped) as cached:
+        cached.set(adjustment(2, 2))
+        cached.remove(TLP(2, ""))
+        cached.remove(TLP(1, ""))
+
+        with pytest.raises(KeyError):
+            cached.retrieve(TLP(1, ""))
+        with pytest.raises(KeyError):
+            cached.remove(TLP(3, ""))
+
+    assert_that(list(wrapped.retrieve_all()), empty())
@@ -0,0 +1,121 @@
+import random
+
+import pytest
+from hamcrest import *
+
+from epoch.day_adjustments import *
+from epoch.rounding import full_workflow
+from epoch.time import Minutes, Time
+from epoch.time_tracking import TLP, TLPDuration, TLPLine
+from tests.mock_repos import MockAdjustmentsRepo
+
+TRAVEL = TLP(-3, "travel")
+LUNCH = TLP(-2, "lunch")
+
+
+def rounded(tlp, minutes, acc=0):
+    return TLPDuration(tlp, Minutes(minutes)).with_accum_adjustment(acc)
+
+
+def summary(adjusted_tlps):
+    return [(a.tlp.tlp_code,
+             a.adjusted_duration.duration.minutes,
+             a.adjusted_duration.adjusted_duration.minutes,
+             a.adjusted_duration.new_acc_adjustment.minutes)
+            for a in adjusted_tlps]
+
+
+@pytest.fixture
+def repository():
+    return MockAdjustmentsRepo()
+
+
+def test_travel_is_charged_to_the_largest_billable_entry():
+    day = [rounded(TLP(1, "a"), 50, acc=-4), rounded(TRAVEL, 37),
+           rounded(TLP(2, "b"), 130, acc=3), rounded(TLP(0, "day"), 200)]
+
+    result = TravelTimeAdjustment()(day)
+
+    assert_that(summary(result), equal_to([(1, 50, 60, 6),
+                                           (2, 167, 165, 1),
+                                           (0, 200, 195, -5)]))
+
+
+def test_travel_stays_without_a_billable_entry():
+    day = [rounded(TRAVEL, 37), rounded(TLP(0, "day"), 200)]
+
+    assert_that(summary(TravelTimeAdjustment()(day)), equal_to(summary(day)))
+
+
+def test_first_time_entries_pick_up_carried_over_adjustments(repository):
+    repository.set(TLPDuration(TLP(1, ""), Minutes(-6)))
+    repository.set(TLPDuration(TLP(2, ""), Minutes(7)))
+    day = [rounded(TLP(1, "a"), 52), rounded(TLP(2, "b"), 52, acc=2),
+           rounded(TLP(3, "c"), 52)]
+
+    result = FirstTimeAdjustment(repository, {TLP(2, ""): 2})(day)
+
+    assert_that(summary(result), equal_to([(1, 52, 60, 2),
+                                           (2, 52, 45, -5),
+                                           (3, 52, 45, -7)]))
+
+
+def test_a_known_drift_of_zero_is_kept(repository):
+    repository.set(TLPDuration(TLP(1, ""), Minutes(-6)))
+    day = [rounded(TLP(1, "a"), 52)]
+
+    result = FirstTimeAdjustment(repository, {TLP(1, ""): 0})(day)
+
+    assert_that(summary(result), equal_to(summary(day)))
+
+
+def test_full_workflow_uses_the_repository_given(repository):
+    repository.set(TLPDuration(TLP(1, ""), Minutes(-6)))
+    lines = [TLPLine(TLP(1, "a"), Time(8, 0)), TLPLine(TLP(0, "day"), Time(8, 52))]
+
+    assert_that(summary(full_workflow(lines, {}, False, True, False, ())),
+                equal_to([(1, 52, 45, -7)]))
+    assert_that(summary(full_workflow(lines, {}, False, True, False, (),
+                                      adjustments_repository=repository)),
+                equal_to([(1, 52, 60, 2)]))
+    assert_that(summary(full_workflow(lines, {TLP(1, ""): 0}, False, True,
+                                      False, (),
+                                      adjustments_repository=repository)),
+                equal_to([(1, 52, 45, -7)]))
+
+
+def test_a_day_an_interval_short_becomes_a_full_day():
+    day = [rounded(TLP(1, "a"), 200, acc=-3), rounded(LUNCH, 30),
+           rounded(TLP(2, "b"), 262, acc=6)]
+
+    result = FullDayAdjustment()(day)
+
+    # 210 + 255 = 465 worked; another interval takes a's drift from 7 to
+    # 22 but b's only from -1 to 14
+    assert_that(summary(result), equal_to([(1, 200, 210, 7),
+                                           (-2, 30, 30, 0),
+                                           (2, 262, 270, 14)]))
+
+
+def test_a_day_further_off_is_left_alone():
+    day = [rounded(TLP(1, "a"), 440)]
+
+    assert_that(summary(FullDayAdjustment()(day)), equal_to(summary(day)))
+    with pytest.raises(ValueError):
+        FullDayAdjustment(day_minutes=481)
+
+
+def test_large_synthetic_day():
+    rng = random.Random(22)
+    tlps = [TLP(code, "work") for code in range(1, 5000)] + [TRAVEL, LUNCH]
+    lines = [TLPLine(rng.choice(tlps), Time.from_minutes(minute * 1440 // 60000))
+             for minute in range(60000)]
+    lookup = {tlp: rng.randrange(-7, 8) for tlp in tlps}
+
+    plain = list(full_workflow(lines, lookup, False, False, False, ()))
+    adjusted = list(full_workflow(lines, lookup, True, False, True, ()))
+
+    assert_that(adjusted, has_length(len(plain) - 1))
+    assert_that([a.tlp for a in adjusted], not_(has_item(TRAVEL)))
+    assert_that(sum(a.adjusted_duration.duration.minutes for a in adjusted),
+                equal_to(sum(a.adjusted_duration.duration.minutes for a in plain)))
@@ -0,0 +1,96 @@
+from datetime import date
+
+import pytest
+from hamcrest import *
+
+from epoch.file_repo import FileTimeLineRepository, rounded_days
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+
+
+def describe(lines):
+    return [(str(line.time), line.tlp.to_row()) for line in lines]
+
+
+@pytest.fixture
+def log(tmp_path):
+    return str(tmp_path / "timeline.log")
+
+
+def test_lines_round_trip(log):
+    tlp = TLP(4, "tricky\tdescription\\with\nstuff", customer=2, prj=9)
+    with FileTimeLineRepository(log, date(2018, 5, 1)) as repo:
+        repo.add_line(TLPLine(TLP(0, "day"), Time(17, 0)))
+        repo.add_line(TLPLine(tlp, Time(8, 0)))
+
+        assert_that(describe(repo.retrieve_lines()),
+                    equal_to([("08:00", tlp.to_row()),
+                              ("17:00", (0, "day") + (None,) * 6)]))
+
+
+def test_updates_and_removals_are_replayed(log):
+    with FileTimeLineRepository(log, date(2018, 5, 1)) as repo:
+        repo.add_lines([TLPLine(TLP(1, "a"), Time(8, 0)),
+                        TLPLine(TLP(2, "b"), Time(9, 0)),
+                        TLPLine(TLP(3, "c"), Time(10, 0))])
+        repo.update_line_tlp(TLPLine(TLP(5, "e"), Time(8, 0)))
+        repo.remove_line_by_time(Time(9, 0))
+
+        assert_that([line.tlp.tlp_code for line in repo.retrieve_lines()],
+                    equal_to([5, 3]))
+
+
+def test_days_are_streamed_separately(log):
+    for day in range(1, 4):
+        with FileTimeLineRepository(log, date(2018, 5, day)) as repo:
+            repo.add_line(TLPLine(TLP(1, "work"), Time(8, day)))
+            repo.add_line(TLPLine(TLP(0, "day"), Time(9, 0)))
+
+    days = [(day, [adj.adjusted_duration.duration.minutes for adj in adjusted])
+            for day, adjusted in rounded_days(FileTimeLineRepository(log), {})]
+
+    assert_that(days, equal_to([(date(2018, 5, 1), [59]),
+                                (date(2018, 5, 2), [58]),
+                                (date(2018, 5, 3), [57])]))
+
+
+def test_days_are_grouped_on_read(log):
+    with FileTimeLineRepository(log) as repo:
+        for day, minute in ((3, 0), (1, 1), (3, 2), (2, 3), (1, 4)):
+            repo.for_day(date(2018, 5, day)).add_line(
+                    TLPLine(TLP(1, "work"), Time(8, minute)))
+        # an edit to an earlier day, after later days were written
+        repo.for_day(date(2018, 5, 1)).remove_line_by_time(Time(8, 1))
+
+        days = [(day, [str(line.time) for line in lines])
+                for day, lines in repo.retrieve_days()]
+        assert_that(days, equal_to([(date(2018, 5, 1), ["08:04"]),
+                                    (date(2018, 5, 2), ["08:03"]),
+                                    (date(2018, 5, 3), ["08:00", "08:02"])]))
+        assert_that(describe(repo.for_day(date(2018, 5, 3)).retrieve_lines()),
+                    has_length(2))
+
+
+def test_index_picks_up_appends(log):
+    with FileTimeLineRepository(log, date(2018, 5, 1)) as repo:
+        repo.add_line(TLPLine(TLP(1, "work"), Time(8, 0)))
+        assert_that(repo.retrieve_lines(), has_length(1))
+        with FileTimeLineRepository(log, date(2018, 5, 1)) as other:
+            other.add_line(TLPLine(TLP(2, "more"), Time(9, 0)))
+        assert_that(repo.retrieve_lines(), has_length(2))
+
+
+@pytest.mark.parametrize("record", ["2018-05-01\t+\t08:00\t1\t\t\t\t\t\t\tbad\\\n",
+                                    "2018-05-01\t+\t08:00\t1\t\t\t\t\t\t\tbad\\q\n",
+                                    "2018-05-01\t?\t08:00\n",
+                                    "2018-05-01\t+\t8 o'clock\n"])
+def test_malformed_records_raise_value_error(log, record):
+    with open(log, "w", encoding="utf-8") as out:
+        out.write(record)
+
+    with pytest.raises(ValueError, match="malformed record"):
+        list(FileTimeLineRepository(log).retrieve_days())
+
+
+def test_missing_log_is_empty(log):
+    assert_that(list(FileTimeLineRepository(log).retrieve_days()), empty())
@@ -0,0 +1,19 @@
+from itertools import count, islice
+
+from hamcrest import *
+
+from epoch.functions import Stream
+
+
+def test_pairwise():
+    assert_that(list(Stream([1, 2, 3]).pairwise()),
+                equal_to([(1, 2), (2, 3)]))
+    assert_that(list(Stream([1]).pairwise()), empty())
+    assert_that(list(Stream([]).pairwise()), empty())
+
+
+def test_pairwise_is_lazy():
+    squares = Stream(count()).map(lambda x: x * x).pairwise()
+
+    assert_that(list(islice(squares, 3)),
+                equal_to([(0, 1), (1, 4), (4, 9)]))
@@ -0,0 +1,114 @@
+import io
+from datetime import date
+
+import pytest
+from hamcrest import *
+
+from epoch.file_repo import FileTimeLineRepository
+from epoch.importer import import_file, import_lines
+from epoch.time import Time
+from epoch.time_tracking import TLP
+from tests.mock_repos import MockTimeLineRepo
+
+
+def is_afternoon(hour):
+    return hour < 7
+
+
+def describe(lines):
+    return [(str(line.time), line.tlp.to_row()) for line in lines]
+
+
+def test_imports_a_single_day_into_any_repository():
+    export = io.StringIO("time,tlp_code,description,customer,prj\n"
+                         "8:00,1,email,2,\n"
+                         "9:30,2,build,,7\n"
+                         "4:45,0,home,,\n")
+    repo = MockTimeLineRepo()
+
+    report = import_lines(export, repo, is_afternoon, chunk_size=2)
+
+    assert_that(describe(repo.retrieve_lines()),
+                equal_to([("08:00", (1, "email", 2) + (None,) * 5),
+                          ("09:30", (2, "build") + (None,) * 5 + (7,)),
+                          ("16:45", (0, "home") + (None,) * 6)]))
+    assert_that(report.rows, equal_to(3))
+    assert_that(report.imported, equal_to(3))
+    assert_that(report.rejected, empty())
+
+
+def test_rejects_malformed_rows_and_carries_on():
+    export = io.StringIO("time,tlp_code,description\n"
+                         "8:00,1,fine\n"
+                         "8:15,x,bad code\n"
+                         "8:75,2,bad minute\n"
+                         "8:30,3\n"
+                         "9:00,4,also fine\n")
+    repo = MockTimeLineRepo()
+
+    report = import_lines(export, repo, is_afternoon)
+
+    assert_that([line.tlp.tlp_code for line in repo.retrieve_lines()],
+                equal_to([1, 4]))
+    assert_that([line for line, _ in report.rejected], equal_to([3, 4, 5]))
+    assert_that(report.rejected[1][1], contains_string('Invalid minute amount'))
+    assert_that(report.imported, equal_to(2))
+
+
+def test_rejects_rows_the_csv_reader_cannot_read():
+    export = io.StringIO("time,tlp_code,description\n"
+                         "8:00,1,fine\n"
+                         "8:15,2," + "x" * 200000 + "\n"
+                         "9:00,4,also fine\n")
+    repo = MockTimeLineRepo()
+
+    report = import_lines(export, repo, is_afternoon)
+
+    assert_that([line.tlp.tlp_code for line in repo.retrieve_lines()],
+                equal_to([1, 4]))
+    assert_that([line for line, _ in report.rejected], equal_to([3]))
+    assert_that(report.rejected[0][1], contains_string('field larger'))
+    assert_that(report.rows, equal_to(3))
+
+
+def test_spreads_dated_rows_over_days(tmp_path):
+    export = tmp_path / "export.tsv"
+    export.write_text("date\ttime\ttlp_code\tdescription\n"
+                      "2018-05-01\t8:00\t1\ta\n"
+                      "2018-05-02\t8:30\t2\tb\n"
+                      "2018-05-01\t12:00\t0\tlunch\n"
+                      "2018-13-01\t9:00\t3\tbad date\n")
+    with FileTimeLineRepository(str(tmp_path / "timeline.log")) as repo:
+        report = import_file(str(export), repo, is_afternoon)
+
+        first = repo.for_day(date(2018, 5, 1)).retrieve_lines()
+        second = repo.for_day(date(2018, 5, 2)).retrieve_lines()
+    assert_that([line.time for line in first],
+                equal_to([Time(8, 0), Time(12, 0)]))
+    assert_that([line.tlp for line in second], equal_to([TLP(2, "b")]))
+    assert_that([line for line, _ in report.rejected], equal_to([5]))
+
+
+@pytest.mark.filterwarnings("error")
+def test_interleaved_days_across_chunks_read_back(tmp_path):
+    rows = "".join(f"2018-05-0{1 + row % 3},{8 + row // 3}:00,{row},task\n"
+                   for row in range(12))
+    log = str(tmp_path / "timeline.log")
+    with FileTimeLineRepository(log) as repo:
+        report = import_lines(io.StringIO("date,time,tlp_code,description\n"
+                                          + rows),
+                              repo, is_afternoon, chunk_size=4)
+    assert_that(report.imported, equal_to(12))
+
+    with FileTimeLineRepository(log) as repo:
+        days = [(day, [line.tlp.tlp_code for line in lines])
+                for day, lines in repo.retrieve_days()]
+    assert_that(days, equal_to([(date(2018, 5, 1), [0, 3, 6, 9]),
+                                (date(2018, 5, 2), [1, 4, 7, 10]),
+                                (date(2018, 5, 3), [2, 5, 8, 11])]))
+
+
+def test_dates_need_a_repository_with_days():
+    with pytest.raises(ValueError):
+        import_lines(io.StringIO("date,time,tlp_code\n"),
+                     MockTimeLineRepo(), is_afternoon)
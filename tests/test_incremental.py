@@ -0,0 +1,99 @@
+import random
+
+import pytest
+from hamcrest import *
+
+from epoch.incremental import IncrementalDay, IncrementalTimeLineRepository
+from epoch.rounding import basic_workflow
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+from tests.mock_repos import MockTimeLineRepo
+
+TLPS = [TLP(code, desc) for code in range(4) for desc in ("a", "b")]
+ADJUSTMENTS = {TLP(1, ""): 6, TLP(2, ""): -4}
+
+
+def summary(adjusted_tlps):
+    return [(adj.tlp.tlp_code,
+             adj.tlp.description,
+             adj.adjusted_duration.duration.minutes,
+             adj.adjusted_duration.adjusted_duration.minutes)
+            for adj in adjusted_tlps]
+
+
+def test_random_edits_match_rounding_from_scratch():
+    rng = random.Random(42)
+    day = IncrementalDay(adjustment_lookup=ADJUSTMENTS)
+    for _ in range(600):
+        time = Time.from_minutes(rng.randrange(6 * 60, 20 * 60))
+        tlp = rng.choice(TLPS)
+        action = rng.random()
+        if action < 0.6:
+            day.add_line(TLPLine(tlp, time))
+        elif len(day) and action < 0.8:
+            line = rng.choice(day.lines())
+            day.remove_line_by_time(line.time)
+        elif len(day):
+            line = rng.choice(day.lines())
+            day.update_line_tlp(TLPLine(tlp, line.time))
+
+        assert_that(summary(day.rounded()),
+                    equal_to(summary(basic_workflow(day.lines(), ADJUSTMENTS))))
+
+
+def test_missing_lines_raise_key_error():
+    day = IncrementalDay([TLPLine(TLPS[0], Time(8, 0))])
+
+    with pytest.raises(KeyError):
+        day.remove_line_by_time(Time(9, 0))
+    with pytest.raises(KeyError):
+        day.update_line_tlp(TLPLine(TLPS[1], Time(9, 0)))
+
+
+def test_repository_rejects_missing_lines_before_writing():
+    wrapped = MockTimeLineRepo()
+    wrapped.add_line(TLPLine(TLPS[0], Time(8, 0)))
+    repo = IncrementalTimeLineRepository(wrapped)
+
+    with pytest.raises(KeyError):
+        repo.update_line_tlp(TLPLine(TLPS[1], Time(9, 0)))
+    with pytest.raises(KeyError):
+        repo.remove_line_by_time(Time(9, 0))
+
+    assert_that(list(wrapped.storage), equal_to([Time(8, 0)]))
+
+
+def test_adjustment_changes_rerounds_the_tlp():
+    day = IncrementalDay([TLPLine(TLPS[2], Time(8, 0)),
+                          TLPLine(TLPS[0], Time(8, 37))])
+    day.set_adjustment(TLP(1, ""), 0)
+
+    assert_that(summary(day.rounded())[0][3], equal_to(30))
+
+    day.set_adjustment(TLP(1, ""), -7)
+
+    assert_that(summary(day.rounded())[0][3], equal_to(45))
+
+
+def test_set_adjustment_leaves_the_callers_lookup_alone():
+    lookup = {TLP(1, ""): 0}
+    day = IncrementalDay([TLPLine(TLPS[2], Time(8, 0))], lookup)
+
+    day.set_adjustment(TLP(1, ""), -7)
+
+    assert_that(lookup, equal_to({TLP(1, ""): 0}))
+
+
+def test_repository_keeps_wrapped_repository_and_rounding_in_step():
+    wrapped = MockTimeLineRepo()
+    wrapped.add_line(TLPLine(TLPS[2], Time(8, 0)))
+    wrapped.add_line(TLPLine(TLPS[0], Time(17, 0)))
+    repo = IncrementalTimeLineRepository(wrapped)
+
+    repo.add_line(TLPLine(TLPS[4], Time(12, 0)))
+    repo.update_line_tlp(TLPLine(TLPS[6], Time(12, 0)))
+
+    assert_that(summary(repo.rounded()),
+                equal_to([(1, "a", 240, 240), (3, "a", 300, 300)]))
+    assert_that(summary(repo.rounded()),
+                equal_to(summary(basic_workflow(wrapped.retrieve_lines(), {}))))
@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+import pytest
+from hamcrest import *
+
+from epoch.indexed_repo import IndexedTimeLineRepository, IndexedTimeLineStore
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+
+MONDAY = date(2018, 5, 7)
+
+
+def describe(dated_lines):
+    return [(day.day, str(line.time), line.tlp.tlp_code)
+            for day, line in dated_lines]
+
+
+@pytest.fixture
+def store():
+    store = IndexedTimeLineStore()
+    for offset in (2, 0, 1):
+        day = MONDAY + timedelta(days=offset)
+        store.add_lines(day, [TLPLine(TLP(1, "a"), Time(8, 0)),
+                              TLPLine(TLP(2, "b"), Time(13, 30)),
+                              TLPLine(TLP(3, "c"), Time(15, 0)),
+                              TLPLine(TLP(0, "day"), Time(17, 0))])
+    return store
+
+
+def test_keeps_lines_in_order(store):
+    store.add(MONDAY, TLPLine(TLP(4, "d"), Time(12, 0)))
+    store.add(MONDAY, TLPLine(TLP(5, "e"), Time(8, 0)))
+
+    assert_that([(str(line.time), line.tlp.tlp_code)
+                 for line in store.day(MONDAY)],
+                equal_to([("08:00", 5), ("12:00", 4), ("13:30", 2),
+                          ("15:00", 3), ("17:00", 0)]))
+    assert_that(len(store), equal_to(13))
+    assert_that(store.days(), equal_to([MONDAY + timedelta(days=d)
+                                        for d in range(3)]))
+
+
+def test_range_runs_from_a_time_on_one_day_to_a_time_on_another(store):
+    lines = store.range(MONDAY, MONDAY + timedelta(days=1),
+                        Time(13, 30), Time(13, 30))
+
+    assert_that(describe(lines), equal_to([(7, "13:30", 2), (7, "15:00", 3),
+                                           (7, "17:00", 0), (8, "08:00", 1),
+                                           (8, "13:30", 2)]))
+
+
+def test_window_takes_the_same_hours_each_day(store):
+    lines = store.window(MONDAY - timedelta(days=7), MONDAY + timedelta(days=1),
+                         Time(13, 0), Time(15, 0))
+
+    assert_that(describe(lines), equal_to([(7, "13:30", 2), (7, "15:00", 3),
+                                           (8, "13:30", 2), (8, "15:00", 3)]))
+
+
+def test_nearest_line(store):
+    assert_that(store.nearest(MONDAY, Time(14, 14)).tlp.tlp_code, equal_to(2))
+    assert_that(store.nearest(MONDAY, Time(14, 15)).tlp.tlp_code, equal_to(2))
+    assert_that(store.nearest(MONDAY, Time(14, 16)).tlp.tlp_code, equal_to(3))
+    assert_that(store.nearest(MONDAY, Time(23, 0)).tlp.tlp_code, equal_to(0))
+    with pytest.raises(KeyError):
+        store.nearest(MONDAY - timedelta(days=1), Time(8, 0))
+
+
+def test_repository_removes_the_nearest_line_within_reach(store):
+    repo = IndexedTimeLineRepository(store, MONDAY, max_distance=5)
+
+    repo.remove_line_by_time(Time(13, 27))
+    with pytest.raises(KeyError):
+        repo.remove_line_by_time(Time(14, 0))
+
+    assert_that([line.tlp.tlp_code for line in repo.retrieve_lines()],
+                equal_to([1, 3, 0]))
+    assert_that([line.tlp.tlp_code for line
+                 in repo.for_day(MONDAY + timedelta(days=1)).retrieve_lines()],
+                equal_to([1, 2, 3, 0]))
@@ -0,0 +1,63 @@
+from hamcrest import *
+
+from epoch.instrumentation import WorkflowProfiler
+from epoch.rounding import full_workflow
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+
+LINES = [TLPLine(TLP(1, "build"), Time(8, 0)),
+         TLPLine(TLP(2, "review"), Time(9, 7)),
+         TLPLine(TLP(1, "build"), Time(11, 20)),
+         TLPLine(TLP(0, "day"), Time(16, 44))]
+
+
+def summary(adjusted):
+    return (adjusted.tlp.tlp_code,
+            adjusted.adjusted_duration.adjusted_duration.minutes)
+
+
+def drop_short(adjusted_tlps):
+    return [adjusted for adjusted in adjusted_tlps
+            if adjusted.adjusted_duration.adjusted_duration.minutes > 200]
+
+
+def test_profiled_workflow_gives_the_same_result():
+    lookup = {TLP(1, ""): 4}
+    plain = full_workflow(LINES, lookup, True, True, True, [drop_short])
+    profiled = full_workflow(LINES, lookup, True, True, True, [drop_short],
+                             profiler=WorkflowProfiler())
+
+    assert_that([summary(a) for a in profiled],
+                equal_to([summary(a) for a in plain]))
+
+
+def test_records_each_stage_with_item_counts():
+    profiler = WorkflowProfiler()
+
+    full_workflow(LINES, {}, False, True, False, [drop_short], profiler)
+
+    assert_that([(r['stage'], r['items_in'], r['items_out'])
+                 for r in profiler.report()],
+                equal_to([('times_to_durations', 4, 3),
+                          ('combine_tlp_durations', 3, 2),
+                          ('add_adjustments', 2, 2),
+                          ('first_time', 2, 2),
+                          ('drop_short', 2, 1)]))
+    assert_that(profiler.records[0].seconds, greater_than_or_equal_to(0))
+    assert_that(profiler.records[0].allocated_bytes, none())
+
+
+def test_totals_add_up_over_calls_with_allocations():
+    profiler = WorkflowProfiler(trace_allocations=True)
+
+    for _ in range(3):
+        full_workflow(LINES, {}, False, False, False, (), profiler)
+
+    totals = profiler.totals()
+    assert_that(list(totals), equal_to(['times_to_durations',
+                                        'combine_tlp_durations',
+                                        'add_adjustments']))
+    assert_that(totals['times_to_durations']['calls'], equal_to(3))
+    assert_that(totals['times_to_durations']['items_in'], equal_to(12))
+    assert_that(totals['add_adjustments']['allocated_bytes'], not_none())
+    assert_that(str(profiler), contains_string('combine_tlp_durations'))
@@ -0,0 +1,99 @@
+from datetime import date, timedelta
+
+import pytest
+from hamcrest import *
+
+from epoch.ledger import DriftLedger
+from epoch.rounding import full_workflow
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+
+START = date(2018, 5, 1)
+
+
+def day_lines(offset):
+    return [TLPLine(TLP(1, "build"), Time(8, offset % 15)),
+            TLPLine(TLP(2, "review"), Time(9, 3 + offset % 11)),
+            TLPLine(TLP(3, "email"), Time(11, 20 + offset % 7)),
+            TLPLine(TLP(0, "day"), Time(16, 44 - offset % 13))]
+
+
+def record_days(ledger, days):
+    history = {}
+    for offset in range(days):
+        day = START + timedelta(days=offset)
+        ledger.record_day(day, full_workflow(day_lines(offset), ledger.drift,
+                                             False, False, False, ()))
+        history[day] = dict(ledger.drift)
+    return history
+
+
+def test_drift_carries_from_day_to_day(tmp_path):
+    with DriftLedger(str(tmp_path)) as ledger:
+        first = list(full_workflow(day_lines(0), {}, False, False, False, ()))
+        ledger.record_day(START, first)
+
+        assert_that(ledger.get(TLP(1, "")),
+                    equal_to(first[0].adjusted_duration.new_acc_adjustment.minutes))
+        assert_that(ledger.date, equal_to(START))
+        with pytest.raises(ValueError):
+            ledger.record_day(START, first)
+
+
+def test_reopening_recovers_the_latest_state(tmp_path):
+    with DriftLedger(str(tmp_path), snapshot_every=4) as ledger:
+        history = record_days(ledger, 10)
+
+    with DriftLedger(str(tmp_path), snapshot_every=4) as reopened:
+        assert_that(reopened.drift, equal_to(history[START + timedelta(days=9)]))
+        assert_that(reopened.date, equal_to(START + timedelta(days=9)))
+        assert_that(reopened.snapshots(), equal_to([START + timedelta(days=3),
+                                                    START + timedelta(days=7)]))
+
+
+def test_reopening_remembers_days_without_changes(tmp_path):
+    with DriftLedger(str(tmp_path), snapshot_every=3) as ledger:
+        history = record_days(ledger, 1)
+        ledger.record_day(START + timedelta(days=1), [])
+
+    with DriftLedger(str(tmp_path), snapshot_every=3) as reopened:
+        assert_that(reopened.date, equal_to(START + timedelta(days=1)))
+        assert_that(reopened.drift, equal_to(history[START]))
+        with pytest.raises(ValueError):
+            reopened.record_day(START + timedelta(days=1), [])
+        reopened.record_day(START + timedelta(days=2), [])
+        assert_that(reopened.snapshots(),
+                    equal_to([START + timedelta(days=2)]))
+
+
+def test_recovers_any_date(tmp_path):
+    with DriftLedger(str(tmp_path), snapshot_every=4) as ledger:
+        history = record_days(ledger, 10)
+
+        for day, drift in history.items():
+            assert_that(ledger.state_at(day), equal_to(drift), str(day))
+        assert_that(ledger.state_at(START - timedelta(days=1)), equal_to({}))
+
+
+def test_replays_only_deltas_after_the_snapshot(tmp_path):
+    with DriftLedger(str(tmp_path), snapshot_every=4) as ledger:
+        history = record_days(ledger, 6)
+    log_path = str(tmp_path / "deltas.log")
+    with open(str(tmp_path / "snapshot-2018-05-04.tsv")) as snapshot:
+        offset = int(snapshot.readline())
+    with open(log_path, 'r+b') as log:
+        log.write(b'x' * offset)
+
+    with DriftLedger(str(tmp_path), snapshot_every=4) as reopened:
+        assert_that(reopened.drift, equal_to(history[START + timedelta(days=5)]))
+
+
+def test_ignores_a_half_written_delta(tmp_path):
+    with DriftLedger(str(tmp_path)) as ledger:
+        history = record_days(ledger, 3)
+    with open(str(tmp_path / "deltas.log"), 'ab') as log:
+        log.write(b'2018-05-04\t7\t1\t')
+
+    with DriftLedger(str(tmp_path)) as reopened:
+        assert_that(reopened.drift, equal_to(history[START + timedelta(days=2)]))
+        assert_that(reopened.date, equal_to(START + timedelta(days=2)))
@@ -0,0 +1,101 @@
+import os
+from datetime import date
+
+import pytest
+from hamcrest import *
+
+from epoch.mmap_repo import MappedTimeLineRepository, MappedTimeLineStore
+from epoch.rounding import basic_workflow, columnar_basic_workflow
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "timeline.bin")
+
+
+def codes_and_times(lines):
+    return [(line.tlp.tlp_code, str(line.time)) for line in lines]
+
+
+def test_lines_are_kept_in_time_order(path):
+    with MappedTimeLineStore(path, initial_capacity=2) as store:
+        repo = MappedTimeLineRepository(store, date(2018, 5, 1))
+        for hour in (12, 8, 15, 9, 10):
+            repo.add_line(TLPLine(TLP(hour, "work"), Time(hour, 0)))
+
+        assert_that(codes_and_times(repo.retrieve_lines()),
+                    equal_to([(8, "08:00"), (9, "09:00"), (10, "10:00"),
+                              (12, "12:00"), (15, "15:00")]))
+
+
+def test_update_and_remove(path):
+    with MappedTimeLineStore(path) as store:
+        repo = MappedTimeLineRepository(store, date(2018, 5, 1))
+        repo.add_line(TLPLine(TLP(1, "a"), Time(8, 0)))
+        repo.add_line(TLPLine(TLP(2, "b"), Time(9, 0)))
+        repo.update_line_tlp(TLPLine(TLP(3, "c"), Time(8, 0)))
+        repo.remove_line_by_time(Time(9, 0))
+
+        assert_that(codes_and_times(repo.retrieve_lines()),
+                    equal_to([(3, "08:00")]))
+        with pytest.raises(KeyError):
+            repo.remove_line_by_time(Time(9, 0))
+
+
+def test_store_is_reopened_with_its_days_and_tlps(path):
+    lines = [TLPLine(TLP(1, "a", customer=5), Time(8, 0)),
+             TLPLine(TLP(2, "b"), Time(9, 7)),
+             TLPLine(TLP(0, "day"), Time(16, 0))]
+    with MappedTimeLineStore(path, initial_capacity=1) as store:
+        for day in (3, 1, 2):
+            for line in lines:
+                store.add(date(2018, 5, day), line)
+
+    with MappedTimeLineStore(path) as store:
+        days = [(day, codes_and_times(timeline))
+                for day, timeline in store.days()]
+
+    assert_that(days, equal_to([(date(2018, 5, d), codes_and_times(lines))
+                                for d in (1, 2, 3)]))
+
+
+def test_views_feed_the_rounding_workflow(path):
+    lines = [TLPLine(TLP(1, "a"), Time(8, 0)),
+             TLPLine(TLP(2, "b"), Time(9, 7)),
+             TLPLine(TLP(1, "c"), Time(11, 0)),
+             TLPLine(TLP(0, "day"), Time(16, 0))]
+    with MappedTimeLineStore(path) as store:
+        repo = MappedTimeLineRepository(store, date(2018, 5, 1))
+        for line in lines:
+            repo.add_line(line)
+
+        result = columnar_basic_workflow(repo.retrieve_lines(), {})
+        expected = basic_workflow(lines, {})
+
+        assert_that([(a.tlp.description, a.adjusted_duration.adjusted_duration)
+                     for a in result],
+                    equal_to([(a.tlp.description,
+                               a.adjusted_duration.adjusted_duration)
+                              for a in expected]))
+
+
+def test_file_grows_ahead_of_the_days_and_reopens_past_the_spare_room(path):
+    line = TLPLine(TLP(1, "a"), Time(8, 0))
+    with MappedTimeLineStore(path, initial_capacity=4) as store:
+        for day in (1, 2, 3):
+            store.add(date(2018, 5, day), line)
+        size = os.path.getsize(path)
+
+    with MappedTimeLineStore(path, initial_capacity=4) as store:
+        store.add(date(2018, 5, 4), TLPLine(TLP(2, "b"), Time(9, 0)))
+        days = [(day, codes_and_times(timeline))
+                for day, timeline in store.days()]
+
+    assert_that(size, equal_to(16 * 8))
+    assert_that(os.path.getsize(path), equal_to(size))
+    assert_that(days, equal_to([(date(2018, 5, 1), [(1, "08:00")]),
+                                (date(2018, 5, 2), [(1, "08:00")]),
+                                (date(2018, 5, 3), [(1, "08:00")]),
+                                (date(2018, 5, 4), [(2, "09:00")])]))
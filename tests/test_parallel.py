@@ -0,0 +1,76 @@
+from datetime import date
+from threading import Lock
+
+from hamcrest import *
+
+from epoch.batch import DayRecord, batch_workflow
+from epoch.parallel import parallel_workflow
+from epoch.time import Minutes, Time, SIX_MINUTES
+from epoch.time_tracking import TLP, TLPDuration, TLPLine
+from tests.mock_repos import MockAdjustmentsRepo
+
+
+def records():
+    for user in range(5):
+        for d in range(1, 29):
+            yield DayRecord(user, date(2018, 2, d), [
+                TLPLine(TLP(1, "build", customer=user), Time(8, d)),
+                TLPLine(TLP(2, "review"), Time(9, 3 + d)),
+                TLPLine(TLP(1, "tests", customer=user), Time(11, 20)),
+                TLPLine(TLP(0, "day"), Time(16, 44 - d))],
+                {TLP(2, ""): d % 7 - 3})
+
+
+def summaries(results):
+    return [(r.user, r.date, r.adjusted.tlp.to_row(),
+             r.adjusted.adjusted_duration.adjusted_duration.minutes,
+             r.adjusted.adjusted_duration.new_acc_adjustment.minutes)
+            for r in results]
+
+
+def test_parallel_matches_batch_workflow():
+    expected = summaries(batch_workflow(records(), interval=SIX_MINUTES))
+    result = summaries(parallel_workflow(records(), interval=SIX_MINUTES,
+                                         chunk_size=7, max_workers=2))
+
+    assert_that(result, equal_to(expected))
+
+
+def test_workers_get_the_adjustments_repository():
+    repository = MockAdjustmentsRepo()
+    repository.set(TLPDuration(TLP(1, "", customer=3), Minutes(-6)))
+    expected = summaries(batch_workflow(records(), do_first_time=True,
+                                        adjustments_repository=repository))
+    result = summaries(parallel_workflow(records(), do_first_time=True,
+                                         chunk_size=7, max_workers=2,
+                                         adjustments_repository=repository))
+
+    assert_that(result, equal_to(expected))
+    assert_that(result, is_not(equal_to(summaries(batch_workflow(records())))))
+
+
+class LockedAdjustmentsRepo(MockAdjustmentsRepo):
+    # holds a lock, so it can't be pickled and sent to a worker
+    def __init__(self):
+        super().__init__()
+        self.lock = Lock()
+
+    def retrieve(self, tlp):
+        with self.lock:
+            return super().retrieve(tlp)
+
+
+def test_adjustments_repository_stays_in_this_process():
+    repository = LockedAdjustmentsRepo()
+    repository.set(TLPDuration(TLP(1, "", customer=3), Minutes(-6)))
+    expected = summaries(batch_workflow(records(), do_first_time=True,
+                                        adjustments_repository=repository))
+    result = summaries(parallel_workflow(records(), do_first_time=True,
+                                         chunk_size=7, max_workers=2,
+                                         adjustments_repository=repository))
+
+    assert_that(result, equal_to(expected))
+
+
+def test_empty_input():
+    assert_that(list(parallel_workflow([], max_workers=1)), empty())
@@ -0,0 +1,82 @@
+import pytest
+from hamcrest import *
+
+from epoch.pipeline import *
+from epoch.rounding import day_adjustments
+from epoch.time import AdjustedDuration, Minutes
+from epoch.time_tracking import TLP, AdjustedTLPDuration
+
+
+def adjusted(code, minutes):
+    return AdjustedTLPDuration(
+            TLP(code, "work"),
+            AdjustedDuration(Minutes(minutes), Minutes(0), Minutes(0)))
+
+
+def minutes_of(adjusted_tlps):
+    return [a.adjusted_duration.duration.minutes for a in adjusted_tlps]
+
+
+def add(minutes):
+    def add_minutes(a):
+        return adjusted(a.tlp.tlp_code, a.adjusted_duration.duration.minutes + minutes)
+    return add_minutes
+
+
+def drop_short(adjusted_tlps):
+    return [a for a in adjusted_tlps if a.adjusted_duration.duration.minutes > 20]
+
+
+@pytest.fixture
+def registry():
+    registry = AdjustmentRegistry()
+    registry.add(Adjustment('add_one', add(1), PER_ITEM))
+    registry.add(Adjustment('add_ten', add(10), PER_ITEM))
+    registry.add(Adjustment('drop_short', drop_short, WHOLE_DAY))
+    return registry
+
+
+def test_fuses_runs_of_per_item_adjustments(registry):
+    pipeline = registry.compile(['add_one', 'add_ten', 'drop_short', 'add_one'])
+
+    assert_that([name for name, _ in pipeline.steps],
+                equal_to(['add_one+add_ten', 'drop_short', 'add_one']))
+    assert_that(minutes_of(pipeline([adjusted(1, 5), adjusted(2, 15)])),
+                equal_to([27]))
+
+
+def test_keeps_compiled_pipelines_per_configuration(registry):
+    first = registry.compile(['add_one', 'drop_short'])
+
+    assert_that(registry.compile(['add_one', 'drop_short']), same_instance(first))
+    registry.add(Adjustment('add_two', add(2), PER_ITEM))
+    assert_that(registry.compile(['add_one', 'drop_short']),
+                is_not(same_instance(first)))
+
+
+def test_unregistered_callables_are_whole_day(registry):
+    class Unhashable:
+        __hash__ = None
+
+        def __call__(self, adjusted_tlps):
+            return list(adjusted_tlps)[:1]
+
+    def reverse(adjusted_tlps):
+        return list(reversed(list(adjusted_tlps)))
+
+    pipeline = registry.compile([reverse, Unhashable(), 'add_one'])
+
+    assert_that(len(pipeline), equal_to(3))
+    assert_that(minutes_of(pipeline([adjusted(1, 5), adjusted(2, 15)])),
+                equal_to([16]))
+
+
+def test_rejects_unknown_kinds():
+    with pytest.raises(ValueError):
+        Adjustment('sideways', add(1), 'sideways')
+
+
+def test_disabled_day_adjustments_are_left_out():
+    assert_that(len(day_adjustments(False, False, False)), equal_to(0))
+    assert_that([name for name, _ in day_adjustments(True, False, True).steps],
+                equal_to(['travel_time', 'full_day']))
@@ -0,0 +1,118 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+from hamcrest import *
+
+from epoch.rollups import DAY, MONTH, TLP_LEVEL, WEEK, TLPRollups
+from epoch.rounding import full_workflow
+from epoch.time import Time
+from epoch.time_tracking import TLP, TLPLine
+
+BUILD = TLP(1, "build", customer=10, product=1, prj=100)
+REVIEW = TLP(2, "review", customer=10, product=1, prj=200)
+SUPPORT = TLP(3, "support", customer=10, product=2, prj=300)
+OTHER = TLP(4, "other", customer=20, product=1, prj=400)
+
+# a Monday
+START = date(2018, 4, 30)
+
+
+def test_day_week_and_month_totals():
+    rollups = TLPRollups()
+    rollups.record_totals(START, {BUILD: 60, REVIEW: 30, OTHER: 15})
+    rollups.record_totals(START + timedelta(days=1), {BUILD: 45, SUPPORT: 90})
+
+    assert_that(rollups.total(DAY, START), equal_to(105))
+    assert_that(rollups.total(WEEK, START), equal_to(240))
+    # April 30th and May 1st fall in the same week but different months
+    assert_that(rollups.total(MONTH, START), equal_to(105))
+    assert_that(rollups.total(MONTH, START + timedelta(days=1)), equal_to(135))
+    assert_that(rollups.total(WEEK, START, customer=10), equal_to(225))
+    assert_that(rollups.total(WEEK, START, customer=10, product=1), equal_to(135))
+    assert_that(rollups.total(WEEK, START, customer=10, product=1, prj=200),
+                equal_to(30))
+    assert_that(rollups.total(WEEK, START + timedelta(days=7)), equal_to(0))
+
+
+def test_breakdown_by_level():
+    rollups = TLPRollups()
+    rollups.record_totals(START, {BUILD: 60, REVIEW: 30, OTHER: 15})
+    rollups.record_totals(START + timedelta(days=1), {BUILD: 45, SUPPORT: 90})
+
+    assert_that(rollups.breakdown(WEEK, START, 'customer'),
+                equal_to({(10,): 225, (20,): 15}))
+    assert_that(rollups.breakdown(WEEK, START, 'product'),
+                equal_to({(10, 1): 135, (10, 2): 90, (20, 1): 15}))
+    assert_that(rollups.breakdown(WEEK, START, TLP_LEVEL),
+                equal_to({BUILD: 105, REVIEW: 30, SUPPORT: 90, OTHER: 15}))
+
+
+def test_recording_a_day_again_replaces_it():
+    rollups = TLPRollups()
+    rollups.record_totals(START, {BUILD: 60, REVIEW: 30})
+    rollups.record_totals(START + timedelta(days=2), {BUILD: 15})
+    rollups.record_totals(START, {BUILD: 75, SUPPORT: 15})
+
+    assert_that(rollups.day_totals(START), equal_to({BUILD: 75, SUPPORT: 15}))
+    assert_that(rollups.breakdown(WEEK, START),
+                equal_to({BUILD: 90, SUPPORT: 15}))
+    assert_that(rollups.total(WEEK, START, customer=10, product=1), equal_to(90))
+
+    rollups.remove_day(START)
+    rollups.remove_day(START + timedelta(days=2))
+    assert_that(rollups.breakdown(WEEK, START, 'customer'), equal_to({}))
+    assert_that(rollups._totals, equal_to({}))
+    assert_that(rollups._tlp_totals, equal_to({}))
+
+
+def test_hierarchy_down_to_every_component():
+    # with every component in the hierarchy, the deepest groups have as many
+    # values as a TLP's row has fields
+    hierarchy = ('tlp_code', 'customer', 'product', 'code', 'slg', 'dlg', 'prj')
+    first = TLP(1, "a", customer=1, product=2, code=3, slg=4, dlg=5, prj=6)
+    second = TLP(1, "b", customer=1, product=2, code=3, slg=4, dlg=5, prj=7)
+    rollups = TLPRollups(hierarchy)
+    rollups.record_totals(START, {first: 30, second: 45})
+    rollups.record_totals(START, {first: 15})
+
+    assert_that(rollups.breakdown(DAY, START, TLP_LEVEL),
+                equal_to({first: 15}))
+    assert_that(rollups.breakdown(DAY, START, 'prj'),
+                equal_to({(1, 1, 2, 3, 4, 5, 6): 15}))
+    assert_that(rollups.total(DAY, START, tlp_code=1, customer=1, product=2,
+                              code=3, slg=4, dlg=5, prj=6),
+                equal_to(15))
+
+
+def test_queries_must_follow_the_hierarchy():
+    rollups = TLPRollups()
+    with pytest.raises(ValueError):
+        rollups.total(WEEK, START, product=1)
+    with pytest.raises(ValueError):
+        rollups.breakdown(WEEK, START, 'code')
+    with pytest.raises(ValueError):
+        rollups.total('year', START)
+
+
+def test_matches_totals_from_every_day():
+    rollups = TLPRollups()
+    days = {}
+    for offset in range(40):
+        day = START + timedelta(days=offset)
+        lines = [TLPLine(BUILD, Time(8, offset % 15)),
+                 TLPLine(REVIEW if offset % 2 else OTHER, Time(10, offset % 7)),
+                 TLPLine(SUPPORT, Time(13, 20 + offset % 11)),
+                 TLPLine(TLP(0, "day"), Time(16, 44 - offset % 13))]
+        days[day] = list(full_workflow(lines, {}, False, False, False, ()))
+        rollups.record_day(day, days[day])
+
+    expected = defaultdict(int)
+    for day, adjusted_tlps in days.items():
+        if day.month == 5:
+            for adjusted in adjusted_tlps:
+                expected[adjusted.tlp.customer] += (
+                        adjusted.adjusted_duration.adjusted_duration.minutes)
+    assert_that(rollups.breakdown(MONTH, date(2018, 5, 1), 'customer'),
+                equal_to({(customer,): minutes
+                          for customer, minutes in expected.items()}))
@@ -0,0 +1,96 @@
+import pytest
+from hamcrest import *
+
+from epoch.time import *
+
+
+@pytest.fixture(params=(SIX_MINUTES, TEN_MINUTES, FIFTEEN_MINUTES,
+                        THIRTY_MINUTES))
+def interval(request):
+    return request.param
+
+
+def test_distances_reach_a_multiple(interval):
+    for minutes in range(0, 200):
+        up = interval.distance_up(minutes)
+        down = interval.distance_down(minutes)
+
+        assert_that((minutes + up) % interval.minutes, equal_to(0))
+        assert_that((minutes - down) % interval.minutes, equal_to(0))
+        assert_that(up, less_than(interval.minutes))
+        assert_that(down, less_than(interval.minutes))
+
+
+def test_best_adjustment_minimizes_accumulated_drift(interval):
+    for minutes in range(0, 100):
+        for acc in range(-interval.minutes, interval.minutes + 1):
+            up, down = interval.adjustments(minutes)
+            best = interval.best_adjustment(minutes, acc)
+
+            assert_that(best, is_in((up, down)))
+            assert_that(abs(acc + best),
+                        less_than_or_equal_to(min(abs(acc + up), abs(acc + down))))
+
+
+def test_fifteen_minute_properties():
+    duration = Minutes(37)
+
+    assert_that(duration.distance_up_to_nearest_15, equal_to(Minutes(8)))
+    assert_that(duration.distance_down_to_nearest_15, equal_to(Minutes(7)))
+    assert_that(duration.adjustments_to_nearest_15s,
+                equal_to((Minutes(8), Minutes(-7))))
+
+
+def test_rounds_down_without_drift():
+    adjusted = Minutes(37).with_accumulated_adjustment(Minutes(0))
+
+    assert_that(adjusted.adjusted_duration, equal_to(Minutes(30)))
+    assert_that(adjusted.new_acc_adjustment, equal_to(Minutes(-7)))
+
+
+def test_rounds_up_to_pay_back_drift():
+    adjusted = Minutes(37).with_accumulated_adjustment(Minutes(-7))
+
+    assert_that(adjusted.adjusted_duration, equal_to(Minutes(45)))
+    assert_that(adjusted.new_acc_adjustment, equal_to(Minutes(1)))
+
+
+def test_configurable_interval():
+    adjusted = Minutes(37).with_accumulated_adjustment(Minutes(0), SIX_MINUTES)
+
+    assert_that(adjusted.adjusted_duration, equal_to(Minutes(36)))
+
+
+def test_rejects_empty_interval():
+    with pytest.raises(ValueError):
+        RoundingInterval(0)
+
+
+def test_decision_table_matches_computed_adjustment(interval):
+    tabled = RoundingInterval(interval.minutes, use_table=True)
+    for minutes in range(0, 3 * interval.minutes):
+        for acc in range(-3 * interval.minutes, 3 * interval.minutes + 1):
+            assert_that(tabled.best_adjustment(minutes, acc),
+                        equal_to(interval.best_adjustment(minutes, acc)))
+
+
+def test_decision_table_is_opt_in_and_shared_by_size():
+    tabled = RoundingInterval(15, use_table=True)
+
+    assert_that(FIFTEEN_MINUTES.table, none())
+    assert_that(RoundingInterval(15, use_table=True).table,
+                same_instance(tabled.table))
+    assert_that(len(tabled.table), equal_to(15 * 31))
+
+
+def test_accumulated_adjustment_with_tabled_interval():
+    tabled = RoundingInterval(15, use_table=True)
+    for minutes in range(0, 60):
+        for acc in range(-20, 21):
+            adjusted = Minutes(minutes).with_accumulated_adjustment(
+                    Minutes(acc), tabled)
+            expected = Minutes(minutes).with_accumulated_adjustment(Minutes(acc))
+
+            assert_that(adjusted.adjustment, equal_to(expected.adjustment))
+            assert_that(adjusted.new_acc_adjustment,
+                        equal_to(expected.new_acc_adjustment))
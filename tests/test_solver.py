@@ -0,0 +1,71 @@
+import random
+from itertools import product
+
+from hamcrest import *
+
+from epoch.solver import solve_rounding, solved_workflow
+from epoch.time import Minutes, SIX_MINUTES, Time
+from epoch.time_tracking import TLP, TLPDuration, TLPLine
+
+
+def drift(adjusted_tlps):
+    return sum(abs(adj.adjusted_duration.new_acc_adjustment.minutes)
+               for adj in adjusted_tlps)
+
+
+def rounded_total(adjusted_tlps):
+    return sum(adj.adjusted_duration.adjusted_duration.minutes
+               for adj in adjusted_tlps)
+
+
+def brute_force_drift(minutes, accs, target):
+    best = None
+    for ups in product((False, True), repeat=len(minutes)):
+        adjusted = [m + (-m % 15 if up else -(m % 15))
+                    for m, up in zip(minutes, ups)]
+        if sum(adjusted) == target:
+            cost = sum(abs(acc + a - m)
+                       for acc, a, m in zip(accs, adjusted, minutes))
+            best = cost if best is None else min(best, cost)
+    return best
+
+
+def test_matches_brute_force_on_small_days():
+    rng = random.Random(7)
+    for _ in range(200):
+        minutes = [rng.randrange(1, 240) for _ in range(rng.randrange(1, 8))]
+        accs = [rng.randrange(-10, 11) for _ in minutes]
+        durations = [TLPDuration(TLP(i, ""), Minutes(m))
+                     for i, m in enumerate(minutes)]
+        lookup = {TLP(i, ""): acc for i, acc in enumerate(accs)}
+        total = sum(minutes)
+        target = total + (-total % 15 if total % 15 >= 8 else -(total % 15))
+
+        result = solve_rounding(durations, lookup)
+
+        assert_that(rounded_total(result), equal_to(target))
+        assert_that(drift(result),
+                    equal_to(brute_force_drift(minutes, accs, target)))
+
+
+def test_every_total_lands_on_the_interval():
+    durations = [TLPDuration(TLP(i, ""), Minutes(7 * i + 1)) for i in range(50)]
+
+    result = solve_rounding(durations, {}, SIX_MINUTES)
+
+    assert_that([adj.adjusted_duration.adjusted_duration.minutes % 6
+                 for adj in result], only_contains(0))
+
+
+def test_solved_workflow_combines_lines_first():
+    lines = [TLPLine(TLP(1, "a"), Time(8, 0)),
+             TLPLine(TLP(2, "b"), Time(8, 7)),
+             TLPLine(TLP(1, "c"), Time(9, 0)),
+             TLPLine(TLP(0, "day"), Time(9, 31))]
+
+    result = solved_workflow(lines, {})
+
+    assert_that([(adj.tlp.description,
+                  adj.adjusted_duration.adjusted_duration.minutes)
+                 for adj in result],
+                equal_to([("a; c", 45), ("b", 45)]))
@@ -0,0 +1,51 @@
+from hamcrest import *
+
+from epoch.sorted_columns import SortedColumns, nearest, put
+
+
+class ListColumns(SortedColumns):
+    def __init__(self):
+        self._minutes = []
+        self._handles = []
+
+    @property
+    def minutes(self):
+        return self._minutes
+
+    @property
+    def handles(self):
+        return self._handles
+
+    def insert(self, position, minutes, handle):
+        self._minutes.insert(position, minutes)
+        self._handles.insert(position, handle)
+
+    def delete(self, position):
+        del self._minutes[position]
+        del self._handles[position]
+
+    def set_handle(self, position, handle):
+        self._handles[position] = handle
+
+
+def test_put_keeps_lines_in_order_and_replaces_handles():
+    columns = ListColumns()
+
+    added = [put(columns, minutes, handle)
+             for minutes, handle in ((30, 1), (10, 2), (20, 3), (10, 4))]
+
+    assert_that(added, equal_to([True, True, True, False]))
+    assert_that(columns.minutes, equal_to([10, 20, 30]))
+    assert_that(columns.handles, equal_to([4, 3, 1]))
+
+
+def test_nearest():
+    column = [10, 20, 30]
+
+    assert_that(nearest(column, 0), equal_to(0))
+    assert_that(nearest(column, 15), equal_to(0))
+    assert_that(nearest(column, 16), equal_to(1))
+    assert_that(nearest(column, 99), equal_to(2))
+    assert_that(nearest(column, 24, max_distance=3), equal_to(-1))
+    assert_that(nearest(column, 20, max_distance=0), equal_to(1))
+    assert_that(nearest([], 20), equal_to(-1))
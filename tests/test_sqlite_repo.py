@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+from hamcrest import *
+
+from epoch.sqlite_repo import (ConnectionPool, SQLiteAdjustmentsRepository,
+                               SQLiteTimeLineRepository)
+from epoch.time import Minutes, Time
+from epoch.time_tracking import TLP, TLPDuration, TLPLine
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "epoch.db"), size=2)
+    yield pool
+    pool.close()
+
+
+def test_adjustments_keyed_on_tlp_components(pool):
+    repo = SQLiteAdjustmentsRepository(pool)
+    repo.set_all(TLPDuration(TLP(code, "x", customer=1), Minutes(code))
+                 for code in range(5))
+    repo.set(TLPDuration(TLP(2, "y", customer=1), Minutes(-7)))
+    repo.set(TLPDuration(TLP(2, "z"), Minutes(3)))
+
+    assert_that(repo.retrieve(TLP(2, "", customer=1)).duration,
+                equal_to(Minutes(-7)))
+    assert_that(repo.retrieve(TLP(2, "")).duration, equal_to(Minutes(3)))
+    assert_that(list(repo.retrieve_all()), has_length(6))
+
+
+def test_removing_adjustments(pool):
+    repo = SQLiteAdjustmentsRepository(pool)
+    repo.set(TLPDuration(TLP(1, "x"), Minutes(4)))
+
+    repo.remove(TLP(1, "x"))
+
+    with pytest.raises(KeyError):
+        repo.retrieve(TLP(1, "x"))
+    with pytest.raises(KeyError):
+        repo.remove(TLP(1, "x"))
+
+
+def test_timelines_are_kept_per_day(pool):
+    monday = SQLiteTimeLineRepository(pool, date(2018, 5, 7))
+    tuesday = monday.for_day(date(2018, 5, 8))
+    monday.add_lines([TLPLine(TLP(2, "b"), Time(9, 0)),
+                      TLPLine(TLP(1, "a", prj=3), Time(8, 0))])
+    tuesday.add_line(TLPLine(TLP(3, "c"), Time(8, 30)))
+    monday.update_line_tlp(TLPLine(TLP(4, "d"), Time(9, 0)))
+
+    assert_that([(line.tlp.to_row(), line.time) for line in monday.retrieve_lines()],
+                equal_to([(TLP(1, "a", prj=3).to_row(), Time(8, 0)),
+                          (TLP(4, "d").to_row(), Time(9, 0))]))
+
+    tuesday.remove_line_by_time(Time(8, 30))
+
+    assert_that(list(tuesday.retrieve_lines()), empty())
+    with pytest.raises(KeyError):
+        tuesday.remove_line_by_time(Time(8, 30))
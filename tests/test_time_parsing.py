@@ -0,0 +1,65 @@
+import pytest
+from hamcrest import *
+
+from epoch.cli._time_parsing import _parse_user_time, parse_many, parse_user_time
+from epoch.time import *
+
+CURRENT_TIME = (13, 20)
+
+USER_TIMES = ["", "+0", "+15", "-15", "+700", "-900", "+ 5", "+x",
+              "9:05", "9.05", "9;05", "14:34", "0:00", "23:59", "24:00",
+              "12:60", "7:15", "6:59", "1:2:3", "9.05:10", " 9:05", "9:05 ",
+              "9:05pm", "9:05 PM", "9:05a", "12:30AM", "12:30PM", "13:30AM",
+              "0:30am", "9:5pm", "9:05 pq", "9:05xm", "nine", "905", "9:",
+              ":30", "09:30", "9:030"]
+
+
+def is_afternoon(hour):
+    return hour < 7
+
+
+def expected(user_time):
+    try:
+        return Time(*_parse_user_time(
+                user_time, is_afternoon, lambda: CURRENT_TIME)).minutes
+    except (ValueError, AttributeError) as error:
+        return type(error), str(error)
+
+
+def test_parse_many_matches_step_by_step_parsing():
+    errors = []
+    results = parse_many(USER_TIMES, is_afternoon, CURRENT_TIME, errors)
+    error_by_index = {index: (type(error), str(error))
+                      for index, error in errors}
+
+    for index, user_time in enumerate(USER_TIMES):
+        result = error_by_index.get(index, results[index])
+        assert_that(result, equal_to(expected(user_time)), user_time)
+        if index in error_by_index:
+            assert_that(results[index], none())
+
+
+def test_parse_many_raises_without_errors_list():
+    with pytest.raises(ValueError, match='Invalid minute amount, 60'):
+        parse_many(["9:05", "12:60"], is_afternoon, CURRENT_TIME)
+
+
+def test_parse_user_time_matches_step_by_step_parsing(monkeypatch):
+    monkeypatch.setattr('epoch.cli._time_parsing.now', lambda: CURRENT_TIME)
+    for user_time in USER_TIMES:
+        try:
+            result = parse_user_time(user_time, is_afternoon)
+        except ValueError as error:
+            result = str(error)
+        try:
+            reference = _parse_user_time(
+                    user_time, is_afternoon, lambda: CURRENT_TIME)
+        except ValueError as error:
+            reference = str(error)
+
+        assert_that(result, equal_to(reference), user_time)
+
+
+def test_relative_times_carry_into_the_hour():
+    assert_that(parse_many(["+45", "-25"], is_afternoon, (9, 20)),
+                equal_to([10 * 60 + 5, 8 * 60 + 55]))
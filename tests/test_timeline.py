@@ -0,0 +1,96 @@
+from hamcrest import *
+
+from epoch.rounding import basic_workflow, columnar_basic_workflow
+from epoch.time_tracking import TLP, TLPLine
+from epoch.timeline import DayTimeline
+from epoch.time import Time
+from epoch.tlp_registry import TLPRegistry
+
+
+def as_tuples(adjusted_tlps):
+    return [(adj.tlp._non_desc_components(),
+             adj.tlp.description,
+             adj.adjusted_duration.duration.minutes,
+             adj.adjusted_duration.adjustment.minutes,
+             adj.adjusted_duration.new_acc_adjustment.minutes)
+            for adj in adjusted_tlps]
+
+
+def sample_day():
+    meeting = TLP(1, "standup", customer=7)
+    coding = TLP(2, "coding")
+    return [
+        TLPLine(meeting, Time(8, 0)),
+        TLPLine(coding, Time(8, 17)),
+        TLPLine(TLP(1, "sync", customer=7), Time(10, 2)),
+        TLPLine(coding.with_description("reviews"), Time(10, 40)),
+        TLPLine(meeting, Time(12, 7)),
+        TLPLine(TLP(0, "day"), Time(12, 30)),
+    ]
+
+
+def test_registry_groups_equal_tlps():
+    registry = TLPRegistry()
+    first = registry.intern(TLP(1, "a"))
+    second = registry.intern(TLP(1, "b"))
+
+    assert_that(registry.intern(TLP(1, "a")), equal_to(first))
+    assert_that(second, is_not(equal_to(first)))
+    assert_that(registry.group(second), equal_to(first))
+
+
+def test_timeline_round_trips_lines():
+    lines = sample_day()
+    timeline = DayTimeline.from_lines(lines)
+
+    assert_that(list(timeline.minutes), equal_to([l.time.minutes for l in lines]))
+    assert_that([(l.tlp.description, l.time) for l in timeline],
+                equal_to([(l.tlp.description, l.time) for l in lines]))
+
+
+def test_columnar_workflow_matches_object_workflow():
+    adjustments = {TLP(2, ""): 4}
+
+    expected = as_tuples(basic_workflow(sample_day(), adjustments))
+    result = as_tuples(columnar_basic_workflow(
+            DayTimeline.from_lines(sample_day()), adjustments))
+
+    assert_that(result, equal_to(expected))
+    assert_that(result[0][1], equal_to("standup; sync; standup"))
+
+
+def test_empty_timeline():
+    assert_that(list(columnar_basic_workflow(DayTimeline(), {})), empty())
+
+
+def test_registry_seeded_from_nicknames():
+    registry = TLPRegistry.from_nicknames()
+
+    lunch = registry.by_name("lunch")
+
+    assert_that(registry[lunch].tlp_code, equal_to(-2))
+    assert_that(registry.handle(TLP(-2, "eating")), equal_to(lunch))
+
+
+def test_shared_registry_keeps_each_days_descriptions():
+    registry = TLPRegistry()
+    DayTimeline.from_lines(sample_day(), registry)
+    second_day = [TLPLine(TLP(1, "planning", customer=7), Time(8, 0)),
+                  TLPLine(TLP(0, "day"), Time(9, 0))]
+
+    result = columnar_basic_workflow(
+            DayTimeline.from_lines(second_day, registry), {})
+
+    assert_that([adj.tlp.description for adj in result],
+                equal_to(["planning"]))
+
+
+def test_combining_many_entries_joins_descriptions_once():
+    lines = [TLPLine(TLP(1, str(n)), Time(n // 60, n % 60))
+             for n in range(0, 1000)]
+
+    result = list(basic_workflow(lines, {}))
+
+    assert_that(result, has_length(1))
+    assert_that(result[0].tlp.description,
+                equal_to("; ".join(str(n) for n in range(0, 999))))
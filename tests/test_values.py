@@ -0,0 +1,52 @@
+import pickle
+
+import pytest
+from hamcrest import *
+
+from epoch.time import *
+from epoch.time_tracking import TLP, undefined
+
+
+def test_times_are_shared():
+    assert_that(Time(9, 30) + Minutes(15), same_instance(Time(9, 45)))
+    assert_that(Time.from_minutes(0), same_instance(Time(0, 0)))
+
+
+def test_time_arithmetic_stays_in_the_day():
+    with pytest.raises(AttributeError):
+        Time(23, 50) + Minutes(15)
+    with pytest.raises(AttributeError):
+        Time(0, 5) - Minutes(10)
+
+
+def test_durations_are_shared_within_the_cache():
+    assert_that(Minutes(10) + Minutes(5), same_instance(Duration(minutes=15)))
+    assert_that(-Minutes(20), same_instance(Minutes(-20)))
+    assert_that(Duration(hours=1, minutes=5), same_instance(Minutes(65)))
+
+
+def test_durations_outside_the_cache_are_still_equal():
+    assert_that(Minutes(2000), is_not(same_instance(Minutes(2000))))
+    assert_that(Minutes(2000), equal_to(Minutes(2000)))
+    assert_that(Minutes(1440), same_instance(Minutes(1440)))
+
+
+def test_non_int_values_are_kept_as_given():
+    assert_that(Minutes(7.5).minutes, equal_to(7.5))
+    assert_that(Minutes(15.0).minutes, equal_to(15.0))
+    assert_that(Time(1, 30.0).minutes, equal_to(90.0))
+
+
+def test_values_are_immutable():
+    with pytest.raises(AttributeError):
+        Minutes(5).minutes = 6
+    with pytest.raises(AttributeError):
+        TLP(1, "a").description = "b"
+
+
+def test_values_survive_pickling():
+    tlp = TLP(3, "desc", customer=4)
+
+    assert_that(pickle.loads(pickle.dumps(Time(7, 1))), same_instance(Time(7, 1)))
+    assert_that(pickle.loads(pickle.dumps(tlp)), equal_to(tlp))
+    assert_that(pickle.loads(pickle.dumps(tlp)).product, same_instance(undefined))